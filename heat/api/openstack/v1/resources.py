@@ -151,11 +151,11 @@ class ResourceController(object):
     def metadata(self, req, identity, resource_name):
         """Gets metadata information for a resource."""
 
-        res = self.rpc_client.describe_stack_resource(req.context,
-                                                      identity,
-                                                      resource_name)
+        md = self.rpc_client.describe_stack_resource_metadata(req.context,
+                                                              identity,
+                                                              resource_name)
 
-        return {rpc_api.RES_METADATA: res[rpc_api.RES_METADATA]}
+        return {rpc_api.RES_METADATA: md}
 
     @util.registered_identified_stack
     def signal(self, req, identity, resource_name, body=None):
@@ -195,8 +195,15 @@ class ResourceController(object):
                                                 **data)
 
 
+class ResourceSerializer(serializers.JSONResponseSerializer):
+    """Handles serialization of specific controller method responses."""
+
+    def metadata(self, response, result):
+        self.conditional(response, result)
+
+
 def create_resource(options):
     """Resources resource factory method."""
     deserializer = wsgi.JSONRequestDeserializer()
-    serializer = serializers.JSONResponseSerializer()
+    serializer = ResourceSerializer()
     return wsgi.Resource(ResourceController(options), deserializer, serializer)
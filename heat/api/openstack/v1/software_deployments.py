@@ -96,9 +96,16 @@ class SoftwareDeploymentController(object):
         raise exc.HTTPNoContent()
 
 
+class SoftwareDeploymentSerializer(serializers.JSONResponseSerializer):
+    """Handles serialization of specific controller method responses."""
+
+    def metadata(self, response, result):
+        self.conditional(response, result)
+
+
 def create_resource(options):
     """Software deployments resource factory method."""
     deserializer = wsgi.JSONRequestDeserializer()
-    serializer = serializers.JSONResponseSerializer()
+    serializer = SoftwareDeploymentSerializer()
     return wsgi.Resource(
         SoftwareDeploymentController(options), deserializer, serializer)
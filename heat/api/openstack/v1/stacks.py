@@ -14,6 +14,7 @@
 """Stack endpoint for Heat v1 REST API."""
 
 import contextlib
+from oslo_config import cfg
 from oslo_log import log as logging
 import six
 from six.moves.urllib import parse
@@ -306,9 +307,15 @@ class StackController(object):
         else:
             cnxt = req.context
 
-        stacks = self.rpc_client.list_stacks(cnxt,
-                                             filters=filter_params,
-                                             **params)
+        page_size = cfg.CONF.heat_api.stack_list_page_size
+        stream = page_size > 0 and rpc_api.PARAM_LIMIT not in params
+        if stream:
+            stacks = self._list_stacks_paged(cnxt, page_size,
+                                             filter_params, params)
+        else:
+            stacks = self.rpc_client.list_stacks(cnxt,
+                                                 filters=filter_params,
+                                                 **params)
         count = None
         if with_count:
             try:
@@ -326,10 +333,36 @@ class StackController(object):
             except AttributeError as ex:
                 LOG.warning("Old Engine Version: %s", ex)
 
+        if stream:
+            return stacks_view.stream_collection(
+                req, stacks=stacks, count=count,
+                include_project=cnxt.is_admin)
         return stacks_view.collection(req, stacks=stacks,
                                       count=count,
                                       include_project=cnxt.is_admin)
 
+    def _list_stacks_paged(self, cnxt, page_size, filters, params):
+        """Return an iterator over stacks fetched from the engine in pages.
+
+        The first page is fetched straight away, so that any error in the
+        request is reported before the response is started.
+        """
+        params = dict(params, limit=page_size)
+        stacks = self.rpc_client.list_stacks(cnxt, filters=filters, **params)
+
+        def pages(stacks):
+            while True:
+                for stack in stacks:
+                    yield stack
+                if len(stacks) < page_size:
+                    return
+                last_id = stacks[-1][rpc_api.STACK_ID]['stack_id']
+                params['marker'] = last_id
+                stacks = self.rpc_client.list_stacks(cnxt, filters=filters,
+                                                     **params)
+
+        return pages(stacks)
+
     @util.registered_policy_enforce
     def global_index(self, req):
         return self._index(req, use_admin_cnxt=True)
@@ -756,6 +789,39 @@ class StackSerializer(serializers.JSONResponseSerializer):
         response.body = six.b(self.to_json(result))
         return response
 
+    def index(self, response, result):
+        response.content_type = 'application/json'
+        if isinstance(result['stacks'], list):
+            response.body = six.b(self.to_json(result))
+        else:
+            response.app_iter = self._iter_collection(result)
+        return response
+
+    def _iter_collection(self, result):
+        """Serialize a collection whose stacks are produced by an iterator.
+
+        The JSON document is generated piece by piece, one stack at a time,
+        as the response is sent.
+        """
+        result = dict(result)
+        stacks = result.pop('stacks')
+
+        yield six.b('{"stacks": [')
+        separator = ''
+        try:
+            for stack in stacks:
+                yield six.b(separator + self.to_json(stack))
+                separator = ', '
+        except Exception:
+            # The response has already started, so there is no way left
+            # to report the error to the client
+            LOG.exception('Failed to list stacks')
+            raise
+        yield six.b(']')
+        for key, value in result.items():
+            yield six.b(', %s: %s' % (self.to_json(key), self.to_json(value)))
+        yield six.b('}')
+
 
 def create_resource(options):
     """Stacks resource factory method."""
@@ -76,3 +76,19 @@ def collection(req, stacks, count=None, include_project=False):
         result['count'] = count
 
     return result
+
+
+def stream_collection(req, stacks, count=None, include_project=False):
+    """Return a collection whose stacks are formatted as they are iterated.
+
+    No links are included, since streamed collections are never limited.
+    """
+    keys = basic_keys
+    formatted_stacks = (format_stack(req, s, keys, include_project)
+                        for s in stacks)
+
+    result = {'stacks': formatted_stacks}
+    if count is not None:
+        result['count'] = count
+
+    return result
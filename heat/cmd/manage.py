@@ -130,10 +130,19 @@ def do_migrate():
 
 def purge_deleted():
     """Remove database records that have been previously soft deleted."""
-    db_api.purge_deleted(CONF.command.age,
-                         CONF.command.granularity,
-                         CONF.command.project_id,
-                         CONF.command.batch_size)
+    counts = db_api.purge_deleted(CONF.command.age,
+                                  CONF.command.granularity,
+                                  CONF.command.project_id,
+                                  CONF.command.batch_size,
+                                  CONF.command.chunk_size,
+                                  CONF.command.max_rows_per_second,
+                                  CONF.command.dry_run)
+    if CONF.command.dry_run:
+        print(_("Rows that would be purged:"))
+    else:
+        print(_("Rows purged:"))
+    for table_name in sorted(counts):
+        print("%-30s%d" % (table_name, counts[table_name]))
 
 
 def do_crypt_parameters_and_properties():
@@ -190,6 +199,20 @@ def add_command_parsers(subparsers):
         help=_('Number of stacks to delete at a time (per transaction). '
                'Note that a single stack may have many db rows '
                '(events, etc.) associated with it.'))
+    # optional parameter, can be skipped. default='1000'
+    parser.add_argument(
+        '-c', '--chunk-size', default='1000',
+        help=_('Maximum number of events to delete in a single '
+               'transaction.'))
+    # optional parameter, can be skipped. default='0'
+    parser.add_argument(
+        '-r', '--max-rows-per-second', default='0',
+        help=_('Slow down the purge so that no more than this many rows '
+               'are deleted per second. 0 means no limit.'))
+    parser.add_argument(
+        '--dry-run', action='store_true',
+        help=_('Only print the number of rows that would be purged from '
+               'each table.'))
 
     # update_params parser
     parser = subparsers.add_parser('update_params')
@@ -85,6 +85,40 @@ service_opts = [
     cfg.IntOpt('max_nested_stack_depth',
                default=5,
                help=_('Maximum depth allowed when using nested stacks.')),
+    cfg.IntOpt('parsed_template_cache_size',
+               default=100,
+               help=_('Maximum number of templates cached by each process, '
+                      'both for stored templates (keyed by their ID) and for '
+                      'YAML templates that are not yet stored (keyed by a '
+                      'digest of their content). Set to 0 to disable the '
+                      'caches.')),
+    cfg.IntOpt('template_files_cache_size',
+               default=100, min=0,
+               help=_('Maximum number of stored template files maps that '
+                      'each process keeps in memory after they are no longer '
+                      'in use, keyed by their ID. Stacks with identical '
+                      'files, such as the members of a large resource '
+                      'group, share a single stored files map. Set to 0 to '
+                      'disable the cache.')),
+    cfg.IntOpt('trusts_auth_cache_size',
+               default=1000, min=0,
+               help=_('Maximum number of trust authentication plugins cached '
+                      'by each process, keyed by trust ID. Requests made on '
+                      'behalf of the same trust reuse the cached plugin and '
+                      'hence its Keystone token, instead of authenticating '
+                      'again. Set to 0 to disable the cache.')),
+    cfg.IntOpt('trusts_auth_cache_idle_timeout',
+               default=600, min=0,
+               help=_('Number of seconds after which a cached trust '
+                      'authentication plugin that has not been used is '
+                      'discarded.')),
+    cfg.IntOpt('deployment_metadata_cache_size',
+               default=1000, min=0,
+               help=_('Maximum number of servers for which each engine '
+                      'caches the software deployment metadata. A cached '
+                      'entry is only used while the metadata version stored '
+                      'with the server resource is unchanged. Set to 0 to '
+                      'disable the cache.')),
     cfg.IntOpt('num_engine_workers',
                help=_('Number of heat-engine processes to fork and run. '
                       'Will default to either to 4 or number of CPUs on '
@@ -164,9 +198,52 @@ engine_opts = [
                help=_('Rough number of maximum events that will be available '
                       'per stack. Actual number of events can be a bit '
                       'higher since purge checks take place randomly '
-                      '200/event_purge_batch_size percent of the time. '
+                      '200/event_purge_batch_size percent of the time, '
+                      'or periodically if event_purge_interval is set. '
                       'Older events are deleted when events are purged. '
                       'Set to 0 for unlimited events per stack.')),
+    cfg.IntOpt('event_purge_interval',
+               min=0,
+               default=0,
+               help=_('Interval in seconds between checks for stacks with '
+                      'more than max_events_per_stack events, whose oldest '
+                      'events are then purged by a periodic task of the '
+                      'engine. Set to 0 to check for events to purge when '
+                      'events are created instead.')),
+    cfg.FloatOpt('event_batch_interval',
+                 min=0,
+                 default=0,
+                 help=_('Maximum time in seconds that an engine buffers '
+                        'events before writing them to the database in a '
+                        'single batch. Buffered events are also written '
+                        'when a stack action completes. Set to 0 to write '
+                        'each event as it occurs.')),
+    cfg.IntOpt('event_batch_size',
+               min=1,
+               default=100,
+               help=_('Maximum number of events that an engine buffers '
+                      'before writing them to the database, when '
+                      'event_batch_interval is set.')),
+    cfg.FloatOpt('status_poll_batch_interval',
+                 min=0,
+                 default=0,
+                 help=_('Time in seconds for which an engine reuses the '
+                        'status of a resource fetched while waiting for an '
+                        'action to complete. When resources of the same type '
+                        'in the same project are waiting at once, their '
+                        'statuses are then fetched together in a single list '
+                        'call. Currently used for Neutron networks, ports, '
+                        'routers and trunks. Set to 0 to fetch the status of '
+                        'each resource separately.')),
+    cfg.FloatOpt('deployment_metadata_push_interval',
+                 min=0,
+                 default=0,
+                 help=_('Time in seconds for which an engine delays writing '
+                        'the software deployment metadata of a server and '
+                        'delivering it to the server, so that the changes '
+                        'made to several deployments of the server in that '
+                        'time are pushed together. Set to 0 to push the '
+                        'metadata after every change.')),
     cfg.IntOpt('stack_action_timeout',
                default=3600,
                help=_('Timeout in seconds for stack action (ie. create or'
@@ -180,6 +257,27 @@ engine_opts = [
                default=2,
                help=_('RPC timeout for the engine liveness check that is used'
                       ' for stack locking.')),
+    cfg.StrOpt('stack_lock_backend',
+               default='database',
+               choices=['database', 'memory'],
+               help=_('Where stack locks are kept. "database" shares them '
+                      'between all engines. "memory" keeps them in the '
+                      'engine process, which avoids database writes and '
+                      'can never leave stale locks behind, but may only be '
+                      'used when a single heat-engine process (with '
+                      'num_engine_workers set to 1) serves the whole '
+                      'deployment.')),
+    cfg.IntOpt('stack_lock_lease_time',
+               default=0, min=0,
+               help=_('Number of seconds for which an engine holds its stack '
+                      'locks after it last reported itself alive (which it '
+                      'does every periodic_interval seconds). Once that time '
+                      'has passed, another engine may take over the locks '
+                      'without contacting it. Must be greater than '
+                      'periodic_interval. 0 means that the owner of a lock '
+                      'is instead asked over RPC whether it is still alive, '
+                      'waiting up to engine_life_check_timeout for an '
+                      'answer.')),
     cfg.BoolOpt('enable_cloud_watch_lite',
                 default=False,
                 deprecated_for_removal=True,
@@ -197,6 +295,12 @@ engine_opts = [
                 help=_('Enables engine with convergence architecture. All '
                        'stacks with this option will be created using '
                        'convergence engine.')),
+    cfg.IntOpt('check_resource_batch_size',
+               default=10,
+               help=_('Maximum number of resources sent to a single '
+                      'engine worker in one message when several resources '
+                      'of a convergence stack become ready at the same time. '
+                      'Set to 1 to send one message per resource.')),
     cfg.BoolOpt('observe_on_update',
                 default=False,
                 help=_('On update, enables heat to collect existing resource '
@@ -400,6 +504,16 @@ def startup_sanity_check():
                                     '"stack_user_domain_name" without '
                                     '"stack_domain_admin" and '
                                     '"stack_domain_admin_password"'))
+    if (cfg.CONF.stack_lock_backend == 'memory' and
+            cfg.CONF.num_engine_workers != 1):
+        raise exception.Error(_('heat.conf misconfigured, the "memory" '
+                                'stack_lock_backend requires '
+                                '"num_engine_workers" to be 1'))
+    lease_time = cfg.CONF.stack_lock_lease_time
+    if lease_time and lease_time <= cfg.CONF.periodic_interval:
+        raise exception.Error(_('heat.conf misconfigured, '
+                                '"stack_lock_lease_time" must be greater '
+                                'than "periodic_interval"'))
     auth_key_len = len(cfg.CONF.auth_encryption_key)
     if auth_key_len in (16, 24):
         LOG.warning(
@@ -23,11 +23,14 @@ from oslo_log import log as logging
 import oslo_messaging
 from oslo_middleware import request_id as oslo_request_id
 from oslo_utils import importutils
+import requests
 import six
+from six.moves import http_cookiejar
 
 from heat.common import config
 from heat.common import endpoint_utils
 from heat.common import exception
+from heat.common import lru_cache
 from heat.common import policy
 from heat.common import wsgi
 from heat.db.sqlalchemy import api as db_api
@@ -58,6 +61,31 @@ def list_opts():
     yield TRUSTEE_CONF_GROUP, trustee_opts
 
 
+# Per-process pool of HTTP connections and cache of API version discovery
+# documents, shared by the Keystone sessions of all contexts so that
+# connections to the OpenStack services are kept alive between requests.
+_http_session = None
+_discovery_cache = {}
+
+# per-process cache of trust authentication plugins, keyed by trust ID
+_trusts_auth_plugins = lru_cache.LRUCache(
+    lambda: cfg.CONF.trusts_auth_cache_size,
+    idle_timeout=lambda: cfg.CONF.trusts_auth_cache_idle_timeout)
+
+
+def _get_http_session():
+    global _http_session
+    if _http_session is None:
+        http_session = requests.Session()
+        # Never pass cookies from one user's responses to another's requests
+        http_session.cookies.set_policy(
+            http_cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        for scheme in list(http_session.adapters):
+            http_session.mount(scheme, session.TCPKeepAliveAdapter())
+        _http_session = http_session
+    return _http_session
+
+
 def _moved_attr(new_name):
 
     def getter(self):
@@ -111,6 +139,8 @@ class RequestContext(context.RequestContext):
         self._session = None
         self._clients = None
         self._keystone_session = session.Session(
+            session=_get_http_session(),
+            discovery_cache=_discovery_cache,
             **config.get_ssl_options('keystone'))
         self.trust_id = trust_id
         self.trustor_user_id = trustor_user_id
@@ -235,8 +265,7 @@ class RequestContext(context.RequestContext):
     @property
     def trusts_auth_plugin(self):
         if not self._trusts_auth_plugin:
-            self._trusts_auth_plugin = ks_loading.load_auth_from_conf_options(
-                cfg.CONF, TRUSTEE_CONF_GROUP, trust_id=self.trust_id)
+            self._trusts_auth_plugin = self._load_trusts_auth_plugin()
 
         if not self._trusts_auth_plugin:
             LOG.error('Please add the trustee credentials you need '
@@ -246,6 +275,21 @@ class RequestContext(context.RequestContext):
 
         return self._trusts_auth_plugin
 
+    def _load_trusts_auth_plugin(self):
+        if not self.trust_id:
+            return ks_loading.load_auth_from_conf_options(
+                cfg.CONF, TRUSTEE_CONF_GROUP, trust_id=self.trust_id)
+
+        # Reuse the plugin, and so the token, of an earlier request on
+        # behalf of the same trust
+        auth = _trusts_auth_plugins.get(self.trust_id)
+        if auth is None:
+            auth = ks_loading.load_auth_from_conf_options(
+                cfg.CONF, TRUSTEE_CONF_GROUP, trust_id=self.trust_id)
+            if auth:
+                _trusts_auth_plugins.set(self.trust_id, auth)
+        return auth
+
     def _create_auth_plugin(self):
         if self.auth_token_info:
             access_info = access.create(body=self.auth_token_info,
@@ -0,0 +1,127 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""A size-bounded, least-recently-used cache for per-process data."""
+
+import collections
+import threading
+
+from oslo_utils import timeutils
+import six
+
+
+class LRUCache(object):
+    """A mapping that discards the least recently used items when full.
+
+    ``maxsize`` is either an integer or a callable returning one; a callable
+    is consulted on every write, so that the size can follow a config option
+    that changes at runtime. A size of 0 (or less) disables caching
+    altogether. The number of cache hits and misses is recorded so that the
+    effectiveness of the cache can be reported.
+
+    If ``idle_timeout`` (again, a number or a callable returning one) is
+    given, items that have not been used for that many seconds are
+    discarded as well.
+
+    All access to the cache is serialised by a lock.
+    """
+
+    def __init__(self, maxsize, idle_timeout=None):
+        self._maxsize = maxsize
+        self._idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._data = collections.OrderedDict()
+        self._last_used = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        if six.callable(self._maxsize):
+            return self._maxsize()
+        return self._maxsize
+
+    @property
+    def idle_timeout(self):
+        if six.callable(self._idle_timeout):
+            return self._idle_timeout()
+        return self._idle_timeout
+
+    def _discard_idle(self, now):
+        # Items are kept in order of use, so the idle ones are at the start
+        idle_timeout = self.idle_timeout
+        if idle_timeout is None:
+            return
+        while self._data:
+            key = next(iter(self._data))
+            if now - self._last_used[key] <= idle_timeout:
+                break
+            del self._data[key]
+            del self._last_used[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._last_used.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get(self, key, default=None):
+        now = timeutils.now()
+        with self._lock:
+            self._discard_idle(now)
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data[key] = value
+            self._last_used[key] = now
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        maxsize = self.maxsize
+        now = timeutils.now()
+        with self._lock:
+            self._data.pop(key, None)
+            self._last_used.pop(key, None)
+            if maxsize > 0:
+                self._data[key] = value
+                self._last_used[key] = now
+            while len(self._data) > max(maxsize, 0):
+                old_key, old_value = self._data.popitem(last=False)
+                del self._last_used[old_key]
+            self._discard_idle(now)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            self._last_used.pop(key, None)
+            return self._data.pop(key, default)
+
+    def stats(self):
+        """Return a dict of statistics about the use of the cache."""
+        maxsize = self.maxsize
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'size': len(self._data),
+                    'maxsize': maxsize}
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
@@ -30,13 +30,14 @@ LOG = logging.getLogger(__name__)
 
 class JSONResponseSerializer(object):
 
-    def to_json(self, data):
+    def to_json(self, data, sort_keys=False):
         def sanitizer(obj):
             if isinstance(obj, datetime.datetime):
                 return obj.isoformat()
             return six.text_type(obj)
 
-        response = jsonutils.dumps(data, default=sanitizer)
+        response = jsonutils.dumps(data, default=sanitizer,
+                                   sort_keys=sort_keys)
 
         # TODO(ricolin): Fix response through private credential information,
         # before enable below debug message.
@@ -48,6 +49,19 @@ class JSONResponseSerializer(object):
         response.content_type = 'application/json'
         response.body = six.b(self.to_json(result))
 
+    def conditional(self, response, result):
+        """Serialize a result that clients may poll for changes.
+
+        The response carries an ETag of its body, which is serialized with
+        sorted keys so that equal results always get the same ETag. A
+        request with a matching If-None-Match header is answered with an
+        empty 304 Not Modified response instead.
+        """
+        response.content_type = 'application/json'
+        response.body = six.b(self.to_json(result, sort_keys=True))
+        response.md5_etag()
+        response.conditional_response = True
+
 
 # Escape XML serialization for these keys, as the AWS API defines them as
 # JSON inside XML when the response format is XML.
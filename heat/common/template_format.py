@@ -12,6 +12,8 @@
 #    under the License.
 
 import collections
+import copy
+import hashlib
 
 from oslo_config import cfg
 from oslo_serialization import jsonutils
@@ -20,6 +22,7 @@ import yaml
 
 from heat.common import exception
 from heat.common.i18n import _
+from heat.common import lru_cache
 
 if hasattr(yaml, 'CSafeLoader'):
     _yaml_loader_base = yaml.CSafeLoader
@@ -57,6 +60,10 @@ yaml_loader.add_constructor(u'tag:yaml.org,2002:timestamp',
 yaml_dumper.add_representer(collections.OrderedDict,
                             yaml_dumper.represent_ordered_dict)
 
+# per-process cache of parsed YAML templates, keyed by content digest
+_parsed_templates = lru_cache.LRUCache(
+    lambda: cfg.CONF.parsed_template_cache_size)
+
 
 def simple_parse(tmpl_str, tmpl_url=None):
     try:
@@ -111,7 +118,17 @@ def parse(tmpl_str, tmpl_url=None):
 
     # TODO(ricolin): Move this validation to api side.
     # Validate nested stack template.
-    validate_template_limit(six.text_type(tmpl_str))
+    tmpl_text = six.text_type(tmpl_str)
+    validate_template_limit(tmpl_text)
+
+    # Decoding JSON is about as cheap as copying a cached result, so only
+    # YAML templates are worth caching.
+    digest = None
+    if not tmpl_text.lstrip().startswith('{'):
+        digest = hashlib.sha256(tmpl_text.encode('utf-8')).hexdigest()
+        cached = _parsed_templates.get(digest)
+        if cached is not None:
+            return copy.deepcopy(cached)
 
     tpl = simple_parse(tmpl_str, tmpl_url)
     # Looking for supported version keys in the loaded template
@@ -119,6 +136,8 @@ def parse(tmpl_str, tmpl_url=None):
             or 'heat_template_version' in tpl
             or 'AWSTemplateFormatVersion' in tpl):
         raise ValueError(_("Template format version not found."))
+    if digest is not None:
+        _parsed_templates.set(digest, copy.deepcopy(tpl))
     return tpl
 
 
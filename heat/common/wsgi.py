@@ -88,6 +88,13 @@ api_opts = [
                help=_('The value for the socket option TCP_KEEPIDLE.  This is '
                       'the time in seconds that the connection must be idle '
                       'before TCP starts sending keepalive probes.')),
+    cfg.IntOpt('stack_list_page_size', min=0, default=0,
+               help=_('When a stack list request does not specify a limit, '
+                      'fetch the stacks from the engine in pages of this '
+                      'many stacks and stream them to the client as they '
+                      'arrive, so that listing a very large number of '
+                      'stacks does not have to be held in memory all at '
+                      'once. 0 disables streaming.')),
 ]
 api_group = cfg.OptGroup('heat_api')
 cfg.CONF.register_group(api_group)
@@ -12,9 +12,12 @@
 #    under the License.
 
 """Implementation of SQLAlchemy backend."""
+import collections
 import datetime
+import hashlib
 import itertools
 import random
+import time
 
 from oslo_config import cfg
 from oslo_db import api as oslo_db_api
@@ -23,6 +26,7 @@ from oslo_db import options
 from oslo_db.sqlalchemy import enginefacade
 from oslo_db.sqlalchemy import utils
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 from oslo_utils import encodeutils
 from oslo_utils import timeutils
 import osprofiler.sqlalchemy
@@ -122,6 +126,17 @@ def raw_template_get(context, template_id):
     return result
 
 
+def raw_template_get_timestamps(context, template_id):
+    result = context.session.query(
+        models.RawTemplate.created_at,
+        models.RawTemplate.updated_at).filter_by(id=template_id).first()
+
+    if not result:
+        raise exception.NotFound(_('raw template with id %s not found') %
+                                 template_id)
+    return tuple(result)
+
+
 def raw_template_create(context, values):
     raw_template_ref = models.RawTemplate()
     raw_template_ref.update(values)
@@ -157,12 +172,35 @@ def raw_template_delete(context, template_id):
             session.delete(raw_tmpl_files)
 
 
+def _raw_template_files_digest(files):
+    content = jsonutils.dumps(files, sort_keys=True)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
 def raw_template_files_create(context, values):
+    """Store a files map, or return an identical one already stored.
+
+    A raw_template_files row is never modified once stored, so every
+    raw_template with the same files shares the one row, found by a digest
+    of its content. A row is only deleted once no raw_template refers to it.
+    """
     session = context.session
+    values = dict(values,
+                  digest=_raw_template_files_digest(values['files']))
+    query = session.query(models.RawTemplateFiles).filter_by(
+        digest=values['digest'])
+    raw_templ_files_ref = query.first()
+    if raw_templ_files_ref is not None:
+        return raw_templ_files_ref
+
     raw_templ_files_ref = models.RawTemplateFiles()
     raw_templ_files_ref.update(values)
-    with session.begin():
-        raw_templ_files_ref.save(session)
+    try:
+        with session.begin():
+            raw_templ_files_ref.save(session)
+    except db_exception.DBDuplicateEntry:
+        # The same files were stored concurrently
+        raw_templ_files_ref = query.first()
     return raw_templ_files_ref
 
 
@@ -206,6 +244,16 @@ def resource_get_by_name_and_stack(context, resource_name, stack_id):
     return result
 
 
+def resource_get_all_by_name_and_stack(context, resource_name, stack_id):
+    return context.session.query(
+        models.Resource
+    ).filter_by(
+        name=resource_name
+    ).filter_by(
+        stack_id=stack_id
+    ).all()
+
+
 def resource_get_all_by_physical_resource_id(context, physical_resource_id):
     results = (context.session.query(models.Resource)
                .filter_by(physical_resource_id=physical_resource_id)
@@ -577,18 +625,24 @@ def stack_get(context, stack_id, show_deleted=False, eager_load=True):
         query = query.options(orm.joinedload("raw_template"))
     result = query.get(stack_id)
 
-    deleted_ok = show_deleted or context.show_deleted
-    if result is None or result.deleted_at is not None and not deleted_ok:
+    if not stack_visible(context, result, show_deleted):
         return None
+    return result
+
+
+def stack_visible(context, stack, show_deleted=False):
+    """Return whether a stack DB object is visible in the given context."""
+    deleted_ok = show_deleted or context.show_deleted
+    if stack is None or stack.deleted_at is not None and not deleted_ok:
+        return False
 
     # One exception to normal project scoping is users created by the
     # stacks in the stack_user_project_id (in the heat stack user domain)
-    if (result is not None
-        and context is not None and not context.is_admin
-        and context.tenant_id not in (result.tenant,
-                                      result.stack_user_project_id)):
-        return None
-    return result
+    if (context is not None and not context.is_admin
+        and context.tenant_id not in (stack.tenant,
+                                      stack.stack_user_project_id)):
+        return False
+    return True
 
 
 def stack_get_status(context, stack_id):
@@ -609,11 +663,21 @@ def stack_get_all_by_owner_id(context, owner_id):
     return results
 
 
-def stack_get_all_by_root_owner_id(context, owner_id):
-    for stack in stack_get_all_by_owner_id(context, owner_id):
-        yield stack
-        for ch_st in stack_get_all_by_root_owner_id(context, stack.id):
-            yield ch_st
+def stack_get_all_by_root_owner_id(context, owner_id, eager_load=False):
+    # Walk the tree one level of nesting at a time, so that the number of
+    # queries is bounded by the depth of the tree rather than the number of
+    # stacks in it.
+    parent_ids = [owner_id]
+    while parent_ids:
+        query = soft_delete_aware_query(
+            context, models.Stack
+        ).filter(models.Stack.owner_id.in_(parent_ids))
+        if eager_load:
+            query = query.options(orm.joinedload("raw_template"))
+        children = query.all()
+        for stack in children:
+            yield stack
+        parent_ids = [stack.id for stack in children]
 
 
 def _get_sort_keys(sort_keys, mapping):
@@ -628,6 +692,25 @@ def _get_sort_keys(sort_keys, mapping):
     return [mapping[key] for key in sort_keys or [] if key in mapping]
 
 
+def _seek_to_marker(query, model, sort_key, sort_dir, marker):
+    """Restrict a query to rows that sort no earlier than the marker.
+
+    paginate_query() selects the rows after the marker with an OR of
+    comparisons across all of the sort keys, which prevents the database from
+    seeking to the marker in an index on the first sort key. Adding the
+    (redundant) range on the first sort key alone allows it to do so, rather
+    than scanning every row before the marker.
+    """
+    column = getattr(model, sort_key, None)
+    value = getattr(marker, sort_key, None)
+    if (column is None or value is None or
+            isinstance(value, bool) or sort_dir not in (None, 'asc', 'desc')):
+        return query
+    if sort_dir == 'desc':
+        return query.filter(column <= value)
+    return query.filter(column >= value)
+
+
 def _paginate_query(context, query, model, limit=None, sort_keys=None,
                     marker=None, sort_dir=None):
     default_sort_keys = ['created_at']
@@ -643,6 +726,8 @@ def _paginate_query(context, query, model, limit=None, sort_keys=None,
     model_marker = None
     if marker:
         model_marker = context.session.query(model).get(marker)
+        query = _seek_to_marker(query, model, sort_keys[0], sort_dir,
+                                model_marker)
     try:
         query = utils.paginate_query(query, model, limit, sort_keys,
                                      model_marker, sort_dir)
@@ -989,6 +1074,8 @@ def _events_paginate_query(context, query, model, limit=None, sort_keys=None,
         # user can only see the ID(column 'uuid') and the ID as the marker
         model_marker = context.session.query(
             model).filter_by(uuid=marker).first()
+        query = _seek_to_marker(query, model, sort_keys[0], sort_dir,
+                                model_marker)
     try:
         query = utils.paginate_query(query, model, limit, sort_keys,
                                      model_marker, sort_dir)
@@ -1057,23 +1144,66 @@ def _delete_event_rows(context, stack_id, limit):
     return retval
 
 
+def _purge_events_if_needed(context, stack_id):
+    if (not cfg.CONF.max_events_per_stack or
+            cfg.CONF.event_purge_interval):
+        # Events are either unlimited or purged by a periodic task
+        return
+    # only count events and purge on average
+    # 200.0/cfg.CONF.event_purge_batch_size percent of the time.
+    check = (2.0 / cfg.CONF.event_purge_batch_size) > random.uniform(0, 1)
+    if (check and
+        (event_count_all_by_stack(context, stack_id) >=
+         cfg.CONF.max_events_per_stack)):
+        # prune
+        _delete_event_rows(
+            context, stack_id, cfg.CONF.event_purge_batch_size)
+
+
 def event_create(context, values):
-    if 'stack_id' in values and cfg.CONF.max_events_per_stack:
-        # only count events and purge on average
-        # 200.0/cfg.CONF.event_purge_batch_size percent of the time.
-        check = (2.0 / cfg.CONF.event_purge_batch_size) > random.uniform(0, 1)
-        if (check and
-            (event_count_all_by_stack(context, values['stack_id']) >=
-             cfg.CONF.max_events_per_stack)):
-            # prune
-            _delete_event_rows(
-                context, values['stack_id'], cfg.CONF.event_purge_batch_size)
+    if 'stack_id' in values:
+        _purge_events_if_needed(context, values['stack_id'])
     event_ref = models.Event()
     event_ref.update(values)
     event_ref.save(context.session)
     return event_ref
 
 
+def event_create_all(context, values_list):
+    """Create a batch of events in a single transaction."""
+    session = context.session
+    with session.begin(subtransactions=True):
+        stack_ids = set(values['stack_id'] for values in values_list
+                        if 'stack_id' in values)
+        for stack_id in stack_ids:
+            _purge_events_if_needed(context, stack_id)
+        event_refs = []
+        for values in values_list:
+            event_ref = models.Event()
+            event_ref.update(values)
+            session.add(event_ref)
+            event_refs.append(event_ref)
+    return event_refs
+
+
+def event_purge_all(context):
+    """Purge the oldest events of any stack over max_events_per_stack.
+
+    Returns the number of events deleted.
+    """
+    max_events = cfg.CONF.max_events_per_stack
+    if not max_events:
+        return 0
+    event_count = func.count(models.Event.id)
+    query = context.session.query(models.Event.stack_id, event_count)
+    query = query.group_by(models.Event.stack_id).having(
+        event_count > max_events)
+    deleted = 0
+    for stack_id, count in query.all():
+        deleted += _delete_event_rows(context, stack_id, count - max_events)
+    return deleted
+
+
 def software_config_create(context, values):
     obj_ref = models.SoftwareConfig()
     obj_ref.update(values)
@@ -1248,6 +1378,12 @@ def service_get_all(context):
             filter_by(deleted_at=None).all())
 
 
+def service_get_by_engine_id(context, engine_id):
+    # Stopped engines' services are soft-deleted, so include those
+    return (context.session.query(models.Service).
+            filter_by(engine_id=engine_id).first())
+
+
 def service_get_all_by_args(context, host, binary, hostname):
     return (context.session.query(models.Service).
             filter_by(host=host).
@@ -1255,7 +1391,56 @@ def service_get_all_by_args(context, host, binary, hostname):
             filter_by(hostname=hostname).all())
 
 
-def purge_deleted(age, granularity='days', project_id=None, batch_size=20):
+class _PurgeProgress(object):
+    """Count the rows removed by a purge and limit the rate of removal.
+
+    If max_rows_per_second is set, record() sleeps whenever the rows removed
+    so far have been removed faster than that.
+    """
+
+    def __init__(self, max_rows_per_second=0):
+        self.max_rows_per_second = max_rows_per_second
+        self.started = timeutils.now()
+        self.counts = collections.defaultdict(int)
+
+    @property
+    def total(self):
+        return sum(six.itervalues(self.counts))
+
+    def rate(self):
+        elapsed = timeutils.now() - self.started
+        return self.total / elapsed if elapsed > 0 else 0.0
+
+    def record(self, table_name, rows):
+        self.counts[table_name] += rows
+        if self.max_rows_per_second > 0:
+            earliest = self.started + (float(self.total) /
+                                       self.max_rows_per_second)
+            delay = earliest - timeutils.now()
+            if delay > 0:
+                time.sleep(delay)
+
+
+def _purge_execute(engine, progress, table, statement):
+    result = engine.execute(statement)
+    progress.record(table.name, max(result.rowcount, 0))
+
+
+def purge_deleted(age, granularity='days', project_id=None, batch_size=20,
+                  chunk_size=1000, max_rows_per_second=0, dry_run=False):
+    """Remove soft-deleted stacks older than age, with all of their data.
+
+    The expired stacks are read in pages of batch_size, ordered by id, and
+    each page is removed before the next is read. Events, which usually
+    make up most of the rows, are deleted chunk_size rows at a time, so no
+    single statement holds locks on more than that many of them. A stack is
+    only deleted after all of its data, so an interrupted purge can simply
+    be run again to pick up where it stopped.
+
+    Returns a dict of the number of rows deleted from each table or, for a
+    dry run, the number of rows belonging to the expired stacks, without
+    deleting anything.
+    """
     def _validate_positive_integer(val, argname):
         try:
             val = int(val)
@@ -1269,6 +1454,9 @@ def purge_deleted(age, granularity='days', project_id=None, batch_size=20):
 
     age = _validate_positive_integer(age, 'age')
     batch_size = _validate_positive_integer(batch_size, 'batch_size')
+    chunk_size = max(_validate_positive_integer(chunk_size, 'chunk_size'), 1)
+    max_rows_per_second = _validate_positive_integer(max_rows_per_second,
+                                                     'max_rows_per_second')
 
     if granularity not in ('days', 'hours', 'minutes', 'seconds'):
         raise exception.Error(
@@ -1289,9 +1477,21 @@ def purge_deleted(age, granularity='days', project_id=None, batch_size=20):
     stack = sqlalchemy.Table('stack', meta, autoload=True)
     service = sqlalchemy.Table('service', meta, autoload=True)
 
+    if project_id:
+        stack_filter = and_(stack.c.tenant == project_id,
+                            stack.c.deleted_at < time_line)
+    else:
+        stack_filter = stack.c.deleted_at < time_line
+
+    if dry_run:
+        return _purge_estimate(engine, meta, stack_filter,
+                               service.c.deleted_at < time_line)
+
+    progress = _PurgeProgress(max_rows_per_second)
+
     # Purge deleted services
     srvc_del = service.delete().where(service.c.deleted_at < time_line)
-    engine.execute(srvc_del)
+    _purge_execute(engine, progress, service, srvc_del)
 
     # find the soft-deleted stacks that are past their expiry
     sel = sqlalchemy.select([stack.c.id, stack.c.raw_template_id,
@@ -1299,31 +1499,67 @@ def purge_deleted(age, granularity='days', project_id=None, batch_size=20):
                              stack.c.user_creds_id,
                              stack.c.action,
                              stack.c.status,
-                             stack.c.name])
-    if project_id:
-        stack_where = sel.where(and_(
-            stack.c.tenant == project_id,
-            stack.c.deleted_at < time_line))
-    else:
-        stack_where = sel.where(
-            stack.c.deleted_at < time_line)
-
-    stacks = engine.execute(stack_where)
+                             stack.c.name]).order_by(stack.c.id)
 
+    marker = None
     while True:
-        next_stacks_to_purge = list(itertools.islice(stacks, batch_size))
-        if len(next_stacks_to_purge):
-            _purge_stacks(next_stacks_to_purge, engine, meta)
-        else:
+        stack_where = stack_filter
+        if marker is not None:
+            stack_where = and_(stack_where, stack.c.id > marker)
+        next_stacks_to_purge = list(engine.execute(
+            sel.where(stack_where).limit(batch_size)))
+        if not next_stacks_to_purge:
             break
+        _purge_stacks(next_stacks_to_purge, engine, meta, progress,
+                      chunk_size)
+        marker = next_stacks_to_purge[-1][0]
+        LOG.info("Purged %(stacks)d stacks so far, %(rows)d rows in total "
+                 "(%(rate).1f rows per second)",
+                 {'stacks': progress.counts['stack'],
+                  'rows': progress.total,
+                  'rate': progress.rate()})
+
+    return dict(progress.counts)
+
 
+def _purge_estimate(engine, meta, stack_filter, service_filter):
+    """Count the rows that purge_deleted() would remove, by table.
 
-def _purge_stacks(stack_infos, engine, meta):
+    Templates and credentials that may be shared with other stacks are not
+    counted.
+    """
+    stack = sqlalchemy.Table('stack', meta, autoload=True)
+    stack_ids = sqlalchemy.select([stack.c.id]).where(stack_filter)
+    resource = sqlalchemy.Table('resource', meta, autoload=True)
+    resource_ids = sqlalchemy.select([resource.c.id]).where(
+        resource.c.stack_id.in_(stack_ids))
+
+    def _count(table_name, where):
+        table = sqlalchemy.Table(table_name, meta, autoload=True)
+        count = sqlalchemy.select([func.count()]).select_from(table)
+        return engine.execute(count.where(where(table))).scalar()
+
+    counts = {'service': _count('service', lambda t: service_filter),
+              'stack': _count('stack', lambda t: stack_filter),
+              'resource_data': _count(
+                  'resource_data',
+                  lambda t: t.c.resource_id.in_(resource_ids))}
+    for table_name in ('stack_lock', 'stack_tag', 'sync_point_input',
+                       'sync_point', 'event', 'resource'):
+        counts[table_name] = _count(
+            table_name, lambda t: t.c.stack_id.in_(stack_ids))
+    return counts
+
+
+def _purge_stacks(stack_infos, engine, meta, progress, chunk_size):
     """Purge some stacks and their releated events, raw_templates, etc.
 
     stack_infos is a list of lists of selected stack columns:
     [[id, raw_template_id, prev_raw_template_id, user_creds_id,
       action, status, name], ...]
+
+    The stacks themselves are deleted after everything that refers to them,
+    so that the purge can be retried if it is interrupted.
     """
 
     stack = sqlalchemy.Table('stack', meta, autoload=True)
@@ -1339,32 +1575,35 @@ def _purge_stacks(stack_infos, engine, meta):
                                           autoload=True)
     user_creds = sqlalchemy.Table('user_creds', meta, autoload=True)
     syncpoint = sqlalchemy.Table('sync_point', meta, autoload=True)
+    syncpoint_input = sqlalchemy.Table('sync_point_input', meta,
+                                       autoload=True)
 
     stack_info_str = ','.join([str(i) for i in stack_infos])
     LOG.info("Purging stacks %s", stack_info_str)
 
-    # TODO(cwolfe): find a way to make this re-entrant with
-    # reasonably sized transactions (good luck), or add
-    # a cleanup for orphaned rows.
     stack_ids = [stack_info[0] for stack_info in stack_infos]
     # delete stack locks (just in case some got stuck)
     stack_lock_del = stack_lock.delete().where(
         stack_lock.c.stack_id.in_(stack_ids))
-    engine.execute(stack_lock_del)
+    _purge_execute(engine, progress, stack_lock, stack_lock_del)
     # delete stack tags
     stack_tag_del = stack_tag.delete().where(
         stack_tag.c.stack_id.in_(stack_ids))
-    engine.execute(stack_tag_del)
+    _purge_execute(engine, progress, stack_tag, stack_tag_del)
     # delete resource_data
     res_where = sqlalchemy.select([resource.c.id]).where(
         resource.c.stack_id.in_(stack_ids))
     res_data_del = resource_data.delete().where(
         resource_data.c.resource_id.in_(res_where))
-    engine.execute(res_data_del)
+    _purge_execute(engine, progress, resource_data, res_data_del)
     # clean up any sync_points that may have lingered
+    sync_input_del = syncpoint_input.delete().where(
+        syncpoint_input.c.stack_id.in_(stack_ids))
+    _purge_execute(engine, progress, syncpoint_input,
+                   sync_input_del)
     sync_del = syncpoint.delete().where(
         syncpoint.c.stack_id.in_(stack_ids))
-    engine.execute(sync_del)
+    _purge_execute(engine, progress, syncpoint, sync_del)
 
     # get rsrc_prop_data_ids to delete
     rsrc_prop_data_where = sqlalchemy.select(
@@ -1377,17 +1616,22 @@ def _purge_stacks(stack_infos, engine, meta):
             resource.c.stack_id.in_(stack_ids))
     rsrc_prop_data_ids.update(
         [i[0] for i in list(engine.execute(rsrc_prop_data_where))])
-    rsrc_prop_data_where = sqlalchemy.select(
-        [event.c.rsrc_prop_data_id]).where(
-            event.c.stack_id.in_(stack_ids))
-    rsrc_prop_data_ids.update(
-        [i[0] for i in list(engine.execute(rsrc_prop_data_where))])
-    # delete events
-    event_del = event.delete().where(event.c.stack_id.in_(stack_ids))
-    engine.execute(event_del)
+    # delete events, a chunk at a time, collecting their rsrc_prop_data_ids
+    event_sel = sqlalchemy.select(
+        [event.c.id, event.c.rsrc_prop_data_id]).where(
+            event.c.stack_id.in_(stack_ids)).order_by(
+                event.c.id).limit(chunk_size)
+    while True:
+        events = list(engine.execute(event_sel))
+        if not events:
+            break
+        rsrc_prop_data_ids.update(i[1] for i in events)
+        event_del = event.delete().where(
+            event.c.id.in_([i[0] for i in events]))
+        _purge_execute(engine, progress, event, event_del)
     # delete resources (normally there shouldn't be any)
     res_del = resource.delete().where(resource.c.stack_id.in_(stack_ids))
-    engine.execute(res_del)
+    _purge_execute(engine, progress, resource, res_del)
     # delete resource_properties_data
     if rsrc_prop_data_ids:  # keep rpd's in events
         rsrc_prop_data_where = sqlalchemy.select(
@@ -1404,10 +1648,11 @@ def _purge_stacks(stack_infos, engine, meta):
     if rsrc_prop_data_ids:  # delete if we have any
         rsrc_prop_data_del = resource_properties_data.delete().where(
             resource_properties_data.c.id.in_(rsrc_prop_data_ids))
-        engine.execute(rsrc_prop_data_del)
+        _purge_execute(engine, progress, resource_properties_data,
+                       rsrc_prop_data_del)
     # delete the stacks
     stack_del = stack.delete().where(stack.c.id.in_(stack_ids))
-    engine.execute(stack_del)
+    _purge_execute(engine, progress, stack, stack_del)
     # delete orphaned raw templates
     raw_template_ids = [i[1] for i in stack_infos if i[1] is not None]
     raw_template_ids.extend(i[2] for i in stack_infos if i[2] is not None)
@@ -1430,19 +1675,20 @@ def _purge_stacks(stack_infos, engine, meta):
             raw_tmpl_file_sel)]
         raw_templ_del = raw_template.delete().where(
             raw_template.c.id.in_(raw_template_ids))
-        engine.execute(raw_templ_del)
-        if raw_tmpl_file_ids:  # keep _files still referenced
-            raw_tmpl_file_sel = sqlalchemy.select(
-                [raw_template.c.files_id]).where(
-                    raw_template.c.files_id.in_(raw_tmpl_file_ids))
-            raw_tmpl_files = [i[0] for i in engine.execute(
-                raw_tmpl_file_sel)]
-            raw_tmpl_file_ids = set(raw_tmpl_file_ids) \
-                - set(raw_tmpl_files)
-        if raw_tmpl_file_ids:  # delete _files if we have any
+        _purge_execute(engine, progress, raw_template, raw_templ_del)
+        raw_tmpl_file_ids = set(i for i in raw_tmpl_file_ids
+                                if i is not None)
+        if raw_tmpl_file_ids:  # delete _files no longer referenced
+            # _files are shared by all templates with the same files, so a
+            # new template may start using them at any time; check for
+            # references in the same statement that deletes them.
+            still_used = sqlalchemy.exists().where(
+                raw_template.c.files_id == raw_template_files.c.id)
             raw_tmpl_file_del = raw_template_files.delete().where(
-                raw_template_files.c.id.in_(raw_tmpl_file_ids))
-            engine.execute(raw_tmpl_file_del)
+                and_(raw_template_files.c.id.in_(raw_tmpl_file_ids),
+                     ~still_used))
+            _purge_execute(engine, progress, raw_template_files,
+                           raw_tmpl_file_del)
     # purge any user creds that are no longer referenced
     user_creds_ids = [i[3] for i in stack_infos if i[3] is not None]
     if user_creds_ids:  # keep those still referenced
@@ -1453,11 +1699,13 @@ def _purge_stacks(stack_infos, engine, meta):
     if user_creds_ids:  # delete if we have any
         usr_creds_del = user_creds.delete().where(
             user_creds.c.id.in_(user_creds_ids))
-        engine.execute(usr_creds_del)
+        _purge_execute(engine, progress, user_creds, usr_creds_del)
 
 
 def sync_point_delete_all_by_stack_and_traversal(context, stack_id,
                                                  traversal_id):
+    context.session.query(models.SyncPointInput).filter_by(
+        stack_id=stack_id, traversal_id=traversal_id).delete()
     rows_deleted = context.session.query(models.SyncPoint).filter_by(
         stack_id=stack_id, traversal_id=traversal_id).delete()
     return rows_deleted
@@ -1493,6 +1741,63 @@ def sync_point_update_input_data(context, entity_id,
     return rows_updated
 
 
+def sync_point_claim(context, entity_id, traversal_id, is_update,
+                     atomic_key):
+    """Atomically mark a sync point as having propagated its input data.
+
+    Returns the number of rows updated, which is 0 if the sync point has been
+    modified since it was read with the given atomic_key.
+    """
+    entity_id = str(entity_id)
+    rows_updated = context.session.query(models.SyncPoint).filter_by(
+        entity_id=entity_id,
+        traversal_id=traversal_id,
+        is_update=is_update,
+        atomic_key=atomic_key
+    ).update({"atomic_key": -1})
+    return rows_updated
+
+
+@oslo_db_api.wrap_db_retry(max_retries=3, retry_on_deadlock=True,
+                           retry_interval=0.5, inc_retry_interval=True)
+def sync_point_input_create(context, values):
+    """Store the input data sent to a sync point by one sender.
+
+    Any input data previously sent by the same sender is replaced.
+    """
+    values = dict(values, entity_id=str(values['entity_id']))
+    input_ref = models.SyncPointInput()
+    input_ref.update(values)
+    try:
+        input_ref.save(context.session)
+    except db_exception.DBDuplicateEntry:
+        context.session.query(models.SyncPointInput).filter_by(
+            entity_id=values['entity_id'],
+            traversal_id=values['traversal_id'],
+            is_update=values['is_update'],
+            sender=values['sender']
+        ).update({"input_data": values['input_data']})
+
+
+def sync_point_input_count(context, entity_id, traversal_id, is_update):
+    entity_id = str(entity_id)
+    return context.session.query(
+        func.count(models.SyncPointInput.sender)).filter_by(
+            entity_id=entity_id,
+            traversal_id=traversal_id,
+            is_update=is_update
+    ).scalar()
+
+
+def sync_point_input_get_all(context, entity_id, traversal_id, is_update):
+    entity_id = str(entity_id)
+    return context.session.query(models.SyncPointInput).filter_by(
+        entity_id=entity_id,
+        traversal_id=traversal_id,
+        is_update=is_update
+    ).all()
+
+
 def db_sync(engine, version=None):
     """Migrate the database to `version` or the most recent version."""
     if version is not None and int(version) < db_version(engine):
@@ -0,0 +1,26 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import sqlalchemy
+
+
+def upgrade(migrate_engine):
+    meta = sqlalchemy.MetaData(bind=migrate_engine)
+
+    raw_template_files = sqlalchemy.Table('raw_template_files', meta,
+                                          autoload=True)
+    digest = sqlalchemy.Column('digest', sqlalchemy.String(64))
+    digest.create(raw_template_files)
+    sqlalchemy.Index('ix_raw_template_files_digest',
+                     raw_template_files.c.digest,
+                     unique=True).create(migrate_engine)
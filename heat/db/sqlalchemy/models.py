@@ -59,8 +59,12 @@ class RawTemplate(BASE, HeatBase):
 class RawTemplateFiles(BASE, HeatBase):
     """Where template files json dicts are stored."""
     __tablename__ = 'raw_template_files'
+    __table_args__ = (
+        sqlalchemy.Index('ix_raw_template_files_digest', 'digest',
+                         unique=True),)
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
     files = sqlalchemy.Column(types.Json)
+    digest = sqlalchemy.Column(sqlalchemy.String(64))
 
 
 class StackTag(BASE, HeatBase):
@@ -100,6 +104,27 @@ class SyncPoint(BASE, HeatBase):
     input_data = sqlalchemy.Column(types.Json)
 
 
+class SyncPointInput(BASE, HeatBase):
+    """Represents the input data sent to a syncpoint by one of its senders."""
+
+    __tablename__ = 'sync_point_input'
+    __table_args__ = (
+        sqlalchemy.PrimaryKeyConstraint('entity_id',
+                                        'traversal_id',
+                                        'is_update',
+                                        'sender'),
+        sqlalchemy.ForeignKeyConstraint(['stack_id'], ['stack.id'])
+    )
+
+    entity_id = sqlalchemy.Column(sqlalchemy.String(36))
+    traversal_id = sqlalchemy.Column(sqlalchemy.String(36))
+    is_update = sqlalchemy.Column(sqlalchemy.Boolean)
+    sender = sqlalchemy.Column(sqlalchemy.String(64))
+    stack_id = sqlalchemy.Column(sqlalchemy.String(36),
+                                 nullable=False)
+    input_data = sqlalchemy.Column(types.Json)
+
+
 class Stack(BASE, HeatBase, SoftDelete, StateAware):
     """Represents a stack created by the heat engine."""
 
@@ -107,6 +132,10 @@ class Stack(BASE, HeatBase, SoftDelete, StateAware):
     __table_args__ = (
         sqlalchemy.Index('ix_stack_name', 'name', mysql_length=255),
         sqlalchemy.Index('ix_stack_tenant', 'tenant', mysql_length=255),
+        sqlalchemy.Index('ix_stack_tenant_created_at',
+                         'tenant', 'created_at', 'id',
+                         mysql_length={'tenant': 255}),
+        sqlalchemy.Index('ix_stack_created_at', 'created_at', 'id'),
     )
 
     id = sqlalchemy.Column(sqlalchemy.String(36), primary_key=True,
@@ -196,6 +225,10 @@ class Event(BASE, HeatBase):
     """Represents an event generated by the heat engine."""
 
     __tablename__ = 'event'
+    __table_args__ = (
+        sqlalchemy.Index('ix_event_stack_id_created_at',
+                         'stack_id', 'created_at', 'id'),
+    )
 
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
     stack_id = sqlalchemy.Column(sqlalchemy.String(36),
@@ -235,8 +235,9 @@ def format_stack(stack, preview=False, resolve_outputs=True):
     # allow users to view the outputs of stacks
     if (not (stack.action == stack.DELETE and stack.status == stack.COMPLETE)
             and resolve_outputs):
-        info[rpc_api.STACK_OUTPUTS] = format_stack_outputs(stack.outputs,
-                                                           resolve_value=True)
+        with stack.attribute_data_cache():
+            info[rpc_api.STACK_OUTPUTS] = format_stack_outputs(
+                stack.outputs, resolve_value=True)
 
     return info
 
@@ -274,6 +275,11 @@ def format_stack_db_object(stack):
 
 
 def format_resource_attributes(resource, with_attr=None):
+    with resource.stack.attribute_data_cache():
+        return _format_resource_attributes(resource, with_attr)
+
+
+def _format_resource_attributes(resource, with_attr=None):
     resolver = resource.attributes
     if not with_attr:
         with_attr = []
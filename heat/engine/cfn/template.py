@@ -96,8 +96,12 @@ class CfnTemplateBase(template_common.CommonTemplate):
         return self.t.get(section) or default
 
     def param_schemata(self, param_defaults=None):
-        params = self.t.get(self.PARAMETERS) or {}
         pdefaults = param_defaults or {}
+        params = self.t.get(self.PARAMETERS) or {}
+        if any(params[name].get(parameters.DEFAULT) != pdefaults[name]
+               for name in params if name in pdefaults):
+            self._unshare()
+            params = self.t.get(self.PARAMETERS)
         for name, schema in six.iteritems(params):
             if name in pdefaults:
                 params[name][parameters.DEFAULT] = pdefaults[name]
@@ -146,6 +150,7 @@ class CfnTemplateBase(template_common.CommonTemplate):
         return dict(defns())
 
     def add_resource(self, definition, name=None):
+        self._unshare()
         if name is None:
             name = definition.name
         hot_tmpl = definition.render_hot()
@@ -170,6 +175,7 @@ class CfnTemplateBase(template_common.CommonTemplate):
         self.t[self.RESOURCES][name] = cfn_tmpl
 
     def add_output(self, definition):
+        self._unshare()
         hot_op = definition.render_hot()
         cfn_op = dict((self.HOT_TO_CFN_OUTPUT_ATTRS[k], v)
                       for k, v in hot_op.items())
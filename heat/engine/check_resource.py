@@ -187,24 +187,24 @@ class CheckResource(object):
 
     def retrigger_check_resource(self, cnxt, is_update, resource_id, stack):
         current_traversal = stack.current_traversal
-        graph = stack.convergence_dependencies.graph()
+        deps = stack.convergence_dependencies
         key = (resource_id, is_update)
         if is_update:
             # When re-trigger received for update in latest traversal, first
             # check if update key is available in graph.
             # if No, then latest traversal is waiting for delete.
-            if (resource_id, is_update) not in graph:
+            if (resource_id, is_update) not in deps:
                 key = (resource_id, not is_update)
         else:
             # When re-trigger received for delete in latest traversal, first
             # check if update key is available in graph,
             # if yes, then latest traversal is waiting for update.
-            if (resource_id, True) in graph:
+            if (resource_id, True) in deps:
                 # not is_update evaluates to True below, which means update
                 key = (resource_id, not is_update)
         LOG.info('Re-trigger resource: (%(key1)s, %(key2)s)',
                  {'key1': key[0], 'key2': key[1]})
-        predecessors = set(graph[key])
+        predecessors = set(deps.requires(key)) if key in deps else set()
 
         try:
             propagate_check_resource(cnxt, self._rpc_client, resource_id,
@@ -218,10 +218,9 @@ class CheckResource(object):
                                      current_traversal, is_update, rsrc,
                                      stack):
         deps = stack.convergence_dependencies
-        graph = deps.graph()
         graph_key = parser.ConvergenceNode(resource_id, is_update)
 
-        if graph_key not in graph and rsrc.replaces is not None:
+        if graph_key not in deps and rsrc.replaces is not None:
             # If we are a replacement, impersonate the replaced resource for
             # the purposes of calculating whether subsequent resources are
             # ready, since everybody has to work from the same version of the
@@ -247,18 +246,30 @@ class CheckResource(object):
                             else resource_id)
             return None
 
+        # Nodes that become ready are collected by update/cleanup and sent
+        # together once all of the requirers have been synced.
+        ready = {False: [], True: []}
         try:
             input_forward_data = None
-            for req_node in sorted(deps.required_by(graph_key),
-                                   key=lambda n: n.is_update):
-                input_data = _get_input_data(req_node, input_forward_data)
-                if req_node.is_update:
-                    input_forward_data = input_data
-                propagate_check_resource(
-                    cnxt, self._rpc_client, req_node.rsrc_id,
-                    current_traversal, set(graph[req_node]),
-                    graph_key, input_data, req_node.is_update,
-                    stack.adopt_stack_data)
+            try:
+                for req_node in sorted(deps.required_by(graph_key),
+                                       key=lambda n: n.is_update):
+                    input_data = _get_input_data(req_node,
+                                                 input_forward_data)
+                    if req_node.is_update:
+                        input_forward_data = input_data
+                    propagate_check_resource(
+                        cnxt, self._rpc_client, req_node.rsrc_id,
+                        current_traversal, set(deps.requires(req_node)),
+                        graph_key, input_data, req_node.is_update,
+                        stack.adopt_stack_data, ready=ready)
+            finally:
+                for ready_is_update in (False, True):
+                    if ready[ready_is_update]:
+                        self._rpc_client.check_resources(
+                            cnxt, stack.id, ready[ready_is_update],
+                            current_traversal, ready_is_update,
+                            stack.adopt_stack_data)
             if is_update:
                 if input_forward_data is None:
                     # we haven't resolved attribute data for the resource,
@@ -363,9 +374,18 @@ def check_stack_complete(cnxt, stack, current_traversal, sender_id, deps,
 
 def propagate_check_resource(cnxt, rpc_client, next_res_id,
                              current_traversal, predecessors, sender_key,
-                             sender_data, is_update, adopt_stack_data):
-    """Trigger processing of node if all of its dependencies are satisfied."""
+                             sender_data, is_update, adopt_stack_data,
+                             ready=None):
+    """Trigger processing of node if all of its dependencies are satisfied.
+
+    If a ``ready`` dict is passed, the node is not triggered immediately but
+    appended, along with its input data, to the list stored in it under the
+    key ``is_update``, so that the caller can send several nodes at once.
+    """
     def do_check(entity_id, data):
+        if ready is not None:
+            ready[is_update].append((entity_id, data))
+            return
         rpc_client.check_resource(cnxt, entity_id, current_traversal,
                                   data, is_update, adopt_stack_data)
 
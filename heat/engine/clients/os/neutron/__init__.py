@@ -11,16 +11,92 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 from neutronclient.common import exceptions
 from neutronclient.neutron import v2_0 as neutronV20
 from neutronclient.v2_0 import client as nc
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
 
 from heat.common import exception
 from heat.common.i18n import _
+from heat.common import lru_cache
 from heat.engine.clients import client_plugin
 from heat.engine.clients import os as os_client
 
+LOG = logging.getLogger(__name__)
+
+
+class StatusPoller(object):
+    """Batch the polls for the status of many resources of one type.
+
+    Resources waiting for an action to complete poll for their status
+    repeatedly. The IDs polled are remembered, and when a result is needed
+    the data for all of the resources polled recently is fetched in a
+    single list call and kept for ``interval`` seconds, during which the
+    other resources' polls are answered from it.
+    """
+
+    # Number of IDs to pass in the query string of a single list call
+    batch_size = 50
+
+    def __init__(self, collection):
+        self.collection = collection
+        self._lock = threading.Lock()
+        self._polled = {}
+        self._results = {}
+
+    def _expire(self, now, interval):
+        # Forget resources that are no longer being polled
+        for res_id, polled_at in list(self._polled.items()):
+            if now - polled_at > interval * 10:
+                del self._polled[res_id]
+        for res_id, (fetched_at, data) in list(self._results.items()):
+            if now - fetched_at >= interval:
+                del self._results[res_id]
+
+    def _list(self, client, res_ids):
+        list_method = getattr(client, 'list_%s' % self.collection)
+        for start in range(0, len(res_ids), self.batch_size):
+            batch = res_ids[start:start + self.batch_size]
+            for data in list_method(id=batch)[self.collection]:
+                yield data['id'], data
+
+    def poll(self, client, res_id, interval, show):
+        """Return the data for a resource, fetching it with others.
+
+        If no other resources are being polled, ``show`` is called to fetch
+        the data for this resource alone, as it also is when it is missing
+        from the list result.
+        """
+        now = timeutils.now()
+        with self._lock:
+            self._expire(now, interval)
+            self._polled[res_id] = now
+            if res_id in self._results:
+                return self._results[res_id][1]
+
+            res_ids = sorted(self._polled)
+            if len(res_ids) > 1:
+                try:
+                    for polled_id, data in self._list(client, res_ids):
+                        self._results[polled_id] = (now, data)
+                except Exception as ex:
+                    LOG.warning('Failed to list %(collection)s: %(ex)s',
+                                {'collection': self.collection, 'ex': ex})
+                if res_id in self._results:
+                    return self._results[res_id][1]
+
+        return show()
+
+
+# per-process StatusPoller objects, keyed by project, region and collection
+_status_pollers = lru_cache.LRUCache(
+    1000, idle_timeout=lambda: cfg.CONF.status_poll_batch_interval * 10)
+
 
 class NeutronClientPlugin(client_plugin.ClientPlugin):
 
@@ -49,6 +125,36 @@ class NeutronClientPlugin(client_plugin.ClientPlugin):
 
         return nc.Client(**args)
 
+    # Collections whose members' status may be polled in batches
+    batch_poll_collections = {
+        'network': 'networks',
+        'port': 'ports',
+        'router': 'routers',
+        'trunk': 'trunks',
+    }
+
+    def poll_resource(self, entity, res_id, show):
+        """Return the data for a resource while waiting for a change.
+
+        Use this method in ``check_*_complete`` resource methods. When the
+        status_poll_batch_interval option is set, polls for many resources
+        of the same type are answered from a single list call, so the data
+        returned can be up to that many seconds old. Otherwise, and for types
+        of resource that cannot be listed by ID, ``show`` is called to fetch
+        the data.
+        """
+        interval = cfg.CONF.status_poll_batch_interval
+        collection = self.batch_poll_collections.get(entity)
+        if not interval or collection is None:
+            return show()
+
+        key = (self.context.tenant_id, self._get_region_name(), collection)
+        poller = _status_pollers.get(key)
+        if poller is None:
+            poller = StatusPoller(collection)
+            _status_pollers.set(key, poller)
+        return poller.poll(self.client(), res_id, interval, show)
+
     def is_not_found(self, ex):
         if isinstance(ex, (exceptions.NotFound,
                            exceptions.NetworkNotFoundClient,
@@ -12,6 +12,7 @@
 #    under the License.
 
 import collections
+import heapq
 import itertools
 
 import six
@@ -158,18 +159,31 @@ class Graph(collections.defaultdict):
     def toposort(graph):
         """Return a topologically sorted iterator over a dependency graph.
 
+        Where more than one node is ready at any point, the one that appears
+        first in the graph's iteration order is returned first. Each node and
+        edge is visited only once, rather than rescanning the whole graph for
+        every node returned.
+
         This is a destructive operation for the graph.
         """
-        for iteration in six.moves.xrange(len(graph)):
-            for key, node in six.iteritems(graph):
-                if not node:
-                    yield key
-                    del graph[key]
-                    break
-            else:
-                # There are nodes remaining, but none without
-                # dependencies: a cycle
-                raise CircularDependencyException(cycle=six.text_type(graph))
+        order = dict((key, i) for i, key in enumerate(graph))
+        ready = [(order.pop(key), key) for key, node in six.iteritems(graph)
+                 if not node]
+        heapq.heapify(ready)
+
+        while ready:
+            key = heapq.heappop(ready)[1]
+            requirers = list(graph[key].required_by())
+            yield key
+            del graph[key]
+            for rqr in requirers:
+                if rqr in order and not graph[rqr]:
+                    heapq.heappush(ready, (order.pop(rqr), rqr))
+
+        if graph:
+            # There are nodes remaining, but none without
+            # dependencies: a cycle
+            raise CircularDependencyException(cycle=six.text_type(graph))
 
 
 @repr_wrapper
@@ -200,6 +214,10 @@ class Dependencies(object):
 
         return self
 
+    def __contains__(self, key):
+        """Return True if the specified node is in the graph."""
+        return key in self._graph
+
     def required_by(self, last):
         """List the keys that require the specified node."""
         if last not in self._graph:
@@ -223,23 +241,26 @@ class Dependencies(object):
         if last not in self._graph:
             raise KeyError
 
-        def get_edges(key):
-            def requirer_edges(rqr):
-                # Concatenate the dependency on the current node with the
-                # recursive generated list
-                return itertools.chain([(rqr, key)], get_edges(rqr))
-
-            # Get the edge list for each node that requires the current node
-            edge_lists = six.moves.map(requirer_edges,
-                                       self._graph[key].required_by())
-            # Combine the lists into one long list
-            return itertools.chain.from_iterable(edge_lists)
-
         if self._graph[last].stem():
             # Nothing requires this, so just add the node itself
-            edges = [(last, None)]
-        else:
-            edges = get_edges(last)
+            return Dependencies([(last, None)])
+
+        # Walk the requirers depth-first, descending into each node only
+        # once. Visiting every path instead is exponential in the depth of
+        # graphs containing diamonds.
+        edges = []
+        visited = {last}
+        pending = [(last, self._graph[last].required_by())]
+        while pending:
+            key, requirers = pending[-1]
+            for rqr in requirers:
+                edges.append((rqr, key))
+                if rqr not in visited:
+                    visited.add(rqr)
+                    pending.append((rqr, self._graph[rqr].required_by()))
+                break
+            else:
+                pending.pop()
 
         return Dependencies(edges)
 
@@ -250,8 +271,8 @@ class Dependencies(object):
 
     def roots(self):
         """Return an iterator over all of the root nodes in the graph."""
-        return (requirer for requirer, required in self.graph(
-            reverse=True).items() if not required)
+        return (requirer for requirer, node in self._graph.items()
+                if node.stem())
 
     def translate(self, transform):
         """Translate all of the nodes using a transform function.
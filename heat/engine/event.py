@@ -11,9 +11,77 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
+import eventlet
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_utils import timeutils
+from oslo_utils import uuidutils
+
+from heat.common import context as common_context
 from heat.common import identifier
 from heat.objects import event as event_object
 
+LOG = logging.getLogger(__name__)
+
+
+class EventBuffer(object):
+    """Buffer of events waiting to be written to the database.
+
+    Events are written together in a single transaction once
+    event_batch_interval seconds have passed since the first of them was
+    buffered, once event_batch_size events are buffered, or when flush() is
+    called explicitly, whichever happens first.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending = []
+        self._timer = None
+
+    def add(self, values):
+        with self._lock:
+            self._pending.append(values)
+            full = len(self._pending) >= cfg.CONF.event_batch_size
+            if not full and self._timer is None:
+                self._timer = eventlet.spawn_after(
+                    cfg.CONF.event_batch_interval, self.flush)
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered events to the database."""
+        # Hold the write lock while taking the pending events, so that
+        # batches are written in the order they were buffered.
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                if self._timer is not None:
+                    # Has no effect if called from the timer itself
+                    self._timer.cancel()
+                    self._timer = None
+            if not pending:
+                return
+            try:
+                event_object.Event.create_all(
+                    common_context.get_admin_context(), pending)
+            except Exception:
+                LOG.exception('Failed to store %d events', len(pending))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+
+_buffer = EventBuffer()
+
+
+def flush():
+    """Write any events buffered by this engine to the database."""
+    _buffer.flush()
+
 
 class Event(object):
     """Class representing a Resource state change."""
@@ -44,7 +112,11 @@ class Event(object):
         self.id = id
 
     def store(self):
-        """Store the Event in the database."""
+        """Store the Event in the database.
+
+        If event_batch_interval is set, the event is buffered and written
+        later together with other events, and no database ID is assigned.
+        """
         ev = {
             'resource_name': self.resource_name,
             'physical_resource_id': self.physical_resource_id,
@@ -64,6 +136,16 @@ class Event(object):
         if self.rsrc_prop_data_id is not None:
             ev['rsrc_prop_data_id'] = self.rsrc_prop_data_id
 
+        if cfg.CONF.event_batch_interval:
+            # Generate the fields that the database would otherwise fill in,
+            # so that the event can be dispatched before it is written.
+            ev.setdefault('uuid', uuidutils.generate_uuid())
+            ev.setdefault('created_at', timeutils.utcnow())
+            _buffer.add(ev)
+            self.timestamp = ev['created_at']
+            self.uuid = ev['uuid']
+            return None
+
         new_ev = event_object.Event.create(self.context, ev)
 
         self.id = new_ev.id
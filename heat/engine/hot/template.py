@@ -206,8 +206,12 @@ class HOTemplate20130523(template_common.CommonTemplate):
         return cfn_to_hot_attrs.get(section, section)
 
     def param_schemata(self, param_defaults=None):
-        parameter_section = self.t.get(self.PARAMETERS) or {}
         pdefaults = param_defaults or {}
+        parameter_section = self.t.get(self.PARAMETERS) or {}
+        if any(parameter_section[name].get('default') != pdefaults[name]
+               for name in parameter_section if name in pdefaults):
+            self._unshare()
+            parameter_section = self.t.get(self.PARAMETERS)
         for name, schema in six.iteritems(parameter_section):
             if name in pdefaults:
                 parameter_section[name]['default'] = pdefaults[name]
@@ -261,6 +265,7 @@ class HOTemplate20130523(template_common.CommonTemplate):
         return dict(defns())
 
     def add_resource(self, definition, name=None):
+        self._unshare()
         if name is None:
             name = definition.name
 
@@ -276,6 +281,7 @@ class HOTemplate20130523(template_common.CommonTemplate):
         self.t[self.RESOURCES][name] = rendered
 
     def add_output(self, definition):
+        self._unshare()
         if self.t.get(self.OUTPUTS) is None:
             self.t[self.OUTPUTS] = {}
         self.t[self.OUTPUTS][definition.name] = definition.render_hot()
@@ -219,6 +219,7 @@ class Property(object):
         self.name = name
         self.context = context
         self.path = self.make_path(name, path)
+        self._children = {}
 
     def required(self):
         return self.schema.required
@@ -281,16 +282,28 @@ class Property(object):
                 raise ValueError(_('Value must be a string; got %r') % value)
         return value
 
+    def _child(self, key):
+        # The Property for each child depends only on the schema, so it is
+        # created once and then reused every time the value is read
+        try:
+            return self._children[key]
+        except KeyError:
+            child = Property(self.schema.schema[key], key, self.context,
+                             path=self.path)
+            self._children[key] = child
+            return child
+
     def _get_children(self, child_values, keys=None, validate=False,
                       translation=None):
         if self.schema.schema is not None:
             if keys is None:
                 keys = list(self.schema.schema)
-            schemata = dict((k, self.schema.schema[k]) for k in keys)
-            properties = Properties(schemata, dict(child_values),
-                                    context=self.context,
-                                    parent_name=self.path,
-                                    translation=translation)
+            properties = Properties.from_props(
+                dict((k, self._child(k)) for k in keys),
+                dict(child_values),
+                context=self.context,
+                parent_name=self.path,
+                translation=translation)
             if validate:
                 properties.validate()
 
@@ -388,6 +401,15 @@ class Properties(collections.Mapping):
         self.translation = (trans.Translation(properties=self)
                             if translation is None else translation)
 
+    @classmethod
+    def from_props(cls, props, data, resolver=lambda d: d, parent_name=None,
+                   context=None, section=None, translation=None):
+        """Return a Properties object for existing Property objects."""
+        properties = cls({}, data, resolver, parent_name, context, section,
+                         translation)
+        properties.props = props
+        return properties
+
     def update_translation(self, rules, client_resolve=True):
         self.translation.set_rules(rules, client_resolve=client_resolve)
 
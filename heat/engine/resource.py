@@ -335,7 +335,8 @@ class Resource(status.ResourceStatus):
         from heat.engine import stack as stack_mod
         db_res = resource_objects.Resource.get_obj(context, resource_id)
         curr_stack = stack_mod.Stack.load(context, stack_id=db_res.stack_id,
-                                          cache_data=data)
+                                          cache_data=data, use_cache=True,
+                                          eager_load=False)
 
         initial_stk_defn = latest_stk_defn = curr_stack.defn
         if (db_res.current_template_id != curr_stack.t.id and
@@ -757,18 +758,17 @@ class Resource(status.ResourceStatus):
         directly.
         """
         try:
-            reqd_by = self.stack.dependencies.required_by(self)
+            return self.stack.required_by(self)
         except KeyError:
             if self.stack.convergence:
                 # for convergence, fall back to building from needed_by
                 needed_by_ids = self.needed_by or set()
-                reqd_by = [r for r in self.stack.resources.values()
-                           if r.id in needed_by_ids]
+                return [r.name for r in self.stack.resources.values()
+                        if r.id in needed_by_ids]
             else:
                 LOG.error('Getting required_by list for Resource not in '
                           'dependency graph.')
                 return []
-        return [r.name for r in reqd_by]
 
     def client(self, name=None, version=None):
         client_name = name or self.default_client_name
@@ -1131,16 +1131,20 @@ class Resource(status.ResourceStatus):
                                           in_outputs=for_outputs,
                                           load_all=load_all)
 
-        # Ensure all attributes referenced in outputs get cached
-        if for_outputs is False and self.stack.convergence:
-            out_attrs = self.referenced_attrs(stk_defn, in_resources=False,
-                                              load_all=load_all)
-            for e in get_attrs(out_attrs - dep_attrs, cacheable_only=True):
-                pass
+        # Resolve all of the attributes from the same fetched data
+        with self.stack.attribute_data_cache():
+            # Ensure all attributes referenced in outputs get cached
+            if for_outputs is False and self.stack.convergence:
+                out_attrs = self.referenced_attrs(stk_defn,
+                                                  in_resources=False,
+                                                  load_all=load_all)
+                for e in get_attrs(out_attrs - dep_attrs,
+                                   cacheable_only=True):
+                    pass
 
-        # Calculate attribute values *before* reference ID, to potentially
-        # save an extra RPC call in TemplateResource
-        attribute_values = dict(get_attrs(dep_attrs))
+            # Calculate attribute values *before* reference ID, to
+            # potentially save an extra RPC call in TemplateResource
+            attribute_values = dict(get_attrs(dep_attrs))
 
         return node_data.NodeData(self.id, self.name, self.uuid,
                                   self.FnGetRefId(), attribute_values,
@@ -2173,13 +2177,21 @@ class Resource(status.ResourceStatus):
         :param attr: attribute name, which will be resolved
         :returns: method of resource class, which resolve base attribute
         """
+        return self.stack.cached_attribute_data(
+            self.name, ('attr', attr),
+            lambda: self._resolve_uncached_attribute(attr))
+
+    def _resolve_uncached_attribute(self, attr):
         if attr in self.base_attributes_schema:
             # check resource_id, because usually it is required for getting
             # information about resource
             if not self.resource_id:
                 return None
             try:
-                return getattr(self, '_{0}_resource'.format(attr))()
+                # Share the fetched data with plugin-specific attributes
+                return self.stack.cached_attribute_data(
+                    self.name, attr,
+                    getattr(self, '_{0}_resource'.format(attr)))
             except Exception as ex:
                 if self.default_client_name is not None:
                     self.client_plugin().ignore_not_found(ex)
@@ -198,7 +198,7 @@ class Net(neutron.NeutronResource):
             self.set_tags(tags)
 
     def check_create_complete(self, *args):
-        attributes = self._show_resource()
+        attributes = self._poll_resource()
         self._store_config_default_properties(attributes)
         return self.is_built(attributes)
 
@@ -136,10 +136,23 @@ class NeutronResource(resource.Resource):
         except AttributeError as ex:
             LOG.warning("Resolving 'show' attribute has failed : %s", ex)
 
+    def _poll_resource(self):
+        """Return the map of resource information for checking creation.
+
+        The information may have been fetched together with that of other
+        resources of the same type that are being created, so it must not
+        be used to check the progress of an update.
+        """
+        if self.res_info_key:
+            return self._show_resource()
+        return self.client_plugin().poll_resource(
+            self.entity, self.resource_id, self._show_resource)
+
     def _resolve_attribute(self, name):
         if self.resource_id is None:
             return
-        attributes = self._show_resource()
+        attributes = self.stack.cached_attribute_data(
+            self.name, self.SHOW, self._show_resource)
         return attributes[name]
 
     def needs_replace_failed(self):
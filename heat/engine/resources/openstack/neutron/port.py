@@ -504,7 +504,7 @@ class Port(neutron.NeutronResource):
             self.data_set(self.VNIC_TYPE, attrs[self.VNIC_TYPE])
 
     def check_create_complete(self, *args):
-        attributes = self._show_resource()
+        attributes = self._poll_resource()
         self._store_config_default_properties(attributes)
         return self.is_built(attributes)
 
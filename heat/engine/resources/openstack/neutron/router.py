@@ -315,7 +315,7 @@ class Router(neutron.NeutronResource):
             self.set_tags(tags)
 
     def check_create_complete(self, *args):
-        attributes = self._show_resource()
+        attributes = self._poll_resource()
         return self.is_built(attributes)
 
     def handle_delete(self):
@@ -210,7 +210,7 @@ class Trunk(neutron.NeutronResource):
         self.resource_id_set(trunk['id'])
 
     def check_create_complete(self, *args):
-        attributes = self._show_resource()
+        attributes = self._poll_resource()
         return self.is_built(attributes)
 
     def handle_delete(self):
@@ -1129,7 +1129,9 @@ class Server(server_base.BaseServer, sh.SchedulerHintsMixin,
         if name == self.NAME_ATTR:
             return self._server_name()
         try:
-            server = self.client().servers.get(self.resource_id)
+            server = self.stack.cached_attribute_data(
+                self.name, 'server',
+                lambda: self.client().servers.get(self.resource_id))
         except Exception as e:
             self.client_plugin().ignore_not_found(e)
             return ''
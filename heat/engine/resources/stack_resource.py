@@ -29,11 +29,11 @@ from heat.engine import environment
 from heat.engine import resource
 from heat.engine import scheduler
 from heat.engine import stack as parser
+from heat.engine import stack_lock
 from heat.engine import stk_defn
 from heat.engine import template
 from heat.objects import raw_template
 from heat.objects import stack as stack_object
-from heat.objects import stack_lock
 from heat.rpc import api as rpc_api
 
 LOG = logging.getLogger(__name__)
@@ -146,15 +146,18 @@ class StackResource(resource.Resource):
         """Return True if the resource has an existing nested stack."""
         return self.resource_id is not None or self._nested is not None
 
-    def nested(self):
+    def nested(self, use_cache=False):
         """Return a Stack object representing the nested (child) stack.
 
-        If we catch NotFound exception when loading, return None.
+        If we catch NotFound exception when loading, return None. If
+        use_cache is True, the nested stack may be built from data prefetched
+        in bulk by the parent stack's prefetch_nested_tree().
         """
         if self._nested is None and self.resource_id is not None:
             try:
                 self._nested = parser.Stack.load(self.context,
-                                                 self.resource_id)
+                                                 self.resource_id,
+                                                 use_cache=use_cache)
             except exception.NotFound:
                 return None
 
@@ -443,7 +446,7 @@ class StackResource(resource.Resource):
         if status == self.IN_PROGRESS:
             return False
         elif status == self.COMPLETE:
-            ret = stack_lock.StackLock.get_engine_id(
+            ret = stack_lock.get_backend().get_engine_id(
                 self.context, self.resource_id) is None
             if ret:
                 # Reset nested, to indicate we changed status
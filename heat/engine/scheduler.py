@@ -11,6 +11,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import heapq
 import sys
 import types
 
@@ -395,6 +396,11 @@ class DependencyTaskGroup(object):
         self._keys = list(dependencies)
         self._runners = dict((o, TaskRunner(task, o)) for o in self._keys)
         self._graph = dependencies.graph(reverse=reverse)
+        self._order = dict((k, i) for i, k in enumerate(self._keys))
+        self._ready_keys = [(i, k) for i, k in enumerate(self._keys)
+                            if not self._graph[k]]
+        self._running_keys = set()
+        self._first_pending = 0
         self.error_wait_time = error_wait_time
         self.aggregate_exceptions = aggregate_exceptions
 
@@ -415,12 +421,13 @@ class DependencyTaskGroup(object):
         thrown_exceptions = []
 
         try:
-            while any(six.itervalues(self._runners)):
+            while self._pending():
                 try:
                     for k, r in self._ready():
+                        self._running_keys.add(k)
                         r.start()
                         if not r:
-                            del self._graph[k]
+                            self._complete(k)
 
                     if self._graph:
                         try:
@@ -431,7 +438,7 @@ class DependencyTaskGroup(object):
 
                     for k, r in self._running():
                         if r.step():
-                            del self._graph[k]
+                            self._complete(k)
                 except Exception:
                     exc_info = None
                     try:
@@ -487,14 +494,42 @@ class DependencyTaskGroup(object):
             self._cancel_recursively(dependent_node, node_runner)
 
         del self._graph[key]
+        self._running_keys.discard(key)
+
+    def _pending(self):
+        """Return True if any subtask has steps remaining.
+
+        Subtasks never become incomplete again once they are done, so the
+        subtasks already known to be done are not checked again.
+        """
+        while self._first_pending < len(self._keys):
+            if self._runners[self._keys[self._first_pending]]:
+                return True
+            self._first_pending += 1
+        return False
+
+    def _complete(self, key):
+        """Remove a completed subtask from the graph.
+
+        Any subtasks that required only this one become ready to start.
+        """
+        requirers = list(self._graph[key].required_by())
+        del self._graph[key]
+        self._running_keys.discard(key)
+        for rqr in requirers:
+            if not self._graph.get(rqr, True):
+                heapq.heappush(self._ready_keys, (self._order[rqr], rqr))
 
     def _ready(self):
         """Iterate over all subtasks that are ready to start.
 
         Ready subtasks are subtasks whose dependencies have all been satisfied,
-        but which have not yet been started.
+        but which have not yet been started. They are returned in dependency
+        order, including any that become ready while the iteration is in
+        progress.
         """
-        for k in self._keys:
+        while self._ready_keys:
+            k = heapq.heappop(self._ready_keys)[1]
             if not self._graph.get(k, True):
                 runner = self._runners[k]
                 if runner and not runner.started():
@@ -506,8 +541,7 @@ class DependencyTaskGroup(object):
         Running subtasks are subtasks have been started but have not yet
         completed.
         """
-
-        def running(k_r):
-            return k_r[0] in self._graph and k_r[1].started()
-
-        return six.moves.filter(running, six.iteritems(self._runners))
+        for k in sorted(self._running_keys, key=self._order.get):
+            runner = self._runners[k]
+            if k in self._running_keys and runner.started():
+                yield k, runner
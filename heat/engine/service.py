@@ -12,6 +12,7 @@
 #    under the License.
 
 import collections
+import copy
 import datetime
 import functools
 import itertools
@@ -46,9 +47,11 @@ from heat.engine import attributes
 from heat.engine.cfn import template as cfntemplate
 from heat.engine import clients
 from heat.engine import environment
+from heat.engine import event
 from heat.engine.hot import functions as hot_functions
 from heat.engine import parameter_groups
 from heat.engine import properties
+from heat.engine import resource
 from heat.engine import resources
 from heat.engine import service_software_config
 from heat.engine import stack as parser
@@ -306,7 +309,7 @@ class EngineService(service.ServiceBase):
     by the RPC caller.
     """
 
-    RPC_API_VERSION = '1.35'
+    RPC_API_VERSION = '1.36'
 
     def __init__(self, host, topic):
         resources.initialise()
@@ -369,6 +372,9 @@ class EngineService(service.ServiceBase):
             self.manage_thread_grp = threadgroup.ThreadGroup()
         self.manage_thread_grp.add_timer(cfg.CONF.periodic_interval,
                                          self.service_manage_report)
+        if cfg.CONF.event_purge_interval:
+            self.manage_thread_grp.add_timer(cfg.CONF.event_purge_interval,
+                                             self.purge_events)
         self.manage_thread_grp.add_thread(self.reset_stack_status)
 
     def _configure_db_conn_pool_size(self):
@@ -415,6 +421,8 @@ class EngineService(service.ServiceBase):
                 # Stop threads gracefully
                 self.thread_group_mgr.stop(stack_id, True)
                 LOG.info("Stack %s processing was finished", stack_id)
+        event.flush()
+        self.software_config.flush_metadata_pushes()
         if self.manage_thread_grp:
             self.manage_thread_grp.stop()
             ctxt = context.get_admin_context()
@@ -493,6 +501,10 @@ class EngineService(service.ServiceBase):
             stacks = parser.Stack.load_all(cnxt)
 
         def show(stack):
+            with stack.attribute_data_cache():
+                return format_stack(stack)
+
+        def format_stack(stack):
             if resolve_outputs:
                 for res in stack._explicit_dependencies():
                     ensure_cache = stack.convergence and res.id is not None
@@ -855,7 +867,7 @@ class EngineService(service.ServiceBase):
                     # Use the stored previous template
                     prev_t = templatem.Template.load(
                         cnxt, current_stack.prev_raw_template_id)
-                    new_template = prev_t.t
+                    new_template = copy.deepcopy(prev_t.t)
                 else:
                     # Nothing we can do, the failed update happened before
                     # we started storing prev_raw_template_id
@@ -1151,7 +1163,7 @@ class EngineService(service.ServiceBase):
             self.thread_group_mgr.send(current_stack.id, cancel_message)
 
         # Another active engine has the lock
-        elif service_utils.engine_alive(cnxt, engine_id):
+        elif lock.engine_alive(engine_id):
             cancel_result = self._remote_call(
                 cnxt, engine_id, cfg.CONF.engine_life_check_timeout,
                 self.listener.SEND,
@@ -1295,7 +1307,7 @@ class EngineService(service.ServiceBase):
         :return: list of stack outputs in defined format.
         """
         s = self._get_stack(cntx, stack_identity)
-        stack = parser.Stack.load(cntx, stack=s)
+        stack = parser.Stack.load(cntx, stack=s, lazy_resources=True)
 
         return api.format_stack_outputs(stack.outputs, resolve_value=False)
 
@@ -1309,7 +1321,7 @@ class EngineService(service.ServiceBase):
         :return: dict with output key, value and description in defined format.
         """
         s = self._get_stack(cntx, stack_identity)
-        stack = parser.Stack.load(cntx, stack=s)
+        stack = parser.Stack.load(cntx, stack=s, lazy_resources=True)
 
         outputs = stack.outputs
 
@@ -1317,9 +1329,10 @@ class EngineService(service.ServiceBase):
             raise exception.NotFound(_('Specified output key %s not '
                                        'found.') % output_key)
 
-        stack._update_all_resource_data(for_resources=False,
-                                        for_outputs={output_key})
-        return api.format_stack_output(outputs[output_key])
+        with stack.attribute_data_cache():
+            stack._update_all_resource_data(for_resources=False,
+                                            for_outputs={output_key})
+            return api.format_stack_output(outputs[output_key])
 
     def _remote_call(self, cnxt, lock_engine_id, timeout, call, **kwargs):
         self.cctxt = self._client.prepare(
@@ -1378,7 +1391,7 @@ class EngineService(service.ServiceBase):
             self.thread_group_mgr.send(stack.id, rpc_api.THREAD_CANCEL)
 
         # Another active engine has the lock
-        elif service_utils.engine_alive(cnxt, acquire_result):
+        elif lock.engine_alive(acquire_result):
             cancel_result = self._remote_call(
                 cnxt, acquire_result, cfg.CONF.engine_life_check_timeout,
                 self.listener.SEND,
@@ -1419,7 +1432,7 @@ class EngineService(service.ServiceBase):
             if acquire_result == self.engine_id:
                 # cancel didn't finish in time, attempt a stop instead
                 self.thread_group_mgr.stop(stack.id)
-            elif service_utils.engine_alive(cnxt, acquire_result):
+            elif lock.engine_alive(acquire_result):
                 # Another active engine has the lock
                 stop_result = self._remote_call(
                     cnxt, acquire_result, STOP_STACK_TIMEOUT,
@@ -1760,7 +1773,7 @@ class EngineService(service.ServiceBase):
     def describe_stack_resource(self, cnxt, stack_identity, resource_name,
                                 with_attr=None):
         s = self._get_stack(cnxt, stack_identity)
-        stack = parser.Stack.load(cnxt, stack=s)
+        stack = parser.Stack.load(cnxt, stack=s, lazy_resources=True)
 
         if cfg.CONF.heat_stack_user_role in cnxt.roles:
             if not self._authorize_stack_user(cnxt, stack, resource_name):
@@ -1774,6 +1787,29 @@ class EngineService(service.ServiceBase):
 
         return api.format_stack_resource(resource, with_attr=with_attr)
 
+    @context.request_context
+    def describe_stack_resource_metadata(self, cnxt, stack_identity,
+                                         resource_name):
+        """Get the metadata of a resource.
+
+        This is polled frequently by the agents running on servers, so where
+        possible the metadata is read directly from the resource's database
+        record, without loading the stack. The stack is still loaded for
+        in-instance users, whose access must be checked, and whenever the
+        resource does not have exactly one record that holds its metadata.
+        """
+        if cfg.CONF.heat_stack_user_role not in cnxt.roles:
+            s = self._get_stack(cnxt, stack_identity)
+            rs = resource_objects.Resource.get_all_by_name_and_stack(
+                cnxt, resource_name, s.id)
+            if len(rs) == 1 and rs[0].action not in (
+                    resource.Resource.INIT, resource.Resource.DELETE):
+                return rs[0].rsrc_metadata
+
+        res = self.describe_stack_resource(cnxt, stack_identity,
+                                           resource_name)
+        return res[rpc_api.RES_METADATA]
+
     @context.request_context
     def resource_signal(self, cnxt, stack_identity, resource_name, details,
                         sync_call=False):
@@ -1954,9 +1990,9 @@ class EngineService(service.ServiceBase):
             res_type = filters.pop('type', None)
 
         if depth > 0:
-            # populate context with resources from all nested depths
-            resource_objects.Resource.get_all_by_root_stack(
-                cnxt, stack.id, filters, cache=True)
+            # populate context with stacks and resources from all nested
+            # depths
+            stack.prefetch_nested_tree()
 
         def filter_type(res_iter):
             for res in res_iter:
@@ -2263,6 +2299,16 @@ class EngineService(service.ServiceBase):
                       'failed: %(error)s',
                       {'service_id': self.service_id, 'error': ex})
 
+    def purge_events(self):
+        cnxt = context.get_admin_context()
+        try:
+            deleted = event_object.Event.purge_all(cnxt)
+        except Exception as ex:
+            LOG.error('Failed to purge events: %s', ex)
+        else:
+            if deleted:
+                LOG.debug('Purged %d events', deleted)
+
     def service_manage_cleanup(self):
         cnxt = context.get_admin_context()
         last_updated_window = (3 * cfg.CONF.periodic_interval)
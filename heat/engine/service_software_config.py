@@ -11,8 +11,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
 import uuid
 
+import eventlet
+from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
 from oslo_utils import timeutils
@@ -23,6 +26,7 @@ from six.moves.urllib import parse as urlparse
 from heat.common import crypt
 from heat.common import exception
 from heat.common.i18n import _
+from heat.common import lru_cache
 from heat.db.sqlalchemy import api as db_api
 from heat.engine import api
 from heat.engine import resource
@@ -35,9 +39,86 @@ from heat.rpc import api as rpc_api
 
 LOG = logging.getLogger(__name__)
 
+# Deployment metadata by server, stored along with the version of the server
+# resource that it was read at. Every change to a server's deployments is
+# followed, possibly after deployment_metadata_push_interval, by a call to
+# _push_metadata_software_deployments(), which updates the server resource
+# and so changes its atomic_key.
+_deployments_metadata = lru_cache.LRUCache(
+    lambda: cfg.CONF.deployment_metadata_cache_size)
+
+
+class MetadataPushScheduler(object):
+    """Coalesce the deployment metadata pushes requested for each server.
+
+    A push always sends the complete list of a server's deployments, so
+    once a push has been requested for a server, it is delayed for
+    deployment_metadata_push_interval seconds and any further pushes
+    requested for that server in the meantime are merged into it.
+    """
+
+    def __init__(self, push):
+        self._push = push
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.requested = 0
+        self.pushed = 0
+
+    def schedule(self, cnxt, server_id, stack_user_project_id):
+        with self._lock:
+            self.requested += 1
+            if server_id in self._pending:
+                timer = self._pending[server_id][0]
+            else:
+                timer = eventlet.spawn_after(
+                    cfg.CONF.deployment_metadata_push_interval,
+                    self._run, server_id)
+            self._pending[server_id] = (timer, cnxt, stack_user_project_id)
+
+    def _run(self, server_id):
+        with self._lock:
+            timer, cnxt, stack_user_project_id = self._pending.pop(server_id)
+            self.pushed += 1
+        self._do_push(cnxt, server_id, stack_user_project_id)
+
+    def _do_push(self, cnxt, server_id, stack_user_project_id):
+        try:
+            self._push(cnxt, server_id, stack_user_project_id)
+        except Exception:
+            LOG.exception('Failed to push deployment metadata for '
+                          'server %s', server_id)
+        LOG.debug('Pushed deployment metadata for server %(server)s, '
+                  '%(saved)d pushes saved so far',
+                  {'server': server_id, 'saved': self.stats()['saved']})
+
+    def flush(self):
+        """Carry out all of the pending pushes immediately."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self.pushed += len(pending)
+        for server_id, (timer, cnxt, project_id) in six.iteritems(pending):
+            timer.cancel()
+            self._do_push(cnxt, server_id, project_id)
+
+    def stats(self):
+        """Return a dict of counts of the pushes requested and carried out."""
+        with self._lock:
+            return {'requested': self.requested,
+                    'pushed': self.pushed,
+                    'pending': len(self._pending),
+                    'saved': self.requested - self.pushed - len(self._pending)}
+
 
 class SoftwareConfigService(object):
 
+    def __init__(self):
+        self.metadata_pushes = MetadataPushScheduler(
+            self._push_metadata_software_deployments)
+
+    def flush_metadata_pushes(self):
+        """Push any deployment metadata changes that are being delayed."""
+        self.metadata_pushes.flush()
+
     def show_software_config(self, cnxt, config_id):
         sc = software_config_object.SoftwareConfig.get_by_id(cnxt, config_id)
         return api.format_software_config(sc)
@@ -84,6 +165,23 @@ class SoftwareConfigService(object):
     def metadata_software_deployments(self, cnxt, server_id):
         if not server_id:
             raise ValueError(_('server_id must be specified'))
+        rs = db_api.resource_get_by_physical_resource_id(cnxt, server_id)
+        if rs is None:
+            return self._metadata_software_deployments(cnxt, server_id)
+
+        # What a context can see depends on its project
+        key = (server_id, cnxt.tenant_id, cnxt.is_admin)
+        version = (rs.id, rs.atomic_key)
+        cached = _deployments_metadata.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        # The version must be read before the deployments, so that an entry
+        # can never be newer than the version it is stored with
+        result = self._metadata_software_deployments(cnxt, server_id)
+        _deployments_metadata.set(key, (version, result))
+        return result
+
+    def _metadata_software_deployments(self, cnxt, server_id):
         all_sd = software_deployment_object.SoftwareDeployment.get_all(
             cnxt, server_id)
 
@@ -96,6 +194,14 @@ class SoftwareConfigService(object):
         result = [api.format_software_config(sd.config) for sd in flt_sd_s]
         return result
 
+    def _request_metadata_push(self, cnxt, server_id, stack_user_project_id):
+        if cfg.CONF.deployment_metadata_push_interval > 0:
+            self.metadata_pushes.schedule(cnxt, server_id,
+                                          stack_user_project_id)
+        else:
+            self._push_metadata_software_deployments(
+                cnxt, server_id, stack_user_project_id)
+
     @resource_objects.retry_on_conflict
     def _push_metadata_software_deployments(
             self, cnxt, server_id, stack_user_project_id):
@@ -286,8 +392,7 @@ class SoftwareConfigService(object):
             'action': action,
             'status': status,
             'status_reason': six.text_type(status_reason)})
-        self._push_metadata_software_deployments(
-            cnxt, server_id, stack_user_project_id)
+        self._request_metadata_push(cnxt, server_id, stack_user_project_id)
         return api.format_software_deployment(sd)
 
     def signal_software_deployment(self, cnxt, deployment_id, details,
@@ -379,8 +484,8 @@ class SoftwareConfigService(object):
         # only push metadata if this update resulted in the config_id
         # changing, since metadata is just a list of configs
         if config_id:
-            self._push_metadata_software_deployments(
-                cnxt, sd.server_id, sd.stack_user_project_id)
+            self._request_metadata_push(cnxt, sd.server_id,
+                                        sd.stack_user_project_id)
 
         return api.format_software_deployment(sd)
 
@@ -389,5 +494,5 @@ class SoftwareConfigService(object):
             cnxt, deployment_id)
         software_deployment_object.SoftwareDeployment.delete(
             cnxt, deployment_id)
-        self._push_metadata_software_deployments(
-            cnxt, sd.server_id, sd.stack_user_project_id)
+        self._request_metadata_push(cnxt, sd.server_id,
+                                    sd.stack_user_project_id)
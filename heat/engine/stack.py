@@ -12,11 +12,14 @@
 #    under the License.
 
 import collections
+import contextlib
 import copy
 import eventlet
 import functools
+import itertools
 import re
 import warnings
+import weakref
 
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -42,6 +45,7 @@ from heat.engine import parent_rsrc
 from heat.engine import resource
 from heat.engine import resources
 from heat.engine import scheduler
+from heat.engine import stack_lock
 from heat.engine import stk_defn
 from heat.engine import sync_point
 from heat.engine import template as tmpl
@@ -72,6 +76,45 @@ class ForcedCancel(Exception):
         return "Operation cancelled"
 
 
+class _LazyResourceMap(collections.MutableMapping):
+    """A mapping of resource names to the Resource objects of a stack.
+
+    The names are taken from the stack definition up front, but each Resource
+    object is only created the first time it is retrieved.
+    """
+
+    def __init__(self, stack):
+        self._stackref = weakref.ref(stack)
+        self._defn = stack.defn
+        self._names = stack.defn.enabled_rsrc_names()
+        self._resources = {}
+
+    def __getitem__(self, name):
+        if name not in self._resources:
+            if name not in self._names:
+                raise KeyError(name)
+            self._resources[name] = resource.Resource(
+                name, self._defn.resource_definition(name), self._stackref())
+        return self._resources[name]
+
+    def __setitem__(self, name, rsrc):
+        self._names.add(name)
+        self._resources[name] = rsrc
+
+    def __delitem__(self, name):
+        self._names.remove(name)
+        self._resources.pop(name, None)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._names
+
+
 def reset_state_on_error(func):
     @six.wraps(func)
     def handle_exceptions(stack, *args, **kwargs):
@@ -126,7 +169,7 @@ class Stack(collections.Mapping):
                  nested_depth=0, strict_validate=True, convergence=False,
                  current_traversal=None, tags=None, prev_raw_template_id=None,
                  current_deps=None, cache_data=None,
-                 deleted_time=None, converge=False):
+                 deleted_time=None, converge=False, lazy_resources=False):
 
         """Initialise the Stack.
 
@@ -137,6 +180,10 @@ class Stack(collections.Mapping):
         Creating a stack with cache_data creates a lightweight stack which
         will not load any resources from the database and resolve the
         functions from the cache_data specified.
+
+        Creating a stack with lazy_resources creates each of its Resource
+        objects only when it is first accessed, rather than all of them
+        together. This is intended for stacks that are only read from.
         """
 
         def _validate_stack_name(name):
@@ -166,6 +213,7 @@ class Stack(collections.Mapping):
         self.disable_rollback = disable_rollback
         self._outputs = None
         self._resources = None
+        self._lazy_resources = lazy_resources
         self._dependencies = None
         self._implicit_deps_loaded = False
         self._access_allowed_handlers = {}
@@ -185,6 +233,7 @@ class Stack(collections.Mapping):
         self.current_deps = current_deps
         self._worker_client = None
         self._convg_deps = None
+        self._attribute_data = None
         self.thread_group_mgr = None
         self.converge = converge
 
@@ -302,9 +351,49 @@ class Stack(collections.Mapping):
         return {n: self.defn.output_definition(n)
                 for n in self.defn.enabled_output_names()}
 
+    @contextlib.contextmanager
+    def attribute_data_cache(self):
+        """Share the data fetched to resolve attributes within a block.
+
+        While the context is active, each attribute of a resource in this
+        stack is resolved at most once, and data that a resource fetches from
+        a remote API in order to resolve one attribute is reused to resolve
+        its other attributes. This is intended for building a single API
+        response, where the same attributes may be referenced by several
+        outputs. Nested uses of the context share the outermost cache.
+        """
+        if self._attribute_data is not None:
+            yield
+            return
+
+        self._attribute_data = {}
+        try:
+            yield
+        finally:
+            self._attribute_data = None
+
+    def cached_attribute_data(self, resource_name, key, fetch):
+        """Return data for resolving a resource's attributes.
+
+        If an attribute data cache is active, the result of calling ``fetch``
+        is stored under the given resource name and key, and returned again
+        on subsequent calls; otherwise ``fetch`` is simply called.
+        """
+        if self._attribute_data is None:
+            return fetch()
+
+        cache_key = (resource_name, key)
+        try:
+            return self._attribute_data[cache_key]
+        except KeyError:
+            data = self._attribute_data[cache_key] = fetch()
+            return data
+
     @property
     def resources(self):
-        if self._resources is None:
+        if self._resources is None and self._lazy_resources:
+            self._resources = _LazyResourceMap(self)
+        elif self._resources is None:
             self._resources = {
                 name: resource.Resource(name,
                                         self.defn.resource_definition(name),
@@ -315,7 +404,13 @@ class Stack(collections.Mapping):
         return self._resources
 
     def _update_all_resource_data(self, for_resources, for_outputs):
-        for rsrc in self._explicit_dependencies():
+        if (self._lazy_resources and not for_resources and
+                not isinstance(for_outputs, bool)):
+            deps = self._output_dependencies(for_outputs)
+        else:
+            deps = self._explicit_dependencies()
+
+        for rsrc in deps:
             node_data = rsrc.node_data(for_resources=for_resources,
                                        for_outputs=for_outputs)
             stk_defn.update_resource_data(self.defn, rsrc.name, node_data)
@@ -348,13 +443,35 @@ class Stack(collections.Mapping):
             if not res.has_nested() or nested_depth == 0:
                 continue
 
-            nested_stack = res.nested()
+            nested_stack = res.nested(use_cache=True)
             if nested_stack is None:
                 continue
             for nested_res in nested_stack.iter_resources(nested_depth - 1,
                                                           filters):
                 yield nested_res
 
+    def prefetch_nested_tree(self):
+        """Load the whole tree of stacks below this one in bulk.
+
+        Every stack (along with its raw template) and every resource under
+        this stack is retrieved in a fixed number of queries and stored in the
+        context's object caches, so that subsequently loading the nested
+        stacks through iter_resources() builds them in memory instead of
+        issuing further queries for each one. Any resource filters are then
+        applied to the cached resources in memory.
+
+        This is only intended for read-only API paths, since the cached data
+        is not updated by any changes made later in the same context.
+        """
+        if self.id is None:
+            return
+        nested = stack_object.Stack.get_all_by_root_owner_id(
+            self.context, self.id, eager_load=True, cache=True)
+        stack_ids = [self.id] + [s.id for s in nested]
+        resource_objects.Resource.get_all_by_root_stack(
+            self.context, self.root_stack_id(), None, cache=True,
+            stack_ids=stack_ids)
+
     def db_active_resources_get(self):
         resources = resource_objects.Resource.get_all_active_by_stack(
             self.context, self.id)
@@ -508,6 +625,66 @@ class Stack(collections.Mapping):
             self._dependencies = deps
         return self._dependencies
 
+    def _output_dependencies(self, output_names):
+        """Return explicit dependencies of the resources the outputs need.
+
+        Only the resources referenced by the given outputs, and those that they
+        in turn depend on, are included (and so loaded).
+        """
+        if self._dependencies is not None:
+            return self._dependencies
+
+        deps = dependencies.Dependencies()
+        pending = set(itertools.chain.from_iterable(
+            self.defn.output_definition(n).required_resource_names()
+            for n in output_names))
+        done = set()
+        while pending:
+            name = pending.pop()
+            done.add(name)
+            if name not in self.resources:
+                continue
+            rsrc = self.resources[name]
+            rsrc.add_explicit_dependencies(deps)
+            pending |= rsrc.t.required_resource_names() - done
+        return deps
+
+    def required_by(self, rsrc):
+        """Return the names of the resources that directly require rsrc.
+
+        For stacks with lazily-loaded resources, this is worked out from the
+        resource definitions when no resource type in the stack adds implicit
+        dependencies, to avoid loading every resource to build the full
+        dependency graph.
+
+        Raises KeyError if the resource is not in the dependency graph.
+        """
+        if (self._lazy_resources and not self._implicit_deps_loaded and
+                self.resources.get(rsrc.name) is rsrc and
+                not self._has_implicit_dependencies()):
+            if not getattr(rsrc, 'strict_dependency', True):
+                return []
+            defn = self.defn
+            return [name for name in self.resources
+                    if rsrc.name in
+                    defn.resource_definition(name).required_resource_names()]
+
+        return [r.name for r in self.dependencies.required_by(rsrc)]
+
+    def _has_implicit_dependencies(self):
+        """Return whether any resource type may add implicit dependencies."""
+        base_add_dependencies = resource.Resource.add_dependencies
+        for name in self.resources:
+            try:
+                res_class = self.env.get_class_to_instantiate(
+                    self.defn.resource_definition(name).resource_type,
+                    resource_name=name)
+            except exception.StackValidationFailed:
+                return True
+            if res_class.add_dependencies != base_add_dependencies:
+                return True
+        return False
+
     def _add_implicit_dependencies(self, deps, ignore_errors=True):
         """Augment the given dependencies with implicit ones from plugins."""
         for res in six.itervalues(self.resources):
@@ -525,13 +702,28 @@ class Stack(collections.Mapping):
     @classmethod
     def load(cls, context, stack_id=None, stack=None, show_deleted=True,
              use_stored_context=False, force_reload=False, cache_data=None,
-             load_template=True):
-        """Retrieve a Stack from the database."""
+             load_template=True, use_cache=False, eager_load=True,
+             lazy_resources=False):
+        """Retrieve a Stack from the database.
+
+        If use_cache is True, the stack may be built from data previously
+        fetched in bulk in the same context, e.g. by prefetch_nested_tree().
+
+        If eager_load is False, the template is not fetched together with the
+        stack but loaded separately, which allows it to be served from the
+        per-process cache of loaded templates.
+
+        If lazy_resources is True, each resource is only loaded when it is
+        first accessed. This should only be used for stacks that will not be
+        modified.
+        """
         if stack is None:
             stack = stack_object.Stack.get_by_id(
                 context,
                 stack_id,
-                show_deleted=show_deleted)
+                show_deleted=show_deleted,
+                use_cache=use_cache,
+                eager_load=eager_load)
         if stack is None:
             message = _('No stack exists with id "%s"') % str(stack_id)
             raise exception.NotFound(message)
@@ -542,7 +734,8 @@ class Stack(collections.Mapping):
         return cls._from_db(context, stack,
                             use_stored_context=use_stored_context,
                             cache_data=cache_data,
-                            load_template=load_template)
+                            load_template=load_template,
+                            lazy_resources=lazy_resources)
 
     @classmethod
     def load_all(cls, context, limit=None, marker=None, sort_keys=None,
@@ -576,7 +769,7 @@ class Stack(collections.Mapping):
     @classmethod
     def _from_db(cls, context, stack,
                  use_stored_context=False, cache_data=None,
-                 load_template=True):
+                 load_template=True, lazy_resources=False):
         if load_template:
             template = tmpl.Template.load(
                 context, stack.raw_template_id, stack.raw_template)
@@ -600,7 +793,8 @@ class Stack(collections.Mapping):
                    prev_raw_template_id=stack.prev_raw_template_id,
                    current_deps=stack.current_deps, cache_data=cache_data,
                    nested_depth=stack.nested_depth,
-                   deleted_time=stack.deleted_at)
+                   deleted_time=stack.deleted_at,
+                   lazy_resources=lazy_resources)
 
     def get_kwargs_for_cloning(self, keep_status=False, only_db=False,
                                keep_tags=False):
@@ -814,7 +1008,7 @@ class Stack(collections.Mapping):
 
     def access_allowed(self, credential_id, resource_name):
         """Is credential_id authorised to access resource by resource_name."""
-        if not self.resources:
+        if not list(six.itervalues(self.resources)):
             # this also triggers lazy-loading of resources
             # so is required for register_access_allowed_handler
             # to be called
@@ -934,6 +1128,9 @@ class Stack(collections.Mapping):
                          self.name, 'OS::Heat::Stack')
 
         ev.store()
+        if status != self.IN_PROGRESS:
+            # Make sure every event of the action is visible once it is done
+            event.flush()
         self.dispatch_event(ev)
 
     def dispatch_event(self, ev):
@@ -1032,8 +1229,8 @@ class Stack(collections.Mapping):
                       'status': self.status,
                       'status_reason': six.text_type(self.status_reason)}
             self._send_notification_and_add_event()
-            stack.persist_state_and_release_lock(self.context, self.id,
-                                                 engine_id, values)
+            stack_lock.get_backend().persist_state_and_release_lock(
+                self.context, self.id, engine_id, values)
 
     @property
     def state(self):
@@ -1380,19 +1577,26 @@ class Stack(collections.Mapping):
         if not leaves:
             self.mark_complete()
         else:
-            for rsrc_id, is_update in sorted(leaves,
-                                             key=lambda n: n.is_update):
-                if is_update:
-                    LOG.info("Triggering resource %s for update", rsrc_id)
-                else:
-                    LOG.info("Triggering resource %s for cleanup",
-                             rsrc_id)
-                input_data = sync_point.serialize_input_data({})
-                self.worker_client.check_resource(self.context, rsrc_id,
-                                                  self.current_traversal,
-                                                  input_data, is_update,
-                                                  self.adopt_stack_data,
-                                                  self.converge)
+            input_data = sync_point.serialize_input_data({})
+            for is_update in (False, True):
+                ready = []
+                for rsrc_id, node_is_update in sorted(leaves):
+                    if node_is_update != is_update:
+                        continue
+                    if is_update:
+                        LOG.info("Triggering resource %s for update", rsrc_id)
+                    else:
+                        LOG.info("Triggering resource %s for cleanup",
+                                 rsrc_id)
+                    ready.append((rsrc_id, input_data))
+                if not ready:
+                    continue
+                self.worker_client.check_resources(self.context, self.id,
+                                                   ready,
+                                                   self.current_traversal,
+                                                   is_update,
+                                                   self.adopt_stack_data,
+                                                   self.converge)
                 if scheduler.ENABLE_SLEEP:
                     eventlet.sleep(1)
 
@@ -1640,11 +1844,13 @@ class Stack(collections.Mapping):
                 existing_params.load(newstack.t.env.user_env_as_dict())
                 self.t.env = existing_params
                 # Update the template version, in case new things were used
+                self.t._unshare()
                 self.t.t[newstack.t.version[0]] = max(
                     newstack.t.version[1], self.t.version[1])
                 self.t.merge_snippets(newstack.t)
                 self.t.store(self.context)
                 backup_stack.t.env = existing_params
+                backup_stack.t._unshare()
                 backup_stack.t.t[newstack.t.version[0]] = max(
                     newstack.t.version[1], self.t.version[1])
                 backup_stack.t.merge_snippets(newstack.t)
@@ -13,11 +13,14 @@
 
 import contextlib
 
+from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import excutils
+from oslo_utils import timeutils
 
 from heat.common import exception
 from heat.common import service_utils
+from heat.objects import service as service_objects
 from heat.objects import stack as stack_object
 from heat.objects import stack_lock as stack_lock_object
 
@@ -25,29 +28,139 @@ from heat.objects import stack_lock as stack_lock_object
 LOG = logging.getLogger(__name__)
 
 
+class DatabaseLockBackend(object):
+    """Stack locks stored in the database and shared by all engines.
+
+    A lock backend provides the operations below. Each of create(), steal()
+    and release() returns None if it succeeded; otherwise create() returns
+    the ID of the engine holding the lock, and steal() and release() return
+    True if the lock was no longer held or, for steal(), the ID of the
+    engine that took the lock first.
+    """
+
+    def create(self, context, stack_id, engine_id):
+        return stack_lock_object.StackLock.create(context, stack_id,
+                                                  engine_id)
+
+    def get_engine_id(self, context, stack_id):
+        return stack_lock_object.StackLock.get_engine_id(context, stack_id)
+
+    def steal(self, context, stack_id, old_engine_id, new_engine_id):
+        return stack_lock_object.StackLock.steal(context, stack_id,
+                                                 old_engine_id,
+                                                 new_engine_id)
+
+    def release(self, context, stack_id, engine_id):
+        return stack_lock_object.StackLock.release(context, stack_id,
+                                                   engine_id)
+
+    def persist_state_and_release_lock(self, context, stack_id, engine_id,
+                                       values):
+        return stack_object.Stack.persist_state_and_release_lock(
+            context, stack_id, engine_id, values)
+
+    def engine_alive(self, context, engine_id):
+        """Return whether the engine holding a lock is still alive.
+
+        If stack_lock_lease_time is set, the engine is alive as long as its
+        lease, which it renews by reporting its service status, has not
+        expired. Otherwise (or if the engine has never reported its status)
+        it is asked over RPC.
+        """
+        lease_time = cfg.CONF.stack_lock_lease_time
+        if lease_time:
+            service = service_objects.Service.get_by_engine_id(context,
+                                                               engine_id)
+            if service is not None:
+                if service.deleted_at is not None:
+                    return False
+                renewed_at = service.updated_at or service.created_at
+                age = timeutils.utcnow() - renewed_at
+                return age.total_seconds() <= lease_time
+        return service_utils.engine_alive(context, engine_id)
+
+
+class MemoryLockBackend(object):
+    """Stack locks held in memory by the only engine process.
+
+    Since all of the locks disappear with the process that holds them, a
+    lock can never be left behind by an engine that is no longer running.
+    """
+
+    def __init__(self):
+        self._locks = {}
+
+    def create(self, context, stack_id, engine_id):
+        if stack_id in self._locks:
+            return self._locks[stack_id]
+        self._locks[stack_id] = engine_id
+
+    def get_engine_id(self, context, stack_id):
+        return self._locks.get(stack_id)
+
+    def steal(self, context, stack_id, old_engine_id, new_engine_id):
+        lock_engine_id = self._locks.get(stack_id)
+        if lock_engine_id != old_engine_id:
+            return lock_engine_id if lock_engine_id is not None else True
+        self._locks[stack_id] = new_engine_id
+
+    def release(self, context, stack_id, engine_id):
+        if self._locks.get(stack_id) != engine_id:
+            return True
+        del self._locks[stack_id]
+
+    def persist_state_and_release_lock(self, context, stack_id, engine_id,
+                                       values):
+        if not stack_object.Stack.update_by_id(context, stack_id, values):
+            return True
+        return self.release(context, stack_id, engine_id)
+
+    def engine_alive(self, context, engine_id):
+        # Every lock is held by an engine in this process
+        return True
+
+
+_backends = {}
+
+
+def get_backend():
+    """Return the stack lock backend selected by stack_lock_backend."""
+    name = cfg.CONF.stack_lock_backend
+    if name not in _backends:
+        backend_classes = {
+            'database': DatabaseLockBackend,
+            'memory': MemoryLockBackend,
+        }
+        _backends[name] = backend_classes[name]()
+    return _backends[name]
+
+
 class StackLock(object):
     def __init__(self, context, stack_id, engine_id):
         self.context = context
         self.stack_id = stack_id
         self.engine_id = engine_id
         self.listener = None
+        self.backend = get_backend()
 
     def get_engine_id(self):
         """Return the ID of the engine which currently holds the lock.
 
         Returns None if there is no lock held on the stack.
         """
-        return stack_lock_object.StackLock.get_engine_id(self.context,
-                                                         self.stack_id)
+        return self.backend.get_engine_id(self.context, self.stack_id)
+
+    def engine_alive(self, engine_id):
+        """Return whether the given engine, which holds the lock, is alive."""
+        return self.backend.engine_alive(self.context, engine_id)
 
     def try_acquire(self):
         """Try to acquire a stack lock.
 
         Don't raise an ActionInProgress exception or try to steal lock.
         """
-        return stack_lock_object.StackLock.create(self.context,
-                                                  self.stack_id,
-                                                  self.engine_id)
+        return self.backend.create(self.context, self.stack_id,
+                                   self.engine_id)
 
     def acquire(self, retry=True):
         """Acquire a lock on the stack.
@@ -55,9 +168,8 @@ class StackLock(object):
         :param retry: When True, retry if lock was released while stealing.
         :type retry: boolean
         """
-        lock_engine_id = stack_lock_object.StackLock.create(self.context,
-                                                            self.stack_id,
-                                                            self.engine_id)
+        lock_engine_id = self.backend.create(self.context, self.stack_id,
+                                             self.engine_id)
         if lock_engine_id is None:
             LOG.debug("Engine %(engine)s acquired lock on stack "
                       "%(stack)s" % {'engine': self.engine_id,
@@ -68,7 +180,7 @@ class StackLock(object):
                                              show_deleted=True,
                                              eager_load=False)
         if (lock_engine_id == self.engine_id or
-                service_utils.engine_alive(self.context, lock_engine_id)):
+                self.engine_alive(lock_engine_id)):
             LOG.debug("Lock on stack %(stack)s is owned by engine "
                       "%(engine)s" % {'stack': self.stack_id,
                                       'engine': lock_engine_id})
@@ -79,10 +191,8 @@ class StackLock(object):
                      "%(engine)s will attempt to steal the lock",
                      {'stack': self.stack_id, 'engine': self.engine_id})
 
-            result = stack_lock_object.StackLock.steal(self.context,
-                                                       self.stack_id,
-                                                       lock_engine_id,
-                                                       self.engine_id)
+            result = self.backend.steal(self.context, self.stack_id,
+                                        lock_engine_id, self.engine_id)
 
             if result is None:
                 LOG.info("Engine %(engine)s successfully stole the lock "
@@ -111,9 +221,8 @@ class StackLock(object):
         """Release a stack lock."""
 
         # Only the engine that owns the lock will be releasing it.
-        result = stack_lock_object.StackLock.release(self.context,
-                                                     self.stack_id,
-                                                     self.engine_id)
+        result = self.backend.release(self.context, self.stack_id,
+                                      self.engine_id)
         if result is True:
             LOG.warning("Lock was already released on stack %s!",
                         self.stack_id)
@@ -14,7 +14,6 @@
 
 import ast
 import six
-import tenacity
 
 from oslo_log import log as logging
 
@@ -63,15 +62,6 @@ def delete_all(context, stack_id, traversal_id):
     )
 
 
-def update_input_data(context, entity_id, current_traversal,
-                      is_update, atomic_key, input_data):
-    rows_updated = sync_point_object.SyncPoint.update_input_data(
-        context, entity_id, current_traversal, is_update, atomic_key,
-        input_data)
-
-    return rows_updated
-
-
 def str_pack_tuple(t):
     return u'tuple:' + str(tuple(t))
 
@@ -115,61 +105,56 @@ def serialize_input_data(input_data):
     return {'input_data': _serialize(input_data)}
 
 
-class wait_random_exponential(tenacity.wait_exponential):
-    """Random wait strategy with a geometrically increasing amount of jitter.
-
-    Implements the truncated binary exponential backoff algorithm as used in
-    e.g. CSMA media access control. The retry occurs at a random time in a
-    (geometrically) expanding interval constrained by minimum and maximum
-    limits.
-    """
-    def __init__(self, min=0, multiplier=1, max=tenacity._utils.MAX_WAIT,
-                 exp_base=2):
-        super(wait_random_exponential, self).__init__(multiplier=multiplier,
-                                                      max=(max-min),
-                                                      exp_base=exp_base)
-        self._random = tenacity.wait_random(min=min, max=(min + multiplier))
-
-    def __call__(self, previous_attempt_number, delay_since_first_attempt):
-        jitter = super(wait_random_exponential,
-                       self).__call__(previous_attempt_number,
-                                      delay_since_first_attempt)
-        self._random.wait_random_max = self._random.wait_random_min + jitter
-        return self._random(previous_attempt_number, delay_since_first_attempt)
-
-
 def sync(cnxt, entity_id, current_traversal, is_update, propagate,
          predecessors, new_data):
-    # Retry waits up to 60 seconds at most, with exponentially increasing
-    # amounts of jitter per resource still outstanding
-    wait_strategy = wait_random_exponential(max=60)
-
-    def init_jitter(existing_input_data):
-        nconflicts = max(0, len(predecessors) - len(existing_input_data) - 1)
-        # 10ms per potential conflict, up to a max of 10s in total
-        return min(nconflicts, 1000) * 0.01
-
-    @tenacity.retry(
-        retry=tenacity.retry_if_result(lambda r: r is None),
-        wait=wait_strategy
-    )
-    def _sync():
-        sync_point = get(cnxt, entity_id, current_traversal, is_update)
-        input_data = deserialize_input_data(sync_point.input_data)
-        wait_strategy.multiplier = init_jitter(input_data)
-        input_data.update(new_data)
-        rows_updated = update_input_data(
-            cnxt, entity_id, current_traversal, is_update,
-            sync_point.atomic_key, serialize_input_data(input_data))
-        return input_data if rows_updated else None
-
-    input_data = _sync()
-    waiting = predecessors - set(input_data)
+    """Store the data sent by a predecessor and propagate it if complete.
+
+    Each predecessor stores its data in a separate row, so senders never
+    conflict with each other. Once all of the predecessors' data is present,
+    the sync point is claimed with a single atomic update, so that exactly one
+    of the senders that see the complete data calls ``propagate``.
+    """
     key = make_key(entity_id, current_traversal, is_update)
-    if waiting:
-        LOG.debug('[%s] Waiting %s: Got %s; still need %s',
-                  key, entity_id, _dump_list(input_data), _dump_list(waiting))
-    else:
-        LOG.debug('[%s] Ready %s: Got %s',
-                  key, entity_id, _dump_list(input_data))
-        propagate(entity_id, serialize_input_data(input_data))
+    sync_pt = get(cnxt, entity_id, current_traversal, is_update)
+    for sender, data in new_data.items():
+        values = {'entity_id': entity_id, 'traversal_id': current_traversal,
+                  'is_update': is_update, 'stack_id': sync_pt.stack_id,
+                  'sender': str_pack_tuple(sender),
+                  'input_data': serialize_input_data({sender: data})}
+        sync_point_object.SyncPoint.create_input_data(cnxt, values)
+
+    while True:
+        sync_pt = get(cnxt, entity_id, current_traversal, is_update)
+        if sync_pt.atomic_key < 0:
+            LOG.debug('[%s] Already propagated %s', key, entity_id)
+            return
+
+        input_data = deserialize_input_data(sync_pt.input_data)
+        # Avoid loading the input data while it cannot be complete
+        num_received = len(input_data) + (
+            sync_point_object.SyncPoint.count_input_data(
+                cnxt, entity_id, current_traversal, is_update))
+        if num_received < len(predecessors):
+            LOG.debug('[%s] Waiting %s: Got %d of %d',
+                      key, entity_id, num_received, len(predecessors))
+            return
+
+        for data in sync_point_object.SyncPoint.get_all_input_data(
+                cnxt, entity_id, current_traversal, is_update):
+            input_data.update(deserialize_input_data(data))
+
+        waiting = predecessors - set(input_data)
+        if waiting:
+            LOG.debug('[%s] Waiting %s: Got %s; still need %s',
+                      key, entity_id, _dump_list(input_data),
+                      _dump_list(waiting))
+            return
+
+        if sync_point_object.SyncPoint.claim(cnxt, entity_id,
+                                             current_traversal, is_update,
+                                             sync_pt.atomic_key):
+            break
+
+    LOG.debug('[%s] Ready %s: Got %s',
+              key, entity_id, _dump_list(input_data))
+    propagate(entity_id, serialize_input_data(input_data))
@@ -17,11 +17,13 @@ import copy
 import functools
 import hashlib
 
+from oslo_config import cfg
 import six
 from stevedore import extension
 
 from heat.common import exception
 from heat.common.i18n import _
+from heat.common import lru_cache
 from heat.common import template_format
 from heat.engine import conditions
 from heat.engine import environment
@@ -34,6 +36,10 @@ __all__ = ['Template']
 
 _template_classes = None
 
+# per-process cache of RawTemplate objects, keyed by raw_template ID
+_loaded_templates = lru_cache.LRUCache(
+    lambda: cfg.CONF.parsed_template_cache_size)
+
 
 def get_version(template_data, available_versions):
     version_keys = set(key for key, version in available_versions)
@@ -131,6 +137,7 @@ class Template(collections.Mapping):
 
         self.version = get_version(self.t, _template_classes.keys())
         self.t_digest = None
+        self._shared = False
 
         condition_functions = {n: function.Invalid for n in self.functions}
         condition_functions.update(self.condition_functions)
@@ -140,7 +147,19 @@ class Template(collections.Mapping):
         return Template(copy.deepcopy(self.t, memo), files=self.files,
                         env=self.env)
 
+    def _unshare(self):
+        """Take a private copy of the template data before modifying it.
+
+        Templates returned by load() share their data with the per-process
+        cache of loaded templates, so any method that modifies self.t in
+        place must call this first.
+        """
+        if self._shared:
+            self.t = copy.deepcopy(self.t)
+            self._shared = False
+
     def merge_snippets(self, other):
+        self._unshare()
         for s in self.merge_sections:
             if s not in other.t:
                 continue
@@ -150,15 +169,37 @@ class Template(collections.Mapping):
 
     @classmethod
     def load(cls, context, template_id, t=None):
-        """Retrieve a Template with the given ID from the database."""
-        if t is None:
+        """Retrieve a Template with the given ID from the database.
+
+        If the RawTemplate is not supplied, it is looked up in a per-process
+        cache first. Stored templates may still be updated in place, so a
+        cached copy is only used while the timestamps of the row match the
+        ones it was loaded with. Templates built from the cache share their
+        data with it until they first modify it.
+        """
+        if t is not None:
+            template_data = t.template
+            env = environment.Environment(t.environment)
+            # support loading the legacy t.files, but modern templates will
+            # have a t.files_id
+            t_files = t.files or t.files_id
+            return cls(template_data, template_id=template_id, env=env,
+                       files=t_files)
+
+        timestamps = template_object.RawTemplate.get_timestamps(context,
+                                                                template_id)
+        cached = _loaded_templates.get(template_id)
+        if cached is None or cached[0] != timestamps:
             t = template_object.RawTemplate.get_by_id(context, template_id)
-        env = environment.Environment(t.environment)
-        # support loading the legacy t.files, but modern templates will
-        # have a t.files_id
-        t_files = t.files or t.files_id
-        return cls(t.template, template_id=template_id, env=env,
+            cached = (timestamps, t.template, t.environment,
+                      t.files or t.files_id)
+            _loaded_templates.set(template_id, cached)
+        timestamps, template_data, env_data, t_files = cached
+        env = environment.Environment(copy.deepcopy(env_data))
+        tmpl = cls(template_data, template_id=template_id, env=env,
                    files=t_files)
+        tmpl._shared = True
+        return tmpl
 
     def store(self, context):
         """Store the Template in the database and return its ID."""
@@ -171,6 +212,7 @@ class Template(collections.Mapping):
             new_rt = template_object.RawTemplate.create(context, rt)
             self.id = new_rt.id
         else:
+            _loaded_templates.pop(self.id)
             template_object.RawTemplate.update_by_id(context, self.id, rt)
         return self.id
 
@@ -273,10 +315,12 @@ class Template(collections.Mapping):
 
     def remove_resource(self, name):
         """Remove a resource from the template."""
+        self._unshare()
         self.t.get(self.RESOURCES, {}).pop(name)
 
     def remove_all_resources(self):
         """Remove all the resources from the template."""
+        self._unshare()
         if self.RESOURCES in self.t:
             self.t.update({self.RESOURCES: {}})
 
@@ -12,16 +12,22 @@
 #    under the License.
 
 import collections
+from oslo_config import cfg
 import six
 import weakref
 
 from heat.common import context
 from heat.common.i18n import _
+from heat.common import lru_cache
 from heat.db.sqlalchemy import api as db_api
 from heat.objects import raw_template_files
 
 _d = weakref.WeakValueDictionary()
 
+# Stored files are immutable, so the most recently loaded ones are kept
+# alive (and hence in _d) even when no template is using them
+_recent = lru_cache.LRUCache(lambda: cfg.CONF.template_files_cache_size)
+
 
 class ReadOnlyDict(dict):
     def __setitem__(self, key):
@@ -95,6 +101,7 @@ class TemplateFiles(collections.Mapping):
         _files_dict = ReadOnlyDict(rtf_obj.files)
         self.files = _files_dict
         _d[self.files_id] = _files_dict
+        _recent.set(self.files_id, _files_dict)
 
     def store(self, ctxt):
         if not self.files or self.files_id is not None:
@@ -106,7 +113,10 @@ class TemplateFiles(collections.Mapping):
         rtf_obj = raw_template_files.RawTemplateFiles.create(
             ctxt, {'files': self.files})
         self.files_id = rtf_obj.id
-        _d[self.files_id] = self.files
+        # Identical files may already have been stored, in which case share
+        # the copy that is already loaded
+        self.files = _d.setdefault(self.files_id, self.files)
+        _recent.set(self.files_id, self.files)
         return self.files_id
 
     def update(self, files):
@@ -161,6 +161,7 @@ class Translation(object):
         self.store_translated_values = True
         self._deleted_props = []
         self._replaced_props = []
+        self._rule_keys = {}
 
     def set_rules(self, rules, client_resolve=True):
         if not rules:
@@ -181,21 +182,30 @@ class Translation(object):
                 self._replaced_props.append(path)
 
     def is_deleted(self, key):
-        return (self.is_active and
+        return (self.is_active and bool(self._deleted_props) and
                 self.cast_key_to_rule(key) in self._deleted_props)
 
     def is_replaced(self, key):
-        return (self.is_active and
+        return (self.is_active and bool(self._replaced_props) and
                 self.cast_key_to_rule(key) in self._replaced_props)
 
     def cast_key_to_rule(self, key):
-        return '.'.join([item for item in key.split('.')
-                         if not item.isdigit()])
+        # Property paths are checked on every access to a property, so the
+        # rule key for each path is only worked out once
+        try:
+            return self._rule_keys[key]
+        except KeyError:
+            rule_key = '.'.join([item for item in key.split('.')
+                                 if not item.isdigit()])
+            self._rule_keys[key] = rule_key
+            return rule_key
 
     def has_translation(self, key):
+        if not (self.is_active and
+                (self._rules or self.resolved_translations)):
+            return False
         key = self.cast_key_to_rule(key)
-        return (self.is_active and
-                (key in self._rules or key in self.resolved_translations))
+        return key in self._rules or key in self.resolved_translations
 
     def translate(self, key, prop_value=None, prop_data=None, validate=False):
         if key in self.resolved_translations:
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import eventlet
 import eventlet.queue
 import functools
 
@@ -61,7 +62,7 @@ class WorkerService(object):
     or expect replies from these messages.
     """
 
-    RPC_API_VERSION = '1.4'
+    RPC_API_VERSION = '1.5'
 
     def __init__(self,
                  host,
@@ -144,9 +145,9 @@ class WorkerService(object):
         return True
 
     def _retrigger_replaced(self, is_update, rsrc, stack, check_resource):
-        graph = stack.convergence_dependencies.graph()
+        deps = stack.convergence_dependencies
         key = parser.ConvergenceNode(rsrc.id, is_update)
-        if key not in graph and rsrc.replaces is not None:
+        if key not in deps and rsrc.replaces is not None:
             # This resource replaces old one and is not needed in
             # current traversal. You need to mark the resource as
             # DELETED so that it gets cleaned up in purge_db.
@@ -198,6 +199,29 @@ class WorkerService(object):
             self.thread_group_mgr.remove_msg_queue(None,
                                                    stack.id, msg_queue)
 
+    @context.request_context
+    @log_exceptions
+    def check_resources(self, cnxt, stack_id, resources, current_traversal,
+                        is_update, adopt_stack_data, converge=False):
+        """Process several nodes of the same stack in the dependency graph.
+
+        The stack is fetched from the database only once for the whole
+        batch. Each node is then processed in its own thread, with its own
+        copy of the request context, exactly as check_resource() would.
+        """
+        db_stack = db_api.stack_get(cnxt, stack_id, show_deleted=True,
+                                    eager_load=False)
+        pool = eventlet.GreenPool(len(resources))
+        for resource_id, data in resources:
+            rsrc_cnxt = context.RequestContext.from_dict(cnxt.to_dict())
+            if db_stack is not None:
+                rsrc_cnxt.cache(stack_objects.StackCache).set_by_id(
+                    [db_stack])
+            pool.spawn(self.check_resource, rsrc_cnxt, resource_id,
+                       current_traversal, data, is_update, adopt_stack_data,
+                       converge)
+        pool.waitall()
+
     @context.request_context
     @log_exceptions
     def cancel_check_resource(self, cnxt, stack_id):
@@ -110,6 +110,17 @@ class Event(
         return cls._from_db_object(context, cls(context=context),
                                    dict(db_api.event_create(context, values)))
 
+    @classmethod
+    def create_all(cls, context, values_list):
+        return [cls._from_db_object(context, cls(context=context),
+                                    dict(db_event))
+                for db_event in db_api.event_create_all(context,
+                                                        values_list)]
+
+    @classmethod
+    def purge_all(cls, context):
+        return db_api.event_purge_all(context)
+
     def identifier(self, stack_identifier):
         """Return a unique identifier for the event."""
 
@@ -86,6 +86,15 @@ class RawTemplate(
         raw_template_db = db_api.raw_template_get(context, template_id)
         return cls.from_db_object(context, cls(), raw_template_db)
 
+    @classmethod
+    def get_timestamps(cls, context, template_id):
+        """Return the (created_at, updated_at) timestamps of a template.
+
+        This is much cheaper than fetching the whole template, and can be used
+        to check whether a previously loaded copy is still current.
+        """
+        return db_api.raw_template_get_timestamps(context, template_id)
+
     @classmethod
     def encrypt_hidden_parameters(cls, tmpl):
         if cfg.CONF.encrypt_parameters_and_properties:
@@ -56,10 +56,37 @@ class ResourceCache(object):
     def delete_all(self):
         self.by_stack_id_name = collections.defaultdict(dict)
 
-    def set_by_stack_id(self, resources):
+    def set_by_stack_id(self, resources, stack_ids=()):
+        # Record the stacks that are known to have been loaded, so that a
+        # stack with no resources does not result in another query.
+        for stack_id in stack_ids:
+            self.by_stack_id_name[stack_id]
         for res in six.itervalues(resources):
             self.by_stack_id_name[res.stack_id][res.name] = res
 
+    def get_by_stack_id(self, stack_id, filters=None):
+        """Return the cached resources of a stack, or None if not cached.
+
+        The cache always holds the complete set of resources of a stack, so
+        any filters are applied in memory in the same way as
+        heat.db.sqlalchemy.filters.exact_filter() does in the database.
+        """
+        resources = self.by_stack_id_name.get(stack_id)
+        if resources is None or not filters:
+            return resources
+
+        def matches(res):
+            for key, value in six.iteritems(filters):
+                if isinstance(value, (list, tuple, set, frozenset)):
+                    if res[key] not in value:
+                        return False
+                elif res[key] != value:
+                    return False
+            return True
+
+        return dict((name, res) for name, res in six.iteritems(resources)
+                    if matches(res))
+
 
 class Resource(
     heat_base.HeatObject,
@@ -232,8 +259,8 @@ class Resource(
     @classmethod
     def get_all_by_stack(cls, context, stack_id, filters=None):
         cache = context.cache(ResourceCache)
-        resources = cache.by_stack_id_name.get(stack_id)
-        if resources:
+        resources = cache.get_by_stack_id(stack_id, filters)
+        if resources is not None:
             return dict(resources)
         resources_db = db_api.resource_get_all_by_stack(context, stack_id,
                                                         filters)
@@ -264,14 +291,17 @@ class Resource(
         return dict(resources)
 
     @classmethod
-    def get_all_by_root_stack(cls, context, stack_id, filters, cache=False):
+    def get_all_by_root_stack(cls, context, stack_id, filters, cache=False,
+                              stack_ids=()):
         resources_db = db_api.resource_get_all_by_root_stack(
             context,
             stack_id,
             filters)
         all = cls._resources_to_dict(context, resources_db)
-        if cache:
-            context.cache(ResourceCache).set_by_stack_id(all)
+        # Only a complete set of resources may be cached, since the cache is
+        # also used to answer unfiltered requests.
+        if cache and not filters:
+            context.cache(ResourceCache).set_by_stack_id(all, stack_ids)
         return all
 
     @classmethod
@@ -294,6 +324,15 @@ class Resource(
             stack_id)
         return cls._from_db_object(cls(context), context, resource_db)
 
+    @classmethod
+    def get_all_by_name_and_stack(cls, context, resource_name, stack_id):
+        resources_db = db_api.resource_get_all_by_name_and_stack(
+            context,
+            resource_name,
+            stack_id)
+        return [cls._from_db_object(cls(context), context, resource_db)
+                for resource_db in resources_db]
+
     @classmethod
     def get_all_by_physical_resource_id(cls, context, physical_resource_id):
         matches = db_api.resource_get_all_by_physical_resource_id(
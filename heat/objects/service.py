@@ -81,6 +81,13 @@ class Service(
         return cls._from_db_objects(context,
                                     db_api.service_get_all(context))
 
+    @classmethod
+    def get_by_engine_id(cls, context, engine_id):
+        service_db = db_api.service_get_by_engine_id(context, engine_id)
+        if service_db is None:
+            return None
+        return cls._from_db_object(context, cls(), service_db)
+
     @classmethod
     def get_all_by_args(cls, context, host, binary, hostname):
         return cls._from_db_objects(
@@ -29,6 +29,19 @@ from heat.objects import raw_template
 from heat.objects import stack_tag
 
 
+class StackCache(object):
+
+    def __init__(self):
+        self.delete_all()
+
+    def delete_all(self):
+        self.by_id = {}
+
+    def set_by_id(self, db_stacks):
+        for db_stack in db_stacks:
+            self.by_id[db_stack.id] = db_stack
+
+
 class Stack(
     heat_base.HeatObject,
     base.VersionedObjectDictCompat,
@@ -77,6 +90,9 @@ class Stack(
                 stack['raw_template'] = raw_template_obj
             else:
                 stack[field] = db_stack.__dict__.get(field)
+        # Stack listings load the tags along with the stacks, so use those
+        # rather than querying the tags of each stack separately
+        stack._db_tags = db_stack.__dict__.get('tags')
         stack._context = context
         stack.obj_reset_changes()
         return stack
@@ -86,8 +102,15 @@ class Stack(
         return db_api.stack_get_root_id(context, stack_id)
 
     @classmethod
-    def get_by_id(cls, context, stack_id, **kwargs):
-        db_stack = db_api.stack_get(context, stack_id, **kwargs)
+    def get_by_id(cls, context, stack_id, use_cache=False, **kwargs):
+        db_stack = None
+        if use_cache:
+            db_stack = context.cache(StackCache).by_id.get(stack_id)
+            if db_stack is not None and not db_api.stack_visible(
+                    context, db_stack, kwargs.get('show_deleted', False)):
+                return None
+        if db_stack is None:
+            db_stack = db_api.stack_get(context, stack_id, **kwargs)
         if not db_stack:
             return None
         stack = cls._from_db_object(context, cls(context), db_stack)
@@ -134,25 +157,25 @@ class Stack(
             not_tags=not_tags,
             not_tags_any=not_tags_any,
             eager_load=eager_load)
-        for db_stack in db_stacks:
-            try:
-                yield cls._from_db_object(context, cls(context), db_stack)
-            except exception.NotFound:
-                pass
+        return cls._iter_from_db_objects(context, db_stacks)
 
     @classmethod
     def get_all_by_owner_id(cls, context, owner_id):
         db_stacks = db_api.stack_get_all_by_owner_id(context, owner_id)
-        for db_stack in db_stacks:
-            try:
-                yield cls._from_db_object(context, cls(context), db_stack)
-            except exception.NotFound:
-                pass
+        return cls._iter_from_db_objects(context, db_stacks)
+
+    @classmethod
+    def get_all_by_root_owner_id(cls, context, root_owner_id,
+                                 eager_load=False, cache=False):
+        db_stacks = db_api.stack_get_all_by_root_owner_id(
+            context, root_owner_id, eager_load=eager_load)
+        if cache:
+            db_stacks = list(db_stacks)
+            context.cache(StackCache).set_by_id(db_stacks)
+        return cls._iter_from_db_objects(context, db_stacks)
 
     @classmethod
-    def get_all_by_root_owner_id(cls, context, root_owner_id):
-        db_stacks = db_api.stack_get_all_by_root_owner_id(context,
-                                                          root_owner_id)
+    def _iter_from_db_objects(cls, context, db_stacks):
         for db_stack in db_stacks:
             try:
                 yield cls._from_db_object(context, cls(context), db_stack)
@@ -250,4 +273,7 @@ class Stack(
 
     @property
     def tags(self):
+        db_tags = getattr(self, '_db_tags', None)
+        if db_tags is not None:
+            return db_tags or None
         return stack_tag.StackTagList.get(self._context, self.id)
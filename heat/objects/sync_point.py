@@ -83,6 +83,37 @@ class SyncPoint(
             atomic_key,
             input_data)
 
+    @classmethod
+    def claim(cls, context, entity_id, traversal_id, is_update, atomic_key):
+        return db_api.sync_point_claim(
+            context,
+            entity_id,
+            traversal_id,
+            is_update,
+            atomic_key)
+
+    @classmethod
+    def create_input_data(cls, context, values):
+        db_api.sync_point_input_create(context, values)
+
+    @classmethod
+    def count_input_data(cls, context, entity_id, traversal_id, is_update):
+        return db_api.sync_point_input_count(
+            context,
+            entity_id,
+            traversal_id,
+            is_update)
+
+    @classmethod
+    def get_all_input_data(cls,
+                           context,
+                           entity_id,
+                           traversal_id,
+                           is_update):
+        return [db_input.input_data
+                for db_input in db_api.sync_point_input_get_all(
+                    context, entity_id, traversal_id, is_update)]
+
     @classmethod
     def delete_all_by_stack_and_traversal(cls,
                                           context,
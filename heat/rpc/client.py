@@ -61,6 +61,7 @@ class EngineClient(object):
                and list_software_configs
         1.34 - Add migrate_convergence_1 call
         1.35 - Add with_condition to list_template_functions
+        1.36 - Add describe_stack_resource_metadata
     """
 
     BASE_RPC_API_VERSION = '1.0'
@@ -578,6 +579,20 @@ class EngineClient(object):
                                        with_attr=with_attr),
                          version='1.2')
 
+    def describe_stack_resource_metadata(self, ctxt, stack_identity,
+                                         resource_name):
+        """Get the metadata of a particular resource.
+
+        :param ctxt: RPC context.
+        :param stack_identity: Name of the stack.
+        :param resource_name: the Resource.
+        """
+        return self.call(ctxt,
+                         self.make_msg('describe_stack_resource_metadata',
+                                       stack_identity=stack_identity,
+                                       resource_name=resource_name),
+                         version='1.36')
+
     def find_physical_resource(self, ctxt, physical_resource_id):
         """Return an identifier for the resource.
 
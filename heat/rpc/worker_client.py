@@ -15,6 +15,8 @@
 
 """Client side of the heat worker RPC API."""
 
+from oslo_config import cfg
+
 from heat.common import messaging
 from heat.rpc import worker_api
 
@@ -29,6 +31,7 @@ class WorkerClient(object):
         1.2 - Add adopt data argument to check_resource.
         1.3 - Added cancel_check_resource API.
         1.4 - Add converge argument to check_resource
+        1.5 - Added check_resources.
     """
 
     BASE_RPC_API_VERSION = '1.0'
@@ -62,6 +65,34 @@ class WorkerClient(object):
                   ),
                   version='1.4')
 
+    def check_resources(self, ctxt, stack_id, resources, current_traversal,
+                        is_update, adopt_stack_data, converge=False):
+        """Send check-resource messages for several resources of a stack.
+
+        The resources are given as a list of (resource_id, data) pairs, and
+        are sent in batches of at most check_resource_batch_size resources
+        per message, so that they can still be spread across engines.
+        """
+        batch_size = max(cfg.CONF.check_resource_batch_size, 1)
+        for start in range(0, len(resources), batch_size):
+            batch = resources[start:start + batch_size]
+            if len(batch) == 1:
+                resource_id, data = batch[0]
+                self.check_resource(ctxt, resource_id, current_traversal,
+                                    data, is_update, adopt_stack_data,
+                                    converge)
+                continue
+            self.cast(ctxt,
+                      self.make_msg(
+                          'check_resources', stack_id=stack_id,
+                          resources=[list(r) for r in batch],
+                          current_traversal=current_traversal,
+                          is_update=is_update,
+                          adopt_stack_data=adopt_stack_data,
+                          converge=converge
+                      ),
+                      version='1.5')
+
     def cancel_check_resource(self, ctxt, stack_id, engine_id):
         """Send check-resource cancel message.
 
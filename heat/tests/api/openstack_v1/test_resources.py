@@ -574,33 +574,16 @@ class ResourceControllerTest(tools.ControllerTest, common.HeatTestCase):
         res_name = 'WikiDatabase'
         stack_identity = identifier.HeatIdentifier(self.tenant,
                                                    'wordpress', '6')
-        res_identity = identifier.ResourceIdentifier(resource_name=res_name,
-                                                     **stack_identity)
 
         req = self._get(stack_identity._tenant_path())
 
-        engine_resp = {
-            u'description': u'',
-            u'resource_identity': dict(res_identity),
-            u'stack_name': stack_identity.stack_name,
-            u'resource_name': res_name,
-            u'resource_status_reason': None,
-            u'updated_time': u'2012-07-23T13:06:00Z',
-            u'stack_identity': dict(stack_identity),
-            u'resource_action': u'CREATE',
-            u'resource_status': u'COMPLETE',
-            u'physical_resource_id':
-            u'a3455d8c-9f88-404d-a85b-5315293e67de',
-            u'resource_type': u'AWS::EC2::Instance',
-            u'metadata': {u'ensureRunning': u'true'}
-        }
+        engine_resp = {u'ensureRunning': u'true'}
         self.m.StubOutWithMock(rpc_client.EngineClient, 'call')
         rpc_client.EngineClient.call(
             req.context,
-            ('describe_stack_resource',
-             {'stack_identity': stack_identity, 'resource_name': res_name,
-              'with_attr': False}),
-            version='1.2'
+            ('describe_stack_resource_metadata',
+             {'stack_identity': stack_identity, 'resource_name': res_name}),
+            version='1.36'
         ).AndReturn(engine_resp)
         self.m.ReplayAll()
 
@@ -628,10 +611,9 @@ class ResourceControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.m.StubOutWithMock(rpc_client.EngineClient, 'call')
         rpc_client.EngineClient.call(
             req.context,
-            ('describe_stack_resource',
-             {'stack_identity': stack_identity, 'resource_name': res_name,
-              'with_attr': False}),
-            version='1.2'
+            ('describe_stack_resource_metadata',
+             {'stack_identity': stack_identity, 'resource_name': res_name}),
+            version='1.36'
         ).AndRaise(tools.to_remote_error(error))
         self.m.ReplayAll()
 
@@ -661,10 +643,9 @@ class ResourceControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.m.StubOutWithMock(rpc_client.EngineClient, 'call')
         rpc_client.EngineClient.call(
             req.context,
-            ('describe_stack_resource',
-             {'stack_identity': stack_identity, 'resource_name': res_name,
-              'with_attr': False}),
-            version='1.2'
+            ('describe_stack_resource_metadata',
+             {'stack_identity': stack_identity, 'resource_name': res_name}),
+            version='1.36'
         ).AndRaise(tools.to_remote_error(error))
         self.m.ReplayAll()
 
@@ -315,6 +315,54 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         mock_call.assert_called_once_with(
             req.context, ('list_stacks', default_args), version='1.33')
 
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_index_streamed_in_pages(self, mock_call, mock_enforce):
+        cfg.CONF.set_override('stack_list_page_size', 2, group='heat_api')
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/stacks', {'sort_dir': 'asc'})
+
+        identities = [identifier.HeatIdentifier(self.tenant, 'stack%d' % i,
+                                                str(i))
+                      for i in range(3)]
+        engine_stacks = [{u'stack_identity': dict(identity),
+                          u'stack_name': identity.stack_name}
+                         for identity in identities]
+        mock_call.side_effect = [engine_stacks[:2], engine_stacks[2:]]
+
+        result = self.controller.index(req, tenant_id=self.tenant)
+
+        # Only the first page is fetched before the response is returned
+        self.assertEqual(1, mock_call.call_count)
+        self.assertEqual(['0', '1', '2'],
+                         [s['id'] for s in result['stacks']])
+        self.assertNotIn('links', result)
+
+        default_args = {'limit': 2, 'sort_keys': None, 'marker': None,
+                        'sort_dir': 'asc', 'filters': None,
+                        'show_deleted': False, 'show_nested': False,
+                        'show_hidden': False, 'tags': None,
+                        'tags_any': None, 'not_tags': None,
+                        'not_tags_any': None}
+        next_args = dict(default_args, marker='1')
+        mock_call.assert_has_calls([
+            mock.call(req.context, ('list_stacks', default_args),
+                      version='1.33'),
+            mock.call(req.context, ('list_stacks', next_args),
+                      version='1.33')])
+
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_index_not_streamed_with_limit(self, mock_call, mock_enforce):
+        cfg.CONF.set_override('stack_list_page_size', 2, group='heat_api')
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/stacks', {'limit': 5})
+        mock_call.return_value = []
+
+        result = self.controller.index(req, tenant_id=self.tenant)
+
+        self.assertEqual({'stacks': []}, result)
+        mock_call.assert_called_once_with(
+            req.context, ('list_stacks', mock.ANY), version='1.33')
+
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_index_whitelists_pagination_params(self, mock_call, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'index', True)
@@ -2847,3 +2895,24 @@ class StackSerializerTest(common.HeatTestCase):
         self.assertEqual(201, response.status_int)
         self.assertEqual('location', response.headers['Location'])
         self.assertEqual('application/json', response.headers['Content-Type'])
+
+    def test_serialize_index(self):
+        result = {'stacks': [{'id': '1'}], 'count': 1}
+        response = webob.Response()
+        response = self.serializer.index(response, result)
+        self.assertEqual(result, json.loads(response.body.decode('utf-8')))
+
+    def test_serialize_index_streamed(self):
+        result = {'stacks': iter([{'id': '1'}, {'id': '2'}]), 'count': 2}
+        response = webob.Response()
+        response = self.serializer.index(response, result)
+        self.assertEqual('application/json', response.headers['Content-Type'])
+        self.assertEqual({'stacks': [{'id': '1'}, {'id': '2'}], 'count': 2},
+                         json.loads(response.body.decode('utf-8')))
+
+    def test_serialize_index_streamed_empty(self):
+        result = {'stacks': iter([])}
+        response = webob.Response()
+        response = self.serializer.index(response, result)
+        self.assertEqual({'stacks': []},
+                         json.loads(response.body.decode('utf-8')))
@@ -15,6 +15,7 @@ import six
 
 import mock
 from neutronclient.common import exceptions as qe
+from oslo_config import cfg
 
 from heat.common import exception
 from heat.engine.clients.os import neutron
@@ -127,6 +128,77 @@ class NeutronClientPluginTest(NeutronClientPluginTestCase):
                           '1234')
 
 
+class NeutronClientPluginPollTest(NeutronClientPluginTestCase):
+    def setUp(self):
+        super(NeutronClientPluginPollTest, self).setUp()
+        neutron._status_pollers.clear()
+        self.addCleanup(neutron._status_pollers.clear)
+        self.mock_now = self.patchobject(neutron.timeutils, 'now',
+                                         return_value=1000)
+        self.show = mock.Mock(side_effect=lambda: {'status': 'BUILD'})
+        self.neutron_client.list_ports.side_effect = lambda id: {
+            'ports': [{'id': i, 'status': 'ACTIVE'} for i in id
+                      if i != 'missing']}
+
+    def poll(self, res_id, entity='port'):
+        return self.neutron_plugin.poll_resource(entity, res_id, self.show)
+
+    def test_poll_disabled(self):
+        self.assertEqual({'status': 'BUILD'}, self.poll('p1'))
+        self.assertEqual({'status': 'BUILD'}, self.poll('p2'))
+        self.assertEqual(2, self.show.call_count)
+        self.assertFalse(self.neutron_client.list_ports.called)
+
+    def test_poll_batched(self):
+        cfg.CONF.set_override('status_poll_batch_interval', 5)
+        # with only one resource being polled, it is fetched alone
+        self.assertEqual({'status': 'BUILD'}, self.poll('p1'))
+        self.assertEqual(1, self.show.call_count)
+
+        self.mock_now.return_value = 1001
+        self.assertEqual({'id': 'p2', 'status': 'ACTIVE'}, self.poll('p2'))
+        self.neutron_client.list_ports.assert_called_once_with(
+            id=['p1', 'p2'])
+        self.assertEqual({'id': 'p1', 'status': 'ACTIVE'}, self.poll('p1'))
+        self.assertEqual(1, self.neutron_client.list_ports.call_count)
+
+        # results are only reused for the interval
+        self.mock_now.return_value = 1006
+        self.assertEqual({'id': 'p1', 'status': 'ACTIVE'}, self.poll('p1'))
+        self.assertEqual(2, self.neutron_client.list_ports.call_count)
+        self.assertEqual(1, self.show.call_count)
+
+    def test_poll_batched_in_chunks(self):
+        cfg.CONF.set_override('status_poll_batch_interval', 5)
+        self.patchobject(neutron.StatusPoller, 'batch_size', new=2)
+        for res_id in ('p1', 'p2'):
+            self.poll(res_id)
+        self.neutron_client.list_ports.reset_mock()
+        self.mock_now.return_value = 1006
+        self.poll('p3')
+        self.assertEqual([mock.call(id=['p1', 'p2']), mock.call(id=['p3'])],
+                         self.neutron_client.list_ports.call_args_list)
+
+    def test_poll_missing_from_list(self):
+        cfg.CONF.set_override('status_poll_batch_interval', 5)
+        self.poll('p1')
+        self.assertEqual({'status': 'BUILD'}, self.poll('missing'))
+        self.assertEqual(2, self.show.call_count)
+
+    def test_poll_list_failed(self):
+        cfg.CONF.set_override('status_poll_batch_interval', 5)
+        self.neutron_client.list_ports.side_effect = qe.NeutronClientException
+        self.poll('p1')
+        self.assertEqual({'status': 'BUILD'}, self.poll('p2'))
+        self.assertEqual(2, self.show.call_count)
+
+    def test_poll_not_batched_type(self):
+        cfg.CONF.set_override('status_poll_batch_interval', 5)
+        self.poll('f1', entity='firewall')
+        self.poll('f2', entity='firewall')
+        self.assertEqual(2, self.show.call_count)
+
+
 class NeutronConstraintsValidate(common.HeatTestCase):
     scenarios = [
         ('validate_network',
@@ -38,6 +38,8 @@ from heat.engine import environment
 from heat.engine import resource
 from heat.engine import resources
 from heat.engine import scheduler
+from heat.engine import service_software_config
+from heat.engine import template_files
 from heat.tests import fakes
 from heat.tests import generic_resource as generic_rsrc
 from heat.tests import utils
@@ -109,6 +111,9 @@ class HeatTestCase(testscenarios.WithScenarios,
         cfg.CONF.set_override('error_wait_time', None)
         cfg.CONF.set_default('template_dir', template_dir)
         self.addCleanup(cfg.CONF.reset)
+        self.addCleanup(context._trusts_auth_plugins.clear)
+        self.addCleanup(service_software_config._deployments_metadata.clear)
+        self.addCleanup(template_files._recent.clear)
 
         messaging.setup("fake://", optional=True)
         self.addCleanup(messaging.cleanup)
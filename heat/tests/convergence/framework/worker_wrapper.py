@@ -37,5 +37,13 @@ class Worker(message_processor.MessageProcessor):
                                  adopt_stack_data,
                                  converge)
 
+    def check_resources(self, ctxt, stack_id, resources,
+                        current_traversal, is_update, adopt_stack_data,
+                        converge=False):
+        for resource_id, data in resources:
+            self.check_resource(ctxt, resource_id, current_traversal,
+                                data, is_update, adopt_stack_data,
+                                converge)
+
     def stop_all_workers(self, current_stack):
         pass
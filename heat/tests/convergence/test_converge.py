@@ -33,6 +33,8 @@ class ScenarioTest(common.HeatTestCase):
         self.procs = processes.Processes()
         po = self.patch("heat.rpc.worker_client.WorkerClient.check_resource")
         po.side_effect = self.procs.worker.check_resource
+        po = self.patch("heat.rpc.worker_client.WorkerClient.check_resources")
+        po.side_effect = self.procs.worker.check_resources
         cfg.CONF.set_default('convergence_engine', True)
 
     def test_scenario(self):
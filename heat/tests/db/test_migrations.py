@@ -740,6 +740,29 @@ class HeatMigrationsCheckers(test_migrations.WalkVersionsMixin,
         self.assertColumnExists(engine, 'resource',
                                 'attr_data_id')
 
+    def _check_087(self, engine, data):
+        self.assertIndexMembers(engine, 'event',
+                                'ix_event_stack_id_created_at',
+                                ['stack_id', 'created_at', 'id'])
+        self.assertIndexMembers(engine, 'stack',
+                                'ix_stack_tenant_created_at',
+                                ['tenant', 'created_at', 'id'])
+        self.assertIndexMembers(engine, 'stack', 'ix_stack_created_at',
+                                ['created_at', 'id'])
+
+    def _check_088(self, engine, data):
+        for column in ('entity_id', 'traversal_id', 'is_update', 'sender',
+                       'stack_id', 'input_data', 'created_at',
+                       'updated_at'):
+            self.assertColumnExists(engine, 'sync_point_input', column)
+        self.assertColumnIsNotNullable(engine, 'sync_point_input',
+                                       'stack_id')
+
+    def _check_089(self, engine, data):
+        self.assertColumnExists(engine, 'raw_template_files', 'digest')
+        self.assertIndexMembers(engine, 'raw_template_files',
+                                'ix_raw_template_files_digest', ['digest'])
+
 
 class DbTestCase(test_fixtures.OpportunisticDBTestMixin,
                  test_base.BaseTestCase):
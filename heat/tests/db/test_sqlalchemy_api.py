@@ -1529,6 +1529,32 @@ class DBAPIRawTemplateTest(common.HeatTestCase):
         self.assertRaises(exception.NotFound, db_api.raw_template_get,
                           self.ctx, tp.id)
 
+    def test_raw_template_files_create_deduplicated(self):
+        files = {'foo': 'bar', 'baz': 'quux'}
+        rtf1 = db_api.raw_template_files_create(self.ctx, {'files': files})
+        rtf2 = db_api.raw_template_files_create(
+            self.ctx, {'files': dict(reversed(list(files.items())))})
+        rtf3 = db_api.raw_template_files_create(
+            self.ctx, {'files': {'foo': 'other'}})
+        self.assertEqual(rtf1.id, rtf2.id)
+        self.assertNotEqual(rtf1.id, rtf3.id)
+        self.assertEqual(files, db_api.raw_template_files_get(
+            self.ctx, rtf1.id).files)
+
+    def test_raw_template_delete_shared_files(self):
+        t = template_format.parse(wp_template)
+        tf = template_files.TemplateFiles({'foo': 'shared'})
+        tf.store(self.ctx)
+        tp1 = create_raw_template(self.ctx, template=t, files_id=tf.files_id)
+        tp2 = create_raw_template(self.ctx, template=t, files_id=tf.files_id)
+
+        db_api.raw_template_delete(self.ctx, tp1.id)
+        self.assertIsNotNone(db_api.raw_template_files_get(self.ctx,
+                                                           tf.files_id))
+        db_api.raw_template_delete(self.ctx, tp2.id)
+        self.assertRaises(exception.NotFound, db_api.raw_template_files_get,
+                          self.ctx, tf.files_id)
+
 
 class DBAPIUserCredsTest(common.HeatTestCase):
     def setUp(self):
@@ -1891,6 +1917,19 @@ class DBAPIStackTest(common.HeatTestCase):
         # 2 + 8 + 24
         self.assertEqual(34, len(list(stack2_children)))
 
+    def test_stack_get_all_by_root_owner_id_eager_load(self):
+        parent_stack = create_stack(self.ctx, self.template, self.user_creds)
+        child_stack = create_stack(self.ctx, self.template, self.user_creds,
+                                   owner_id=parent_stack.id)
+        create_stack(self.ctx, self.template, self.user_creds,
+                     owner_id=child_stack.id)
+
+        children = list(db_api.stack_get_all_by_root_owner_id(
+            self.ctx, parent_stack.id, eager_load=True))
+        self.assertEqual(2, len(children))
+        for stack in children:
+            self.assertIn('raw_template', stack.__dict__)
+
     def test_stack_get_all_with_regular_tenant(self):
         values = [
             {'tenant': UUID1},
@@ -2080,14 +2119,84 @@ class DBAPIStackTest(common.HeatTestCase):
                                               show_deleted=True))
         self.assertIsNotNone(db_api.raw_template_get(ctx, templates[1].id))
 
+    def test_purge_deleted_events_in_chunks(self):
+        deleted_at = timeutils.utcnow() - datetime.timedelta(days=2)
+        stacks = [create_stack(self.ctx, create_raw_template(self.ctx),
+                               create_user_creds(self.ctx),
+                               deleted_at=deleted_at) for i in range(3)]
+        for stack in stacks:
+            for i in range(5):
+                create_event(self.ctx, stack_id=stack.id)
+        live_stack = create_stack(self.ctx, create_raw_template(self.ctx),
+                                  create_user_creds(self.ctx))
+        live_event = create_event(self.ctx, stack_id=live_stack.id)
+
+        counts = db_api.purge_deleted(age=1, granularity='days',
+                                      batch_size=2, chunk_size=2)
+
+        self.assertEqual(3, counts['stack'])
+        self.assertEqual(15, counts['event'])
+        self.assertEqual(15, counts['resource_properties_data'])
+        admin_ctx = utils.dummy_context(is_admin=True)
+        for stack in stacks:
+            self.assertIsNone(db_api.stack_get(admin_ctx, stack.id,
+                                               show_deleted=True))
+            self.assertEqual([], db_api.event_get_all_by_stack(admin_ctx,
+                                                               stack.id))
+        self.assertIsNotNone(db_api.stack_get(admin_ctx, live_stack.id))
+        self.assertIsNotNone(admin_ctx.session.query(
+            models.Event).get(live_event.id))
+
+    def test_purge_deleted_dry_run(self):
+        deleted_at = timeutils.utcnow() - datetime.timedelta(days=2)
+        stacks = [create_stack(self.ctx, create_raw_template(self.ctx),
+                               create_user_creds(self.ctx),
+                               deleted_at=deleted_at) for i in range(2)]
+        resources = [create_resource(self.ctx, stack) for stack in stacks]
+        create_resource_data(self.ctx, resources[0])
+        for i in range(3):
+            create_event(self.ctx, stack_id=stacks[0].id)
+
+        counts = db_api.purge_deleted(age=1, granularity='days',
+                                      dry_run=True)
+
+        self.assertEqual(2, counts['stack'])
+        self.assertEqual(2, counts['resource'])
+        self.assertEqual(1, counts['resource_data'])
+        self.assertEqual(3, counts['event'])
+        self.assertEqual(0, counts['sync_point'])
+        admin_ctx = utils.dummy_context(is_admin=True)
+        for stack in stacks:
+            self.assertIsNotNone(db_api.stack_get(admin_ctx, stack.id,
+                                                  show_deleted=True))
+        self.assertEqual(3, len(db_api.event_get_all_by_stack(
+            admin_ctx, stacks[0].id)))
+
+    @mock.patch.object(db_api.time, 'sleep')
+    def test_purge_deleted_max_rows_per_second(self, mock_sleep):
+        deleted_at = timeutils.utcnow() - datetime.timedelta(days=2)
+        stack = create_stack(self.ctx, create_raw_template(self.ctx),
+                             create_user_creds(self.ctx),
+                             deleted_at=deleted_at)
+        for i in range(4):
+            create_event(self.ctx, stack_id=stack.id)
+
+        db_api.purge_deleted(age=1, granularity='days', chunk_size=2,
+                             max_rows_per_second=1)
+
+        self.assertTrue(mock_sleep.called)
+        admin_ctx = utils.dummy_context(is_admin=True)
+        self.assertIsNone(db_api.stack_get(admin_ctx, stack.id,
+                                           show_deleted=True))
+
     def test_dont_purge_shared_raw_template_files(self):
         now = timeutils.utcnow()
         delta = datetime.timedelta(seconds=3600 * 7)
         deleted = [now - delta * i for i in range(1, 6)]
-        # the last two template_files are identical to first two
+        # the last two templates share the files of the first two
         # (so should not be purged)
         tmpl_files = [template_files.TemplateFiles(
-            {'foo': 'more file contents'}) for i in range(3)]
+            {'foo': 'more file contents %d' % i}) for i in range(3)]
         [tmpl_file.store(self.ctx) for tmpl_file in tmpl_files]
         templates = [create_raw_template(self.ctx,
                                          files_id=tmpl_files[i % 3].files_id
@@ -2109,14 +2218,42 @@ class DBAPIStackTest(common.HeatTestCase):
                           db_api.raw_template_files_get,
                           self.ctx, tmpl_files[2].files_id)
 
+    def test_purge_deduplicated_raw_template_files(self):
+        now = timeutils.utcnow()
+        delta = datetime.timedelta(seconds=3600 * 7)
+        tmpl_files = [template_files.TemplateFiles(
+            {'foo': 'identical file contents'}) for i in range(2)]
+        [tmpl_file.store(self.ctx) for tmpl_file in tmpl_files]
+        self.assertEqual(tmpl_files[0].files_id, tmpl_files[1].files_id)
+        templates = [create_raw_template(self.ctx,
+                                         files_id=tmpl_file.files_id)
+                     for tmpl_file in tmpl_files]
+        creds = [create_user_creds(self.ctx) for i in range(2)]
+        stacks = [create_stack(self.ctx, templates[i], creds[i],
+                               deleted_at=now - delta * (i * 3 + 1))
+                  for i in range(2)]
+
+        db_api.purge_deleted(age=15, granularity='hours')
+        admin_ctx = utils.dummy_context(is_admin=True)
+        self.assertIsNone(db_api.stack_get(admin_ctx, stacks[1].id,
+                                           show_deleted=True))
+        self.assertIsNotNone(db_api.raw_template_files_get(
+            admin_ctx, tmpl_files[0].files_id))
+
+        db_api.purge_deleted(age=0, granularity='seconds')
+        admin_ctx = utils.dummy_context(is_admin=True)
+        self.assertRaises(exception.NotFound,
+                          db_api.raw_template_files_get,
+                          admin_ctx, tmpl_files[0].files_id)
+
     def test_dont_purge_project_shared_raw_template_files(self):
         now = timeutils.utcnow()
         delta = datetime.timedelta(seconds=3600 * 7)
         deleted = [now - delta * i for i in range(1, 6)]
-        # the last two template_files are identical to first two
+        # the last two templates share the files of the first two
         # (so should not be purged)
         tmpl_files = [template_files.TemplateFiles(
-            {'foo': 'more file contents'}) for i in range(3)]
+            {'foo': 'more file contents %d' % i}) for i in range(3)]
         [tmpl_file.store(self.ctx) for tmpl_file in tmpl_files]
         templates = [create_raw_template(self.ctx,
                                          files_id=tmpl_files[i % 3].files_id
@@ -2325,6 +2462,20 @@ class DBAPIResourceTest(common.HeatTestCase):
                                                                 'abc',
                                                                 self.stack.id))
 
+    def test_resource_get_all_by_name_and_stack(self):
+        create_resource(self.ctx, self.stack)
+        create_resource(self.ctx, self.stack)
+        create_resource(self.ctx, self.stack, name='other')
+
+        ret_res = db_api.resource_get_all_by_name_and_stack(
+            self.ctx, 'test_resource_name', self.stack.id)
+
+        self.assertEqual(2, len(ret_res))
+        self.assertEqual({'test_resource_name'},
+                         set(res.name for res in ret_res))
+        self.assertEqual([], db_api.resource_get_all_by_name_and_stack(
+            self.ctx, 'abc', self.stack.id))
+
     def test_resource_get_by_physical_resource_id(self):
         create_resource(self.ctx, self.stack)
 
@@ -2891,6 +3042,111 @@ class DBAPIEventTest(common.HeatTestCase):
         self.assertEqual(1, db_api.event_count_all_by_stack(self.ctx,
                                                             self.stack2.id))
 
+    def test_event_get_all_by_stack_paginate(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        now = timeutils.utcnow()
+        # Several events share a timestamp, so the ID has to break the tie
+        times = [now, now, now + datetime.timedelta(seconds=1), now,
+                 now - datetime.timedelta(seconds=1)]
+        for i, created_at in enumerate(times):
+            create_event(self.ctx, stack_id=stack.id, created_at=created_at,
+                         resource_name='res%d' % i)
+        all_events = db_api.event_get_all_by_stack(self.ctx, stack.id)
+
+        for sort_dir in ('asc', 'desc', None):
+            events = []
+            marker = None
+            while True:
+                page = db_api.event_get_all_by_stack(self.ctx, stack.id,
+                                                     limit=2, marker=marker,
+                                                     sort_dir=sort_dir)
+                if not page:
+                    break
+                events.extend(page)
+                marker = page[-1].uuid
+            names = [e.resource_name for e in events]
+            if sort_dir == 'asc':
+                expected = ['res4', 'res0', 'res1', 'res3', 'res2']
+            else:
+                expected = ['res2', 'res3', 'res1', 'res0', 'res4']
+            self.assertEqual(expected, names)
+        self.assertEqual(['res2', 'res3', 'res1', 'res0', 'res4'],
+                         [e.resource_name for e in all_events])
+
+    def test_event_get_all_by_stack_seeks_index(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        marker = create_event(self.ctx, stack_id=stack.id)
+        query = db_api._query_all_by_stack(self.ctx, stack.id)
+        query = db_api._events_filter_and_page_query(self.ctx, query,
+                                                     limit=10,
+                                                     marker=marker.uuid)
+
+        plan = self.ctx.session.execute(
+            'EXPLAIN QUERY PLAN %s' % query.statement.compile(
+                compile_kwargs={'literal_binds': True})).fetchall()
+        detail = ' '.join(str(row[-1]) for row in plan)
+        self.assertIn('ix_event_stack_id_created_at', detail)
+        self.assertIn('created_at<', detail.replace(' ', ''))
+
+    def test_event_create_all(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        values = [
+            {'stack_id': stack.id, 'resource_name': 'res1',
+             'uuid': UUID2},
+            {'stack_id': stack.id, 'resource_name': 'res2',
+             'resource_status_reason': 'x' * 300},
+        ]
+
+        events = db_api.event_create_all(self.ctx, values)
+
+        self.assertEqual(2, len(events))
+        self.assertEqual(UUID2, events[0].uuid)
+        self.assertIsNotNone(events[1].uuid)
+        self.assertEqual(255, len(events[1].resource_status_reason))
+        stored = db_api.event_get_all_by_stack(self.ctx, stack.id,
+                                               sort_keys=['id'],
+                                               sort_dir='asc')
+        self.assertEqual(['res1', 'res2'],
+                         [e.resource_name for e in stored])
+
+    def test_event_create_purge_interval(self):
+        cfg.CONF.set_override('max_events_per_stack', 1)
+        cfg.CONF.set_override('event_purge_batch_size', 1)
+        cfg.CONF.set_override('event_purge_interval', 60)
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        for name in ('res1', 'res2', 'res3'):
+            create_event(self.ctx, stack_id=stack.id, resource_name=name)
+
+        # Purging is left to the periodic task
+        self.assertEqual(3, db_api.event_count_all_by_stack(self.ctx,
+                                                            stack.id))
+
+    def test_event_purge_all(self):
+        cfg.CONF.set_override('max_events_per_stack', 2)
+        cfg.CONF.set_override('event_purge_interval', 60)
+        self.stack1 = create_stack(self.ctx, self.template, self.user_creds)
+        self.stack2 = create_stack(self.ctx, self.template, self.user_creds)
+        for name in ('res1', 'res2', 'res3', 'res4'):
+            create_event(self.ctx, stack_id=self.stack1.id,
+                         resource_name=name)
+        create_event(self.ctx, stack_id=self.stack2.id, resource_name='res5')
+
+        self.assertEqual(2, db_api.event_purge_all(self.ctx))
+
+        events = db_api.event_get_all_by_stack(self.ctx, self.stack1.id)
+        self.assertEqual({'res3', 'res4'},
+                         set(e.resource_name for e in events))
+        self.assertEqual(1, db_api.event_count_all_by_stack(self.ctx,
+                                                            self.stack2.id))
+        self.assertEqual(0, db_api.event_purge_all(self.ctx))
+
+    def test_event_purge_all_unlimited(self):
+        cfg.CONF.set_override('max_events_per_stack', 0)
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        create_event(self.ctx, stack_id=stack.id)
+
+        self.assertEqual(0, db_api.event_purge_all(self.ctx))
+
 
 class DBAPIServiceTest(common.HeatTestCase):
     def setUp(self):
@@ -2937,6 +3193,18 @@ class DBAPIServiceTest(common.HeatTestCase):
         self.assertEqual('heat-engine', services_by_args[0].binary)
         self.assertEqual('engine-0', services_by_args[0].host)
 
+    def test_service_get_by_engine_id(self):
+        service = create_service(self.ctx)
+        self.assertEqual(service.id, db_api.service_get_by_engine_id(
+            self.ctx, service.engine_id).id)
+        self.assertIsNone(db_api.service_get_by_engine_id(
+            self.ctx, str(uuid.uuid4())))
+
+        # Stopped engines are found as well
+        db_api.service_delete(self.ctx, service.id)
+        self.assertIsNotNone(db_api.service_get_by_engine_id(
+            self.ctx, service.engine_id).deleted_at)
+
     def test_service_update(self):
         service = create_service(self.ctx)
         values = {'hostname': 'host-updated',
@@ -3210,6 +3478,51 @@ class DBAPISyncPointTest(common.HeatTestCase):
         )
         self.assertEqual(0, rows_updated)
 
+    def test_sync_point_claim(self):
+        sync_point = create_sync_point(
+            self.ctx, entity_id=str(self.resources[0].id),
+            stack_id=self.stack.id, traversal_id=self.stack.current_traversal
+        )
+        self.assertEqual(1, db_api.sync_point_claim(
+            self.ctx, sync_point.entity_id, sync_point.traversal_id,
+            sync_point.is_update, 0))
+        # a second claim with the same atomic_key does not update
+        self.assertEqual(0, db_api.sync_point_claim(
+            self.ctx, sync_point.entity_id, sync_point.traversal_id,
+            sync_point.is_update, 0))
+        ret_sync_point = db_api.sync_point_get(self.ctx,
+                                               sync_point.entity_id,
+                                               sync_point.traversal_id,
+                                               sync_point.is_update)
+        self.assertEqual(-1, ret_sync_point.atomic_key)
+
+    def test_sync_point_input(self):
+        entity_id = self.resources[0].id
+        traversal_id = self.stack.current_traversal
+        for sender, data in (('a', 1), ('b', 2), ('a', 3)):
+            db_api.sync_point_input_create(
+                self.ctx, {'entity_id': entity_id,
+                           'traversal_id': traversal_id,
+                           'is_update': True, 'stack_id': self.stack.id,
+                           'sender': sender,
+                           'input_data': {sender: data}})
+
+        self.assertEqual(2, db_api.sync_point_input_count(
+            self.ctx, entity_id, traversal_id, True))
+        self.assertEqual(0, db_api.sync_point_input_count(
+            self.ctx, entity_id, traversal_id, False))
+        inputs = db_api.sync_point_input_get_all(self.ctx, entity_id,
+                                                 traversal_id, True)
+        # data sent again by the same sender replaces the old data
+        self.assertEqual([{'a': 3}, {'b': 2}],
+                         sorted((i.input_data for i in inputs),
+                                key=lambda d: list(d)))
+
+        db_api.sync_point_delete_all_by_stack_and_traversal(
+            self.ctx, self.stack.id, traversal_id)
+        self.assertEqual(0, db_api.sync_point_input_count(
+            self.ctx, entity_id, traversal_id, True))
+
     def test_sync_point_delete(self):
         for res in self.resources:
             sync_point_rsrc = create_sync_point(
@@ -21,6 +21,7 @@ from heat.common import context
 from heat.common import service_utils
 from heat.engine import service
 from heat.engine import worker
+from heat.objects import event as event_object
 from heat.objects import service as service_objects
 from heat.rpc import worker_api
 from heat.tests import common
@@ -39,7 +40,7 @@ class ServiceEngineTest(common.HeatTestCase):
 
     def test_make_sure_rpc_version(self):
         self.assertEqual(
-            '1.35',
+            '1.36',
             service.EngineService.RPC_API_VERSION,
             ('RPC version is changed, please update this test to new version '
              'and make sure additional test cases are added for RPC APIs '
@@ -127,6 +128,22 @@ class ServiceEngineTest(common.HeatTestCase):
         msg = 'Service %s update failed' % self.eng.service_id
         self.assertIn(msg, self.LOG.output)
 
+    @mock.patch.object(event_object.Event, 'purge_all')
+    @mock.patch.object(context, 'get_admin_context')
+    def test_purge_events(self, mock_admin_context, mock_purge_all):
+        mock_admin_context.return_value = self.ctx
+        mock_purge_all.return_value = 3
+        self.eng.purge_events()
+        mock_purge_all.assert_called_once_with(self.ctx)
+
+    @mock.patch.object(event_object.Event, 'purge_all')
+    @mock.patch.object(context, 'get_admin_context')
+    def test_purge_events_fail(self, mock_admin_context, mock_purge_all):
+        mock_admin_context.return_value = self.ctx
+        mock_purge_all.side_effect = Exception('boom')
+        self.eng.purge_events()
+        self.assertIn('Failed to purge events: boom', self.LOG.output)
+
     def test_stop_rpc_server(self):
         with mock.patch.object(self.eng,
                                '_rpc_server') as mock_rpc_server:
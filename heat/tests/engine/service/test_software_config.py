@@ -15,6 +15,7 @@ import datetime
 import uuid
 
 import mock
+from oslo_config import cfg
 from oslo_messaging.rpc import dispatcher
 from oslo_serialization import jsonutils as json
 from oslo_utils import timeutils
@@ -307,6 +308,7 @@ class SoftwareConfigServiceTest(common.HeatTestCase):
         self.assertEqual(0, len(metadata))
 
         # assert None config is filtered out
+        service_software_config._deployments_metadata.clear()
         obj_conf = self._create_dummy_config_object()
         side_effect = [obj_conf, obj_conf, None]
         self.patchobject(software_config_object.SoftwareConfig,
@@ -315,6 +317,45 @@ class SoftwareConfigServiceTest(common.HeatTestCase):
             self.ctx, server_id=server_id)
         self.assertEqual(2, len(metadata))
 
+    def test_metadata_software_deployments_cached(self):
+        stack_name = 'test_metadata_software_deployments_cached'
+        t = template_format.parse(tools.wp_template)
+        stack = utils.parse_stack(t, stack_name=stack_name)
+
+        tools.setup_mocks(self.m, stack)
+        self.m.ReplayAll()
+        stack.store()
+        stack.create()
+        server_id = stack['WebServer'].resource_id
+
+        self._create_software_deployment(server_id=server_id,
+                                         config_name='01_first')
+        get_all = self.patchobject(
+            software_deployment_object.SoftwareDeployment, 'get_all',
+            wraps=software_deployment_object.SoftwareDeployment.get_all)
+        metadata = self.engine.metadata_software_deployments(
+            self.ctx, server_id=server_id)
+        self.assertEqual(1, len(metadata))
+        self.assertEqual(metadata, self.engine.metadata_software_deployments(
+            self.ctx, server_id=server_id))
+        self.assertEqual(1, get_all.call_count)
+
+        # a context of another project does not share the cached entry
+        ctx = utils.dummy_context(tenant_id=str(uuid.uuid4()))
+        self.assertEqual([], self.engine.metadata_software_deployments(
+            ctx, server_id=server_id))
+        self.assertEqual(2, get_all.call_count)
+
+        # a new deployment changes the version of the server resource
+        self._create_software_deployment(server_id=server_id,
+                                         config_name='02_second')
+        get_all.reset_mock()
+        metadata = self.engine.metadata_software_deployments(
+            self.ctx, server_id=server_id)
+        self.assertEqual(['01_first', '02_second'],
+                         [md['name'] for md in metadata])
+        self.assertEqual(1, get_all.call_count)
+
     def test_show_software_deployment(self):
         deployment_id = str(uuid.uuid4())
         ex = self.assertRaises(dispatcher.ExpectedException,
@@ -946,6 +987,70 @@ class SoftwareConfigServiceTest(common.HeatTestCase):
         ssd.assert_called_once_with(self.ctx, deployment_id, 'ok', None)
 
 
+class MetadataPushSchedulerTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(MetadataPushSchedulerTest, self).setUp()
+        cfg.CONF.set_override('deployment_metadata_push_interval', 0.5)
+        self.spawn_after = self.patchobject(service_software_config.eventlet,
+                                            'spawn_after')
+        self.push = mock.Mock()
+        self.scheduler = service_software_config.MetadataPushScheduler(
+            self.push)
+
+    def test_schedule_coalesces_pushes(self):
+        ctx1, ctx2, ctx3 = mock.Mock(), mock.Mock(), mock.Mock()
+        self.scheduler.schedule(ctx1, 'server1', 'project')
+        self.scheduler.schedule(ctx2, 'server1', 'project')
+        self.scheduler.schedule(ctx3, 'server2', 'project')
+        self.assertEqual(
+            [mock.call(0.5, self.scheduler._run, 'server1'),
+             mock.call(0.5, self.scheduler._run, 'server2')],
+            self.spawn_after.call_args_list)
+        self.assertFalse(self.push.called)
+
+        self.scheduler._run('server1')
+        self.push.assert_called_once_with(ctx2, 'server1', 'project')
+        self.assertEqual({'requested': 3, 'pushed': 1, 'pending': 1,
+                          'saved': 1}, self.scheduler.stats())
+
+        # a change after the push has started needs another push
+        self.scheduler.schedule(ctx1, 'server1', 'project')
+        self.assertEqual(3, self.spawn_after.call_count)
+
+    def test_flush(self):
+        self.scheduler.schedule(mock.sentinel.ctx, 'server1', 'project')
+        self.scheduler.schedule(mock.sentinel.ctx, 'server1', 'project')
+        self.push.side_effect = Exception('boom')
+
+        self.scheduler.flush()
+
+        self.push.assert_called_once_with(mock.sentinel.ctx, 'server1',
+                                          'project')
+        self.spawn_after.return_value.cancel.assert_called_once_with()
+        self.assertEqual({'requested': 2, 'pushed': 1, 'pending': 0,
+                          'saved': 1}, self.scheduler.stats())
+
+    def test_deployment_changes_request_push(self):
+        engine = service.EngineService('a-host', 'a-topic')
+        push = self.patchobject(engine.software_config,
+                                '_push_metadata_software_deployments')
+        schedule = self.patchobject(engine.software_config.metadata_pushes,
+                                    'schedule')
+        ctx = utils.dummy_context()
+        config = engine.create_software_config(
+            ctx, group='Heat::Shell', name='config_mysql',
+            config='#!/bin/bash', inputs=[], outputs=[], options={})
+        sd = engine.create_software_deployment(
+            ctx, 'server1', config['id'], {}, 'INIT', 'COMPLETE', '',
+            'project')
+        engine.delete_software_deployment(ctx, sd['id'])
+
+        self.assertEqual([mock.call(ctx, 'server1', 'project')] * 2,
+                         schedule.call_args_list)
+        self.assertFalse(push.called)
+
+
 class SoftwareConfigIOSchemaTest(common.HeatTestCase):
     def test_input_config_empty(self):
         name = 'foo'
@@ -141,6 +141,41 @@ class StackResourcesServiceTest(common.HeatTestCase):
         self.assertEqual(exception.Forbidden, ex.exc_info[0])
         mock_auth.assert_called_once_with(self.ctx, mock.ANY, 'foo')
 
+    @mock.patch.object(stack.Stack, 'load')
+    @tools.stack_context('service_resource_metadata_test_stack')
+    def test_stack_resource_describe_metadata(self, mock_load):
+        self.stack['WebServer'].metadata_set({'foo': 'bar'})
+
+        md = self.eng.describe_stack_resource_metadata(
+            self.ctx, self.stack.identifier(), 'WebServer')
+
+        self.assertEqual({'foo': 'bar'}, md)
+        self.assertFalse(mock_load.called)
+
+    @tools.stack_context('service_resource_metadata_noncreated_test_stack',
+                         create_res=False)
+    def test_stack_resource_describe_metadata_noncreated_resource(self):
+        self.patchobject(stack.Stack, 'load', return_value=self.stack)
+
+        md = self.eng.describe_stack_resource_metadata(
+            self.ctx, self.stack.identifier(), 'WebServer')
+
+        self.assertEqual(self.stack['WebServer'].t.metadata(), md)
+        stack.Stack.load.assert_called_once_with(self.ctx, stack=mock.ANY)
+
+    @mock.patch.object(service.EngineService, '_authorize_stack_user')
+    @tools.stack_context('service_resource_metadata_user_deny_test_stack')
+    def test_stack_resource_describe_metadata_stack_user_deny(self,
+                                                              mock_auth):
+        self.ctx.roles = [cfg.CONF.heat_stack_user_role]
+        mock_auth.return_value = False
+
+        ex = self.assertRaises(dispatcher.ExpectedException,
+                               self.eng.describe_stack_resource_metadata,
+                               self.ctx, self.stack.identifier(), 'WebServer')
+        self.assertEqual(exception.Forbidden, ex.exc_info[0])
+        mock_auth.assert_called_once_with(self.ctx, mock.ANY, 'WebServer')
+
     @mock.patch.object(stack.Stack, 'load')
     @tools.stack_context('service_resources_describe_test_stack')
     def test_stack_resources_describe(self, mock_load):
@@ -293,6 +328,39 @@ class StackResourcesServiceTest(common.HeatTestCase):
             0, filters={})
         self.assertEqual(0, len(resources))
 
+    def test_stack_resources_list_nested_with_filters(self):
+        parent_tmpl = {'HeatTemplateFormatVersion': '2012-12-12',
+                       'Resources': {'Nested': {'Type': 'StackResourceType'},
+                                     'C': {'Type': 'GenericResourceType'}}}
+        child_tmpl = {'HeatTemplateFormatVersion': '2012-12-12',
+                      'Resources': {'A': {'Type': 'GenericResourceType'},
+                                    'B': {'Type': 'GenericResourceType'}}}
+        parent = stack.Stack(self.ctx, 'parent_stack',
+                             templatem.Template(parent_tmpl))
+        parent.store()
+        child = stack.Stack(self.ctx, 'child_stack',
+                            templatem.Template(child_tmpl),
+                            owner_id=parent.id)
+        child.store()
+        parent['Nested'].resource_id = child.id
+        for stk in (parent, child):
+            for rsrc in stk.resources.values():
+                rsrc.store()
+
+        resources = self.eng.list_stack_resources(self.ctx,
+                                                  parent.identifier(),
+                                                  nested_depth=1,
+                                                  filters={'name': 'A'})
+
+        self.assertEqual(['A'], [r['resource_name'] for r in resources])
+
+        resources = self.eng.list_stack_resources(self.ctx,
+                                                  parent.identifier(),
+                                                  nested_depth=1)
+
+        self.assertEqual({'Nested', 'C', 'A', 'B'},
+                         set(r['resource_name'] for r in resources))
+
     @mock.patch.object(stack.Stack, 'load')
     def test_stack_resources_list_deleted_stack(self, mock_load):
         stk = tools.setup_stack('resource_list_deleted_stack', self.ctx)
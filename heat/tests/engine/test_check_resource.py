@@ -672,6 +672,23 @@ class MiscMethodsTest(common.HeatTestCase):
             ('A', True), {}, True, None)
         self.assertTrue(mock_sync.called)
 
+    @mock.patch.object(sync_point, 'sync')
+    def test_propagate_check_resource_ready(self, mock_sync):
+        def sync(cnxt, entity_id, current_traversal, is_update, propagate,
+                 predecessors, new_data):
+            propagate(entity_id, {'input_data': {}})
+
+        mock_sync.side_effect = sync
+        rpc_client = mock.Mock()
+        ready = {False: [], True: []}
+        check_resource.propagate_check_resource(
+            self.ctx, rpc_client, 4,
+            self.stack.current_traversal, set(),
+            ('A', True), {}, True, None, ready=ready)
+        self.assertFalse(rpc_client.check_resource.called)
+        self.assertEqual({False: [], True: [(4, {'input_data': {}})]},
+                         ready)
+
     @mock.patch.object(resource.Resource, 'create_convergence')
     @mock.patch.object(resource.Resource, 'update_convergence')
     def test_check_resource_update_init_action(self, mock_update, mock_create):
@@ -244,3 +244,52 @@ class dependenciesTest(common.HeatTestCase):
         leaves = sorted(list(d.roots()))
 
         self.assertEqual(['last1', 'last2'], leaves)
+
+    def test_contains(self):
+        d = dependencies.Dependencies([('last', 'first'), ('other', None)])
+
+        self.assertIn('last', d)
+        self.assertIn('first', d)
+        self.assertIn('other', d)
+        self.assertNotIn('foo', d)
+
+    def test_order_stable(self):
+        d = dependencies.Dependencies([('c', None), ('b', 'a'), ('d', 'a'),
+                                       ('e', 'd'), ('f', None)])
+
+        self.assertEqual(['c', 'a', 'b', 'd', 'e', 'f'], list(iter(d)))
+        self.assertEqual(['c', 'b', 'e', 'd', 'a', 'f'], list(reversed(d)))
+
+    def test_large_chain(self):
+        size = 10000
+        d = dependencies.Dependencies([(i + 1, i) for i in range(size)])
+
+        self.assertEqual(list(range(size + 1)), list(iter(d)))
+        self.assertEqual(list(range(size, -1, -1)), list(reversed(d)))
+        self.assertEqual([0], list(d.leaves()))
+        self.assertEqual([size], list(d.roots()))
+
+    def test_large_chain_circular(self):
+        size = 10000
+        d = dependencies.Dependencies([(i + 1, i) for i in range(size)] +
+                                      [(0, size)])
+
+        self.assertRaises(dependencies.CircularDependencyException,
+                          list, iter(d))
+
+    def test_deep_diamonds_partial(self):
+        # A ladder of diamonds has a number of paths that is exponential in
+        # its depth, so it cannot be walked path by path.
+        depth = 1000
+        edges = []
+        for i in range(depth):
+            edges += [(('l', i + 1), ('l', i)), (('l', i + 1), ('r', i)),
+                      (('r', i + 1), ('l', i)), (('r', i + 1), ('r', i))]
+        d = dependencies.Dependencies(edges)
+
+        p = d[('l', 0)]
+        order = list(iter(p))
+
+        self.assertEqual(2 * depth + 1, len(order))
+        self.assertEqual(('l', 0), order[0])
+        self.assertEqual({('l', depth), ('r', depth)}, set(order[-2:]))
@@ -23,13 +23,14 @@ from heat.engine import worker
 from heat.objects import stack as stack_objects
 from heat.rpc import worker_client as wc
 from heat.tests import common
+from heat.tests.engine import tools
 from heat.tests import utils
 
 
 class WorkerServiceTest(common.HeatTestCase):
     def test_make_sure_rpc_version(self):
         self.assertEqual(
-            '1.4',
+            '1.5',
             worker.WorkerService.RPC_API_VERSION,
             ('RPC version is changed, please update this test to new version '
              'and make sure additional test cases are added for RPC APIs '
@@ -136,6 +137,40 @@ class WorkerServiceTest(common.HeatTestCase):
         # ensure remove is also called
         self.assertTrue(mock_tgm.remove_msg_queue.called)
 
+    @mock.patch.object(worker.WorkerService, 'check_resource')
+    def test_check_resources(self, mock_check_resource):
+        self.worker = worker.WorkerService('host-1',
+                                           'topic-1',
+                                           'engine_id',
+                                           mock.MagicMock())
+        ctx = utils.dummy_context()
+        stack = tools.get_stack('check_resources', ctx,
+                                template=tools.string_template_five,
+                                convergence=True)
+        stack.store()
+        resources = [[4, {'input_data': {}}], [5, {'input_data': {}}]]
+
+        with mock.patch.object(db_api, 'stack_get',
+                               wraps=db_api.stack_get) as mock_stack_get:
+            self.worker.check_resources(ctx, stack.id, resources,
+                                        'traversal', True, None)
+
+        mock_stack_get.assert_called_once_with(ctx, stack.id,
+                                               show_deleted=True,
+                                               eager_load=False)
+        self.assertEqual(2, mock_check_resource.call_count)
+        contexts = set()
+        for (rsrc_ctx, rsrc_id, traversal, data, is_update, adopt,
+             converge), kwargs in mock_check_resource.call_args_list:
+            self.assertIn([rsrc_id, data], resources)
+            self.assertEqual(('traversal', True, None, False),
+                             (traversal, is_update, adopt, converge))
+            self.assertIsNot(ctx, rsrc_ctx)
+            self.assertIn(stack.id,
+                          rsrc_ctx.cache(stack_objects.StackCache).by_id)
+            contexts.add(rsrc_ctx)
+        self.assertEqual(2, len(contexts))
+
     @mock.patch.object(worker, '_wait_for_cancellation')
     @mock.patch.object(worker, '_cancel_check_resource')
     @mock.patch.object(wc.WorkerClient, 'cancel_check_resource')
@@ -391,6 +391,29 @@ class DependencyTaskGroupTest(common.HeatTestCase):
         exc = self.assertRaises(type(e2), task.throw, e2)
         self.assertIs(e2, exc)
 
+    def test_large_graph(self):
+        # A long chain with a fan of independent tasks hanging off each link
+        size = 500
+        edges = []
+        for i in range(size):
+            edges.append((('chain', i + 1), ('chain', i)))
+            edges.append((('leaf', i), ('chain', i)))
+        deps = dependencies.Dependencies(edges)
+
+        started = []
+
+        def task(key):
+            started.append(key)
+            yield
+
+        tg = scheduler.DependencyTaskGroup(deps, task)
+        steps = list(tg())
+
+        self.assertEqual(2 * size + 1, len(started))
+        self.assertEqual(size + 1, len(steps))
+        for rqr, rqd in edges:
+            self.assertLess(started.index(rqd), started.index(rqr))
+
 
 class TaskTest(common.HeatTestCase):
 
@@ -13,9 +13,9 @@
 # limitations under the License.
 
 import mock
-from oslo_db import exception
 
 from heat.engine import sync_point
+from heat.objects import sync_point as sync_point_object
 from heat.tests import common
 from heat.tests.engine import tools
 from heat.tests import utils
@@ -41,11 +41,11 @@ class SyncPointTestCase(common.HeatTestCase):
         sync_point.sync(ctx, resource.id, stack.current_traversal, True,
                         mock_callback, set(graph[(resource.id, True)]),
                         {sender: None})
-        updated_sync_point = sync_point.get(ctx, resource.id,
-                                            stack.current_traversal, True)
-        input_data = sync_point.deserialize_input_data(
-            updated_sync_point.input_data)
-        self.assertEqual({sender: None}, input_data)
+        input_data = sync_point_object.SyncPoint.get_all_input_data(
+            ctx, resource.id, stack.current_traversal, True)
+        self.assertEqual([{sender: None}],
+                         [sync_point.deserialize_input_data(d)
+                          for d in input_data])
         self.assertFalse(mock_callback.called)
 
     def test_sync_non_waiting(self):
@@ -62,35 +62,84 @@ class SyncPointTestCase(common.HeatTestCase):
         sync_point.sync(ctx, resource.id, stack.current_traversal, True,
                         mock_callback, set(graph[(resource.id, True)]),
                         {sender: None})
-        updated_sync_point = sync_point.get(ctx, resource.id,
-                                            stack.current_traversal, True)
-        input_data = sync_point.deserialize_input_data(
-            updated_sync_point.input_data)
-        self.assertEqual({sender: None}, input_data)
-        self.assertTrue(mock_callback.called)
+        mock_callback.assert_called_once_with(
+            resource.id, sync_point.serialize_input_data({sender: None}))
 
     def test_serialize_input_data(self):
         res = sync_point.serialize_input_data({(3, 8): None})
         self.assertEqual({'input_data': {u'tuple:(3, 8)': None}}, res)
 
-    @mock.patch('heat.engine.sync_point.update_input_data', return_value=None)
-    @mock.patch('time.sleep', side_effect=exception.DBError)
-    def sync_with_sleep(self, ctx, stack, mock_sleep_time, mock_uid):
+    def _get_stack(self):
+        stack = tools.get_stack('test_stack', utils.dummy_context(),
+                                template=tools.string_template_five,
+                                convergence=True)
+        stack.converge_stack(stack.t, action=stack.CREATE)
+        return stack
+
+    def test_sync_many_predecessors(self):
+        ctx = utils.dummy_context()
+        stack = self._get_stack()
         resource = stack['C']
+        predecessors = set((i, True) for i in range(100))
+
+        mock_callback = mock.Mock()
+        for sender in sorted(predecessors):
+            self.assertFalse(mock_callback.called)
+            sync_point.sync(ctx, resource.id, stack.current_traversal, True,
+                            mock_callback, predecessors,
+                            {sender: sender[0]})
+
+        expected = dict((sender, sender[0]) for sender in predecessors)
+        mock_callback.assert_called_once_with(
+            resource.id, sync_point.serialize_input_data(expected))
+
+    def test_sync_propagates_once(self):
+        ctx = utils.dummy_context()
+        stack = self._get_stack()
+        resource = stack['A']
         graph = stack.convergence_dependencies.graph()
+        predecessors = set(graph[(resource.id, True)])
 
         mock_callback = mock.Mock()
-        sender = (3, True)
-        self.assertRaises(exception.DBError, sync_point.sync, ctx, resource.id,
-                          stack.current_traversal, True, mock_callback,
-                          set(graph[(resource.id, True)]), {sender: None})
-        return mock_sleep_time
+        for i in range(2):
+            sync_point.sync(ctx, resource.id, stack.current_traversal, True,
+                            mock_callback, predecessors, {(3, True): None})
+        self.assertEqual(1, mock_callback.call_count)
 
-    def test_sync_with_time_throttle(self):
+    def test_sync_legacy_input_data(self):
         ctx = utils.dummy_context()
-        stack = tools.get_stack('test_stack', utils.dummy_context(),
-                                template=tools.string_template_five,
-                                convergence=True)
-        stack.converge_stack(stack.t, action=stack.CREATE)
-        mock_sleep_time = self.sync_with_sleep(ctx, stack)
-        self.assertTrue(mock_sleep_time.called)
+        stack = self._get_stack()
+        resource = stack['C']
+        sync_point_object.SyncPoint.update_input_data(
+            ctx, resource.id, stack.current_traversal, True, 0,
+            sync_point.serialize_input_data({(4, True): 'a'}))
+
+        mock_callback = mock.Mock()
+        sync_point.sync(ctx, resource.id, stack.current_traversal, True,
+                        mock_callback, {(4, True), (5, True)},
+                        {(5, True): 'b'})
+        mock_callback.assert_called_once_with(
+            resource.id,
+            sync_point.serialize_input_data({(4, True): 'a',
+                                             (5, True): 'b'}))
+
+    def test_sync_claimed_concurrently(self):
+        ctx = utils.dummy_context()
+        stack = self._get_stack()
+        resource = stack['A']
+        graph = stack.convergence_dependencies.graph()
+        predecessors = set(graph[(resource.id, True)])
+
+        claim = sync_point_object.SyncPoint.claim
+
+        def claim_by_other(*args):
+            claim(*args)
+            return 0
+
+        mock_callback = mock.Mock()
+        with mock.patch.object(sync_point_object.SyncPoint, 'claim',
+                               side_effect=claim_by_other) as mock_claim:
+            sync_point.sync(ctx, resource.id, stack.current_traversal, True,
+                            mock_callback, predecessors, {(3, True): None})
+        self.assertEqual(1, mock_claim.call_count)
+        self.assertFalse(mock_callback.called)
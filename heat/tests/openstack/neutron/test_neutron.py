@@ -124,6 +124,29 @@ class NeutronTest(common.HeatTestCase):
         # due to no resource_id
         self.assertIsNone(res.FnGetAtt('attr2'))
 
+    def test_resolve_attribute_with_data_cache(self):
+        res = self._get_some_neutron_resource()
+        res.attributes_schema.update(
+            {'attr2': attributes.Schema(type=attributes.Schema.STRING)})
+        res.attributes = attributes.Attributes(res.name,
+                                               res.attributes_schema,
+                                               res._resolve_any_attribute)
+        mock_show = self.patchobject(
+            res, '_show_resource',
+            return_value={'attr1': 'val1', 'attr2': 'val2'})
+        res.resource_id = 'resource_id'
+        with self.dummy_stack.attribute_data_cache():
+            self.assertEqual({'attr1': 'val1', 'attr2': 'val2'},
+                             res.FnGetAtt('show'))
+            self.assertEqual('val2', res.FnGetAtt('attr2'))
+            self.assertEqual('val1', res._resolve_any_attribute('attr1'))
+        self.assertEqual(1, mock_show.call_count)
+
+        # outside the context the data is fetched again
+        res.attributes.reset_resolved_values()
+        self.assertEqual('val2', res.FnGetAtt('attr2'))
+        self.assertEqual(2, mock_show.call_count)
+
     def test_needs_replace_failed(self):
         res = self._get_some_neutron_resource()
         res.state_set(res.CREATE, res.FAILED)
@@ -195,6 +195,38 @@ class TestRequestContext(common.HeatTestCase):
         self.assertRaises(exception.AuthorizationFailure, getattr,
                           ctx, 'auth_plugin')
 
+    def test_get_trust_context_auth_plugin_cached(self):
+        self.ctx['trust_id'] = 'trust_id'
+        mock_load = self.patchobject(ks_loading, 'load_auth_from_conf_options',
+                                     side_effect=[mock.Mock(), mock.Mock()])
+        ctx1 = context.RequestContext.from_dict(self.ctx)
+        ctx2 = context.RequestContext.from_dict(self.ctx)
+        self.assertIs(ctx1.auth_plugin, ctx2.auth_plugin)
+        mock_load.assert_called_once_with(cfg.CONF, 'trustee',
+                                          trust_id='trust_id')
+
+        self.ctx['trust_id'] = 'other_trust_id'
+        ctx3 = context.RequestContext.from_dict(self.ctx)
+        self.assertIsNot(ctx1.auth_plugin, ctx3.auth_plugin)
+        self.assertEqual(2, mock_load.call_count)
+
+    def test_get_trust_context_auth_plugin_cache_disabled(self):
+        cfg.CONF.set_override('trusts_auth_cache_size', 0)
+        self.ctx['trust_id'] = 'trust_id'
+        mock_load = self.patchobject(ks_loading, 'load_auth_from_conf_options',
+                                     side_effect=[mock.Mock(), mock.Mock()])
+        ctx1 = context.RequestContext.from_dict(self.ctx)
+        ctx2 = context.RequestContext.from_dict(self.ctx)
+        self.assertIsNot(ctx1.auth_plugin, ctx2.auth_plugin)
+        self.assertEqual(2, mock_load.call_count)
+
+    def test_keystone_session_shares_connections(self):
+        ctx1 = context.RequestContext.from_dict(self.ctx)
+        ctx2 = context.RequestContext.from_dict(self.ctx)
+        self.assertIsNot(ctx1._keystone_session, ctx2._keystone_session)
+        self.assertIs(ctx1._keystone_session.session,
+                      ctx2._keystone_session.session)
+
     def test_cache(self):
         ctx = context.RequestContext.from_dict(self.ctx)
 
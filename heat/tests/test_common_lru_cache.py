@@ -0,0 +1,92 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+from oslo_utils import timeutils
+
+from heat.common import lru_cache
+from heat.tests import common
+
+
+class LRUCacheTest(common.HeatTestCase):
+
+    def test_get_set(self):
+        cache = lru_cache.LRUCache(2)
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', 1)
+        self.assertEqual(1, cache.get('a'))
+        self.assertIn('a', cache)
+        self.assertEqual({'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 2},
+                         cache.stats())
+
+    def test_evict_least_recently_used(self):
+        cache = lru_cache.LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(2, len(cache))
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_disabled(self):
+        cache = lru_cache.LRUCache(0)
+        cache.set('a', 1)
+        self.assertEqual(0, len(cache))
+        self.assertEqual('default', cache.get('a', 'default'))
+
+    def test_pop_and_clear(self):
+        cache = lru_cache.LRUCache(2)
+        cache.set('a', 1)
+        self.assertEqual(1, cache.pop('a'))
+        self.assertIsNone(cache.pop('a'))
+        cache.set('b', 2)
+        cache.get('b')
+        cache.clear()
+        self.assertEqual({'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 2},
+                         cache.stats())
+
+    def test_callable_maxsize(self):
+        size = [2]
+        cache = lru_cache.LRUCache(lambda: size[0])
+        cache.set('a', 1)
+        cache.set('b', 2)
+        size[0] = 1
+        cache.set('c', 3)
+
+        self.assertEqual(1, len(cache))
+        self.assertIn('c', cache)
+        self.assertEqual(1, cache.stats()['maxsize'])
+
+    @mock.patch.object(timeutils, 'now')
+    def test_idle_timeout(self, mock_now):
+        cache = lru_cache.LRUCache(10, idle_timeout=60)
+        mock_now.return_value = 1000
+        cache.set('a', 1)
+        cache.set('b', 2)
+        mock_now.return_value = 1050
+        self.assertEqual(1, cache.get('a'))
+
+        mock_now.return_value = 1100
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(1, len(cache))
+
+        mock_now.return_value = 1200
+        cache.set('c', 3)
+        self.assertNotIn('a', cache)
+        self.assertIn('c', cache)
+        self.assertEqual({'hits': 2, 'misses': 1, 'size': 1, 'maxsize': 10},
+                         cache.stats())
@@ -71,6 +71,30 @@ class JSONResponseSerializerTest(common.HeatTestCase):
         self.assertEqual('application/json', response.content_type)
         self.assertEqual(b'{"key": "value"}', response.body)
 
+    def test_conditional(self):
+        fixture = collections.OrderedDict([('b', 2), ('a', 1)])
+        request = webob.Request.blank('/')
+        response = webob.Response(request=request)
+        serializers.JSONResponseSerializer().conditional(response, fixture)
+        self.assertEqual('application/json', response.content_type)
+        self.assertEqual(b'{"a": 1, "b": 2}', response.body)
+        self.assertIsNotNone(response.etag)
+        self.assertEqual(200, request.get_response(response).status_int)
+
+        request = webob.Request.blank('/', if_none_match=response.etag)
+        response = webob.Response(request=request)
+        serializers.JSONResponseSerializer().conditional(
+            response, {'a': 1, 'b': 2})
+        not_modified = request.get_response(response)
+        self.assertEqual(304, not_modified.status_int)
+        self.assertEqual(b'', not_modified.body)
+
+        request = webob.Request.blank('/', if_none_match=response.etag)
+        response = webob.Response(request=request)
+        serializers.JSONResponseSerializer().conditional(
+            response, {'a': 1, 'b': 3})
+        self.assertEqual(200, request.get_response(response).status_int)
+
 
 class XMLResponseSerializerTest(common.HeatTestCase):
 
@@ -34,6 +34,9 @@ class StackConvergenceCreateUpdateDeleteTest(common.HeatTestCase):
     def setUp(self):
         super(StackConvergenceCreateUpdateDeleteTest, self).setUp()
         cfg.CONF.set_override('convergence_engine', True)
+        # trigger resources one at a time, so each leaf shows up as a
+        # separate check_resource call below
+        cfg.CONF.set_override('check_resource_batch_size', 1)
         self.stack = None
 
     @mock.patch.object(parser.Stack, 'mark_complete')
@@ -131,6 +134,28 @@ class StackConvergenceCreateUpdateDeleteTest(common.HeatTestCase):
                     is_update, None, False))
         self.assertEqual(expected_calls, mock_cr.mock_calls)
 
+    @mock.patch.object(worker_client.WorkerClient, 'cast')
+    def test_conv_string_five_instance_stack_create_batched(self, mock_cast,
+                                                            mock_cr):
+        cfg.CONF.set_override('check_resource_batch_size', 10)
+        stack = tools.get_stack('test_stack', utils.dummy_context(),
+                                template=tools.string_template_five,
+                                convergence=True)
+        stack.store()
+        stack.converge_stack(template=stack.t, action=stack.CREATE)
+
+        # both leaves (A and B) are sent to the workers in a single message
+        self.assertFalse(mock_cr.called)
+        expected_msg = ('check_resources', {
+            'stack_id': stack.id,
+            'resources': [[4, {'input_data': {}}], [5, {'input_data': {}}]],
+            'current_traversal': stack.current_traversal,
+            'is_update': True,
+            'adopt_stack_data': None,
+            'converge': False})
+        mock_cast.assert_called_once_with(stack.context, expected_msg,
+                                          version='1.5')
+
     def _mock_convg_db_update_requires(self):
         """Updates requires column of resources.
 
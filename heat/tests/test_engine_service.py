@@ -35,6 +35,7 @@ from heat.engine import service
 from heat.engine import stack as parser
 from heat.engine import template as templatem
 from heat.objects import stack as stack_object
+from heat.objects import stack_tag as stack_tag_object
 from heat.rpc import api as rpc_api
 from heat.tests import common
 from heat.tests.engine import tools
@@ -482,6 +483,18 @@ class StackServiceTest(common.HeatTestCase):
             self.assertIn('description', s)
             self.assertEqual('', s['description'])
 
+    @tools.stack_context('service_list_tags_loaded_test_stack')
+    def test_stack_list_uses_loaded_tags(self):
+        stack_tag_object.StackTagList.set(self.ctx, self.stack.id,
+                                          ['tag1', 'tag2'])
+        with mock.patch.object(stack_tag_object.StackTagList,
+                               'get') as mock_get:
+            sl = self.eng.list_stacks(self.ctx)
+
+        self.assertEqual(1, len(sl))
+        self.assertEqual(['tag1', 'tag2'], sorted(sl[0]['tags']))
+        self.assertFalse(mock_get.called)
+
     @mock.patch.object(stack_object.Stack, 'get_all')
     def test_stack_list_passes_marker_info(self, mock_stack_get_all):
         limit = object()
@@ -271,6 +271,70 @@ class EventTest(EventCommon):
         self.assertEqual(data, e_obj.resource_properties)
 
 
+class EventBufferTest(EventCommon):
+
+    def setUp(self):
+        super(EventBufferTest, self).setUp()
+        self._setup_stack(tmpl)
+        cfg.CONF.set_override('event_batch_interval', 60)
+        self.spawn_after = self.patchobject(event.eventlet, 'spawn_after')
+        self.addCleanup(event.flush)
+
+    def _event(self, physical_resource_id):
+        return event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS',
+                           'Testing', physical_resource_id, None, None,
+                           self.resource.name, self.resource.type())
+
+    def _stored(self):
+        return event_object.Event.get_all_by_stack(self.ctx, self.stack.id)
+
+    def test_store_buffered(self):
+        e = self._event('wyoming')
+        self.assertIsNone(e.store())
+
+        self.assertIsNotNone(e.uuid)
+        self.assertIsNotNone(e.timestamp)
+        self.assertIsNone(e.id)
+        self.assertEqual([], self._stored())
+        self.spawn_after.assert_called_once_with(60, event._buffer.flush)
+
+        event.flush()
+
+        events = self._stored()
+        self.assertEqual(1, len(events))
+        self.assertEqual(e.uuid, events[0].uuid)
+        self.assertEqual('wyoming', events[0].physical_resource_id)
+        self.spawn_after.return_value.cancel.assert_called_once_with()
+
+    def test_store_buffered_full(self):
+        cfg.CONF.set_override('event_batch_size', 2)
+        self._event('utah').store()
+        self.assertEqual([], self._stored())
+
+        self._event('vermont').store()
+        self.assertEqual({'utah', 'vermont'},
+                         set(e.physical_resource_id for e in self._stored()))
+        self.assertEqual(0, len(event._buffer))
+
+    def test_store_buffered_error(self):
+        self._event('virginia').store()
+        self.patchobject(event_object.Event, 'create_all',
+                         side_effect=Exception('boom'))
+
+        event.flush()
+
+        self.assertIn('Failed to store 1 events', self.LOG.output)
+        self.assertEqual(0, len(event._buffer))
+
+    def test_stack_action_complete_flushes(self):
+        self.stack._add_event('TEST', self.stack.IN_PROGRESS, 'Testing')
+        self.assertEqual([], self._stored())
+
+        self.stack._add_event('TEST', self.stack.COMPLETE, 'Tested')
+        self.assertEqual([self.stack.COMPLETE, self.stack.IN_PROGRESS],
+                         sorted(e.resource_status for e in self._stored()))
+
+
 class EventEncryptedTest(EventCommon):
 
     def setUp(self):
@@ -1038,6 +1038,22 @@ class PropertyTest(common.HeatTestCase):
         self.assertEqual('Property error: [1].valid: "fish" is not '
                          'a valid boolean', six.text_type(ex))
 
+    def test_list_schema_children_reused(self):
+        map_schema = {'valid': {'Type': 'Boolean'}}
+        list_schema = {'Type': 'Map', 'Schema': map_schema}
+        p = properties.Property({'Type': 'List', 'Schema': list_schema},
+                                name='list')
+        self.assertEqual([{'valid': True}],
+                         p.get_value([{'valid': 'TRUE'}]))
+        child = p._child(0)
+        self.assertEqual('list.0', child.path)
+        self.assertEqual([{'valid': False}, {'valid': True}],
+                         p.get_value([{'valid': 'false'},
+                                      {'valid': 'true'}]))
+        self.assertIs(child, p._child(0))
+        self.assertEqual('list.1', p._child(1).path)
+        self.assertEqual(2, len(p._children))
+
     def test_list_schema_int_good(self):
         list_schema = {'Type': 'Integer'}
         p = properties.Property({'Type': 'List', 'Schema': list_schema})
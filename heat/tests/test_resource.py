@@ -2734,7 +2734,9 @@ class ResourceTest(common.HeatTestCase):
         self.assertTrue(mock_stack_load.called)
         mock_stack_load.assert_called_with(stack.context,
                                            stack_id=stack.id,
-                                           cache_data=data)
+                                           cache_data=data,
+                                           use_cache=True,
+                                           eager_load=False)
         self.assertTrue(mock_load_data.called)
 
 
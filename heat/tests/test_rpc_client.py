@@ -263,6 +263,11 @@ class EngineRpcAPITestCase(common.HeatTestCase):
                               resource_name='LogicalResourceId',
                               with_attr=None)
 
+    def test_describe_stack_resource_metadata(self):
+        self._test_engine_api('describe_stack_resource_metadata', 'call',
+                              stack_identity=self.identity,
+                              resource_name='LogicalResourceId')
+
     def test_find_physical_resource(self):
         self._test_engine_api('find_physical_resource', 'call',
                               physical_resource_id=u'404d-a85b-5315293e67de')
@@ -15,6 +15,8 @@
 
 import mock
 
+from oslo_config import cfg
+
 from heat.rpc import worker_api as rpc_api
 from heat.rpc import worker_client as rpc_client
 from heat.tests import common
@@ -97,3 +99,32 @@ class WorkerClientTest(common.HeatTestCase):
                 version='1.3')
             # ensure correct rpc method is called
             mock_cast.cast.assert_called_with(mock_cnxt, method, **kwargs)
+
+    @mock.patch('heat.common.messaging.get_rpc_client',
+                return_value=mock.Mock())
+    def test_check_resources(self, rpc_client_method):
+        cfg.CONF.set_override('check_resource_batch_size', 2)
+        mock_cnxt = mock.Mock()
+        resources = [(1, 'data1'), (2, 'data2'), (3, 'data3')]
+        wc = rpc_client.WorkerClient()
+        with mock.patch.object(wc, 'cast') as mock_cast:
+            wc.check_resources(mock_cnxt, 'stack-id', resources,
+                               'traversal', True, None)
+
+        batch = ('check_resources', {
+            'stack_id': 'stack-id',
+            'resources': [[1, 'data1'], [2, 'data2']],
+            'current_traversal': 'traversal',
+            'is_update': True,
+            'adopt_stack_data': None,
+            'converge': False})
+        single = ('check_resource', {
+            'resource_id': 3,
+            'current_traversal': 'traversal',
+            'data': 'data3',
+            'is_update': True,
+            'adopt_stack_data': None,
+            'converge': False})
+        self.assertEqual([mock.call(mock_cnxt, batch, version='1.5'),
+                          mock.call(mock_cnxt, single, version='1.4')],
+                         mock_cast.call_args_list)
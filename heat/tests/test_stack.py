@@ -281,6 +281,36 @@ class StackTest(common.HeatTestCase):
         self.assertIsNone(self.stack.resource_get('C'))
         self.assertIsNone(self.stack.resource_get('D'))
 
+    def test_attribute_data_cache(self):
+        tpl = {'HeatTemplateFormatVersion': '2012-12-12',
+               'Resources':
+               {'A': {'Type': 'GenericResourceType'}}}
+        self.stack = stack.Stack(self.ctx, 'test_stack',
+                                 template.Template(tpl))
+        fetch = mock.Mock(side_effect=['data1', 'data2', 'data3', 'data4'])
+
+        # without the cache, the data is fetched every time
+        self.assertEqual('data1',
+                         self.stack.cached_attribute_data('A', 'k', fetch))
+        self.assertEqual('data2',
+                         self.stack.cached_attribute_data('A', 'k', fetch))
+
+        with self.stack.attribute_data_cache():
+            self.assertEqual('data3',
+                             self.stack.cached_attribute_data('A', 'k', fetch))
+            with self.stack.attribute_data_cache():
+                self.assertEqual('data3',
+                                 self.stack.cached_attribute_data('A', 'k',
+                                                                  fetch))
+            # the nested context does not discard the data
+            self.assertEqual('data3',
+                             self.stack.cached_attribute_data('A', 'k', fetch))
+            self.assertEqual('data4',
+                             self.stack.cached_attribute_data('B', 'k', fetch))
+
+        self.assertIsNone(self.stack._attribute_data)
+        self.assertEqual(4, fetch.call_count)
+
     @mock.patch.object(resource_objects.Resource, 'get_all_by_stack')
     def test_iter_resources(self, mock_db_call):
         tpl = {'HeatTemplateFormatVersion': '2012-12-12',
@@ -636,6 +666,68 @@ class StackTest(common.HeatTestCase):
         stacks = list(stack.Stack.load_all(self.ctx, show_nested=True))
         self.assertEqual(3, len(stacks))
 
+    def test_prefetch_nested_tree(self):
+        tpl = {'HeatTemplateFormatVersion': '2012-12-12',
+               'Resources': {'A': {'Type': 'GenericResourceType'},
+                             'B': {'Type': 'GenericResourceType'}}}
+        parent = stack.Stack(self.ctx, 'parent',
+                             template.Template(copy.deepcopy(tpl)))
+        parent.store()
+        child = stack.Stack(self.ctx, 'child',
+                            template.Template(copy.deepcopy(tpl)),
+                            owner_id=parent.id)
+        child.store()
+        grandchild = stack.Stack(self.ctx, 'grandchild', self.tmpl,
+                                 owner_id=child.id)
+        grandchild.store()
+        for stk in (parent, child):
+            for res in stk.resources.values():
+                res.store()
+
+        parent.prefetch_nested_tree()
+
+        for db_call in ('stack_get', 'raw_template_get',
+                        'resource_get_all_by_stack'):
+            self.patchobject(db_api, db_call,
+                             side_effect=AssertionError('unexpected query'))
+        loaded = stack.Stack.load(self.ctx, stack_id=child.id,
+                                  use_cache=True)
+        self.assertEqual('child', loaded.name)
+        self.assertEqual(child.t.id, loaded.t.id)
+        self.assertEqual({'A', 'B'}, set(loaded._db_resources_get()))
+
+        loaded = stack.Stack.load(self.ctx, stack_id=grandchild.id,
+                                  use_cache=True)
+        self.assertEqual('grandchild', loaded.name)
+        self.assertEqual({}, loaded._db_resources_get())
+
+    def test_prefetch_nested_tree_not_used_by_default(self):
+        parent = stack.Stack(self.ctx, 'parent', self.tmpl)
+        parent.store()
+        child = stack.Stack(self.ctx, 'child', self.tmpl,
+                            owner_id=parent.id)
+        child.store()
+
+        parent.prefetch_nested_tree()
+
+        stack_get = self.patchobject(db_api, 'stack_get',
+                                     wraps=db_api.stack_get)
+        stack.Stack.load(self.ctx, stack_id=child.id)
+        self.assertEqual(1, stack_get.call_count)
+
+    def test_prefetch_nested_tree_other_tenant(self):
+        parent = stack.Stack(self.ctx, 'parent', self.tmpl)
+        parent.store()
+        child = stack.Stack(self.ctx, 'child', self.tmpl,
+                            owner_id=parent.id)
+        child.store()
+
+        parent.prefetch_nested_tree()
+
+        self.ctx.tenant = 'another_tenant'
+        self.assertRaises(exception.NotFound, stack.Stack.load,
+                          self.ctx, stack_id=child.id, use_cache=True)
+
     def test_load_all_not_found(self):
         stack1 = stack.Stack(self.ctx, 'stack1', self.tmpl)
         stack1.store()
@@ -1409,6 +1501,74 @@ class StackTest(common.HeatTestCase):
             self.assertEqual(['DResource'],
                              self.stack[r].required_by())
 
+    def _create_lazy_test_stack(self, a_type='GenericResourceType'):
+        tmpl = {'heat_template_version': '2015-04-30',
+                'resources': {'AResource': {'type': a_type},
+                              'BResource': {'type': 'GenericResourceType',
+                                            'depends_on': 'AResource'},
+                              'CResource': {'type': 'GenericResourceType',
+                                            'depends_on': 'BResource'},
+                              'DResource': {'type': 'GenericResourceType'}},
+                'outputs': {'TestOutput': {
+                    'value': {'get_resource': 'CResource'}}}}
+
+        self.stack = stack.Stack(self.ctx, 'lazy_test_stack',
+                                 template.Template(tmpl))
+        self.stack.store()
+        self.stack.create()
+        self.assertEqual((stack.Stack.CREATE, stack.Stack.COMPLETE),
+                         self.stack.state)
+        return stack.Stack.load(self.ctx, stack_id=self.stack.id,
+                                lazy_resources=True)
+
+    def test_load_lazy_resources(self):
+        lazy_stack = self._create_lazy_test_stack()
+
+        self.assertEqual({'AResource', 'BResource', 'CResource',
+                          'DResource'}, set(lazy_stack))
+        self.assertIn('DResource', lazy_stack)
+        self.assertEqual({}, lazy_stack.resources._resources)
+
+        rsrc = lazy_stack['BResource']
+        self.assertEqual((rsrc.CREATE, rsrc.COMPLETE), rsrc.state)
+        self.assertIs(rsrc, lazy_stack['BResource'])
+        self.assertEqual({'BResource'}, set(lazy_stack.resources._resources))
+        self.assertRaises(KeyError, lazy_stack.__getitem__, 'EResource')
+
+    def test_lazy_resources_required_by(self):
+        lazy_stack = self._create_lazy_test_stack()
+
+        self.assertEqual(['CResource'],
+                         lazy_stack['BResource'].required_by())
+        self.assertEqual([], lazy_stack['DResource'].required_by())
+        self.assertEqual({'BResource', 'DResource'},
+                         set(lazy_stack.resources._resources))
+
+    def test_lazy_resources_required_by_implicit_deps(self):
+        class ResourceWithImplicitDeps(generic_rsrc.GenericResource):
+
+            def add_dependencies(self, deps):
+                deps += (self.stack['DResource'], self)
+
+        resource._register_class('ResourceWithImplicitDeps',
+                                 ResourceWithImplicitDeps)
+        lazy_stack = self._create_lazy_test_stack(
+            a_type='ResourceWithImplicitDeps')
+
+        self.assertEqual(['BResource', 'DResource'],
+                         sorted(lazy_stack['AResource'].required_by()))
+        self.assertEqual(4, len(lazy_stack.resources._resources))
+
+    def test_lazy_resources_output_resource_data(self):
+        lazy_stack = self._create_lazy_test_stack()
+
+        lazy_stack._update_all_resource_data(for_resources=False,
+                                             for_outputs={'TestOutput'})
+        self.assertEqual('CResource',
+                         lazy_stack.outputs['TestOutput'].get_value())
+        self.assertEqual({'AResource', 'BResource', 'CResource'},
+                         set(lazy_stack.resources._resources))
+
     def test_store_saves_owner(self):
         """owner_id attribute of Store is saved to the database when stored."""
         self.stack = stack.Stack(self.ctx, 'owner_stack', self.tmpl)
@@ -11,11 +11,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
 import mock
+from oslo_config import cfg
+from oslo_utils import timeutils
+import six
 
+from heat.common import config
 from heat.common import exception
 from heat.common import service_utils
 from heat.engine import stack_lock
+from heat.objects import service as service_objects
 from heat.objects import stack as stack_object
 from heat.objects import stack_lock as stack_lock_object
 from heat.tests import common
@@ -269,3 +276,149 @@ class StackLockTest(common.HeatTestCase):
                 raise self.TestThreadLockException
         self.assertRaises(self.TestThreadLockException, check_thread_lock)
         self.assertFalse(stack_lock_object.StackLock.release.called)
+
+
+class StackLockLeaseTest(common.HeatTestCase):
+    def setUp(self):
+        super(StackLockLeaseTest, self).setUp()
+        self.context = utils.dummy_context()
+        self.engine_id = service_utils.generate_engine_id()
+        self.backend = stack_lock.DatabaseLockBackend()
+        self.mock_alive = self.patchobject(service_utils, 'engine_alive',
+                                           return_value=True)
+        cfg.CONF.set_override('stack_lock_lease_time', 120)
+
+    def _create_service(self):
+        return service_objects.Service.create(
+            self.context,
+            dict(host='host', hostname='hostname', binary='heat-engine',
+                 engine_id=self.engine_id, topic='engine',
+                 report_interval=60))
+
+    def test_lease_current(self):
+        self._create_service()
+        self.assertTrue(self.backend.engine_alive(self.context,
+                                                  self.engine_id))
+        self.assertFalse(self.mock_alive.called)
+
+    def test_lease_expired(self):
+        self._create_service()
+        later = timeutils.utcnow() + datetime.timedelta(seconds=121)
+        self.patchobject(stack_lock.timeutils, 'utcnow', return_value=later)
+        self.assertFalse(self.backend.engine_alive(self.context,
+                                                   self.engine_id))
+        self.assertFalse(self.mock_alive.called)
+
+    def test_lease_renewed(self):
+        service = self._create_service()
+        later = timeutils.utcnow() + datetime.timedelta(seconds=121)
+        self.patchobject(timeutils, 'utcnow', return_value=later)
+        service_objects.Service.update_by_id(self.context, service.id,
+                                             dict(deleted_at=None))
+        self.assertTrue(self.backend.engine_alive(self.context,
+                                                  self.engine_id))
+        self.assertFalse(self.mock_alive.called)
+
+    def test_lease_service_stopped(self):
+        service = self._create_service()
+        service_objects.Service.delete(self.context, service.id)
+        self.assertFalse(self.backend.engine_alive(self.context,
+                                                   self.engine_id))
+        self.assertFalse(self.mock_alive.called)
+
+    def test_lease_no_service(self):
+        self.assertTrue(self.backend.engine_alive(self.context,
+                                                  self.engine_id))
+        self.mock_alive.assert_called_once_with(self.context,
+                                                self.engine_id)
+
+    def test_lease_time_too_short(self):
+        cfg.CONF.set_override('periodic_interval', 120)
+        err = self.assertRaises(exception.Error,
+                                config.startup_sanity_check)
+        self.assertIn('"stack_lock_lease_time" must be greater than '
+                      '"periodic_interval"', six.text_type(err))
+
+    def test_lease_disabled(self):
+        cfg.CONF.set_override('stack_lock_lease_time', 0)
+        self._create_service()
+        self.assertTrue(self.backend.engine_alive(self.context,
+                                                  self.engine_id))
+        self.mock_alive.assert_called_once_with(self.context,
+                                                self.engine_id)
+
+
+class MemoryLockBackendTest(common.HeatTestCase):
+    def setUp(self):
+        super(MemoryLockBackendTest, self).setUp()
+        self.context = utils.dummy_context()
+        self.stack_id = "aae01f2d-52ae-47ac-8a0d-3fde3d220fea"
+        self.engine_id = service_utils.generate_engine_id()
+        self.other_engine_id = service_utils.generate_engine_id()
+        cfg.CONF.set_override('stack_lock_backend', 'memory')
+        self.addCleanup(stack_lock._backends.clear)
+        self.mock_create = self.patchobject(stack_lock_object.StackLock,
+                                            'create')
+        stack = mock.MagicMock()
+        stack.name = "test_stack"
+        stack.action = "CREATE"
+        self.patchobject(stack_object.Stack, 'get_by_id',
+                         return_value=stack)
+
+    def test_acquire_release(self):
+        slock = stack_lock.StackLock(self.context, self.stack_id,
+                                     self.engine_id)
+        self.assertIsInstance(slock.backend, stack_lock.MemoryLockBackend)
+        slock.acquire()
+        self.assertEqual(self.engine_id, slock.get_engine_id())
+
+        other = stack_lock.StackLock(self.context, self.stack_id,
+                                     self.other_engine_id)
+        self.assertEqual(self.engine_id, other.try_acquire())
+        self.assertRaises(exception.ActionInProgress, other.acquire)
+        self.assertRaises(exception.ActionInProgress, slock.acquire)
+
+        slock.release()
+        self.assertIsNone(slock.get_engine_id())
+        self.assertIsNone(other.try_acquire())
+        self.assertEqual(self.other_engine_id, slock.get_engine_id())
+        self.assertFalse(self.mock_create.called)
+
+    def test_multiple_workers_rejected(self):
+        cfg.CONF.set_override('num_engine_workers', 4)
+        err = self.assertRaises(exception.Error,
+                                config.startup_sanity_check)
+        self.assertIn('requires "num_engine_workers" to be 1',
+                      six.text_type(err))
+        cfg.CONF.set_override('num_engine_workers', 1)
+        config.startup_sanity_check()
+
+    def test_steal(self):
+        backend = stack_lock.MemoryLockBackend()
+        self.assertTrue(backend.steal(self.context, self.stack_id,
+                                      self.engine_id, self.other_engine_id))
+        backend.create(self.context, self.stack_id, self.engine_id)
+        self.assertIsNone(backend.steal(self.context, self.stack_id,
+                                        self.engine_id,
+                                        self.other_engine_id))
+        self.assertEqual(self.other_engine_id,
+                         backend.steal(self.context, self.stack_id,
+                                       self.engine_id, 'third-engine'))
+        self.assertTrue(backend.release(self.context, self.stack_id,
+                                        self.engine_id))
+        self.assertIsNone(backend.release(self.context, self.stack_id,
+                                          self.other_engine_id))
+
+    def test_persist_state_and_release_lock(self):
+        mock_update = self.patchobject(stack_object.Stack, 'update_by_id',
+                                       return_value=True)
+        backend = stack_lock.MemoryLockBackend()
+        backend.create(self.context, self.stack_id, self.engine_id)
+        values = {'action': 'CREATE', 'status': 'COMPLETE'}
+
+        self.assertIsNone(backend.persist_state_and_release_lock(
+            self.context, self.stack_id, self.engine_id, values))
+        mock_update.assert_called_once_with(self.context, self.stack_id,
+                                            values)
+        self.assertIsNone(backend.get_engine_id(self.context,
+                                                self.stack_id))
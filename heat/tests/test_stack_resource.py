@@ -494,7 +494,8 @@ class StackResourceTest(StackResourceBaseTest):
         self.parent_resource.resource_id = 319
         self.m.StubOutWithMock(parser.Stack, 'load')
         parser.Stack.load(self.parent_resource.context,
-                          self.parent_resource.resource_id).AndReturn('s')
+                          self.parent_resource.resource_id,
+                          use_cache=False).AndReturn('s')
         self.m.ReplayAll()
         self.parent_resource.nested()
         self.m.VerifyAll()
@@ -504,7 +505,8 @@ class StackResourceTest(StackResourceBaseTest):
         self.parent_resource.resource_id = '90-8'
         self.m.StubOutWithMock(parser.Stack, 'load')
         parser.Stack.load(self.parent_resource.context,
-                          self.parent_resource.resource_id).AndRaise(
+                          self.parent_resource.resource_id,
+                          use_cache=False).AndRaise(
             exception.NotFound)
         self.m.ReplayAll()
 
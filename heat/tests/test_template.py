@@ -16,6 +16,7 @@ import hashlib
 import json
 
 import fixtures
+import mock
 import six
 from stevedore import extension
 
@@ -33,6 +34,7 @@ from heat.engine import rsrc_defn
 from heat.engine import stack
 from heat.engine import stk_defn
 from heat.engine import template
+from heat.objects import raw_template as template_object
 from heat.tests import common
 from heat.tests.openstack.nova import fakes as fakes_nova
 from heat.tests import utils
@@ -1528,6 +1530,86 @@ class TemplateTest(common.HeatTestCase):
         self.assertEqual(hot_tmpl.env, empty_template.env)
 
 
+class LoadedTemplateCacheTest(common.HeatTestCase):
+
+    tmpl = {
+        'heat_template_version': '2015-04-30',
+        'parameters': {'foo': {'type': 'string'}},
+        'resources': {'A': {'type': 'GenericResourceType'}},
+    }
+
+    def setUp(self):
+        super(LoadedTemplateCacheTest, self).setUp()
+        self.ctx = utils.dummy_context()
+        template._loaded_templates.clear()
+        self.addCleanup(template._loaded_templates.clear)
+        t = template.Template(copy.deepcopy(self.tmpl),
+                              env=environment.Environment({'foo': 'bar'}))
+        self.tmpl_id = t.store(self.ctx)
+        self.get_by_id = self.patchobject(
+            template_object.RawTemplate, 'get_by_id',
+            wraps=template_object.RawTemplate.get_by_id)
+
+    def test_load_cached(self):
+        first = template.Template.load(self.ctx, self.tmpl_id)
+        second = template.Template.load(self.ctx, self.tmpl_id)
+
+        self.get_by_id.assert_called_once_with(self.ctx, self.tmpl_id)
+        self.assertEqual(self.tmpl, second.t)
+        self.assertIs(first.t, second.t)
+        self.assertIsNot(first.env, second.env)
+        self.assertEqual({'foo': 'bar'}, second.env.params)
+
+    def test_load_with_raw_template_not_cached(self):
+        rt = template_object.RawTemplate.get_by_id(self.ctx, self.tmpl_id)
+        template.Template.load(self.ctx, self.tmpl_id, rt)
+
+        self.assertEqual(0, len(template._loaded_templates))
+
+    def test_load_copy_on_write(self):
+        first = template.Template.load(self.ctx, self.tmpl_id)
+        second = template.Template.load(self.ctx, self.tmpl_id)
+        defn = rsrc_defn.ResourceDefinition('B', 'GenericResourceType')
+        first.add_resource(defn)
+        second.remove_resource('A')
+
+        self.assertEqual({'A', 'B'}, set(first.t['resources']))
+        self.assertEqual(set(), set(second.t['resources']))
+        third = template.Template.load(self.ctx, self.tmpl_id)
+        self.assertEqual(self.tmpl, third.t)
+
+    def test_load_param_defaults_copy_on_write(self):
+        first = template.Template.load(self.ctx, self.tmpl_id)
+        first.param_schemata({'foo': 'baz'})
+
+        second = template.Template.load(self.ctx, self.tmpl_id)
+        self.assertEqual('baz', first.t['parameters']['foo']['default'])
+        self.assertNotIn('default', second.t['parameters']['foo'])
+
+    def test_load_after_store(self):
+        first = template.Template.load(self.ctx, self.tmpl_id)
+        first.remove_resource('A')
+        first.store(self.ctx)
+
+        second = template.Template.load(self.ctx, self.tmpl_id)
+        self.assertEqual(2, self.get_by_id.call_count)
+        self.assertEqual({}, second.t['resources'])
+
+    def test_load_after_update_elsewhere(self):
+        template.Template.load(self.ctx, self.tmpl_id)
+        # Simulate an update made by a different process, which does not
+        # invalidate the cache in this one.
+        tmpl = copy.deepcopy(self.tmpl)
+        tmpl['resources'] = {}
+        with mock.patch.object(template._loaded_templates, 'pop'):
+            template_object.RawTemplate.update_by_id(self.ctx, self.tmpl_id,
+                                                     {'template': tmpl})
+
+        second = template.Template.load(self.ctx, self.tmpl_id)
+        self.assertEqual(2, self.get_by_id.call_count)
+        self.assertEqual({}, second.t['resources'])
+
+
 class TemplateFnErrorTest(common.HeatTestCase):
     scenarios = [
         ('select_from_list_not_int',
@@ -10,6 +10,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo_config import cfg
+
 from heat.engine import template_files
 from heat.tests import common
 from heat.tests import utils
@@ -21,6 +23,7 @@ template_files_1 = {'template file 1': 'Contents of template 1',
 class TestTemplateFiles(common.HeatTestCase):
 
     def test_cache_miss(self):
+        cfg.CONF.set_override('template_files_cache_size', 0)
         ctx = utils.dummy_context()
         tf1 = template_files.TemplateFiles(template_files_1)
         tf1.store(ctx)
@@ -35,6 +38,7 @@ class TestTemplateFiles(common.HeatTestCase):
         self.assertEqual(template_files_1, template_files._d[tf1.files_id])
 
     def test_d_weakref_behaviour(self):
+        cfg.CONF.set_override('template_files_cache_size', 0)
         ctx = utils.dummy_context()
         tf1 = template_files.TemplateFiles(template_files_1)
         tf1.store(ctx)
@@ -43,3 +47,20 @@ class TestTemplateFiles(common.HeatTestCase):
         self.assertIn(tf2.files_id, template_files._d)
         del tf2.files
         self.assertNotIn(tf2.files_id, template_files._d)
+
+    def test_recently_used_kept(self):
+        ctx = utils.dummy_context()
+        tf1 = template_files.TemplateFiles(template_files_1)
+        tf1.store(ctx)
+        del tf1.files
+        self.assertIn(tf1.files_id, template_files._d)
+        self.assertEqual(template_files_1, template_files._d[tf1.files_id])
+
+    def test_identical_files_shared(self):
+        ctx = utils.dummy_context()
+        tf1 = template_files.TemplateFiles(template_files_1)
+        tf1.store(ctx)
+        tf2 = template_files.TemplateFiles(dict(template_files_1))
+        tf2.store(ctx)
+        self.assertEqual(tf1.files_id, tf2.files_id)
+        self.assertIs(tf1.files, tf2.files)
@@ -148,6 +148,63 @@ Outputs: {}
         self.assertEqual(expected, template_format.parse(tmpl_str))
 
 
+class ParsedTemplateCacheTest(common.HeatTestCase):
+
+    tmpl_str = 'heat_template_version: 2013-05-23\nresources: {}\n'
+
+    def setUp(self):
+        super(ParsedTemplateCacheTest, self).setUp()
+        template_format._parsed_templates.clear()
+        self.addCleanup(template_format._parsed_templates.clear)
+
+    def test_parse_cached(self):
+        with mock.patch.object(template_format, 'simple_parse',
+                               wraps=template_format.simple_parse) as sp:
+            first = template_format.parse(self.tmpl_str)
+            second = template_format.parse(self.tmpl_str)
+
+        sp.assert_called_once_with(self.tmpl_str, None)
+        self.assertEqual(first, second)
+        stats = template_format._parsed_templates.stats()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+
+    def test_parse_cached_returns_copy(self):
+        first = template_format.parse(self.tmpl_str)
+        first['resources']['foo'] = {'type': 'OS::Heat::None'}
+
+        second = template_format.parse(self.tmpl_str)
+        self.assertEqual({}, second['resources'])
+        second['resources']['bar'] = {'type': 'OS::Heat::None'}
+
+        self.assertEqual({}, template_format.parse(self.tmpl_str)['resources'])
+
+    def test_parse_json_not_cached(self):
+        tmpl_str = '{"heat_template_version": "2013-05-23"}'
+        with mock.patch.object(template_format, 'simple_parse',
+                               wraps=template_format.simple_parse) as sp:
+            template_format.parse(tmpl_str)
+            template_format.parse(tmpl_str)
+
+        self.assertEqual(2, sp.call_count)
+        self.assertEqual(0, len(template_format._parsed_templates))
+
+    def test_parse_cache_disabled(self):
+        config.cfg.CONF.set_override('parsed_template_cache_size', 0)
+        with mock.patch.object(template_format, 'simple_parse',
+                               wraps=template_format.simple_parse) as sp:
+            template_format.parse(self.tmpl_str)
+            template_format.parse(self.tmpl_str)
+
+        self.assertEqual(2, sp.call_count)
+
+    def test_parse_error_not_cached(self):
+        tmpl_str = 'resources: {}'
+        for i in range(2):
+            self.assertRaises(ValueError, template_format.parse, tmpl_str)
+        self.assertEqual(0, len(template_format._parsed_templates))
+
+
 class YamlParseExceptions(common.HeatTestCase):
 
     scenarios = [